@@ -4,5 +4,12 @@ set -o errexit
 
 pip install -r requirements.txt
 
+python manage.py build_assets
+python manage.py build_images
 python manage.py collectstatic --no-input
-python manage.py migrate
\ No newline at end of file
+python manage.py migrate
+# Only a shared cache outlives this process. With the default local-memory
+# cache each web worker fills its own on its first home page request.
+if [ -n "$REDIS_URL" ]; then
+  python manage.py warm_dashboard_cache
+fi
@@ -0,0 +1,57 @@
+"""
+gunicorn settings for serving the ASGI application with uvicorn workers:
+
+    gunicorn task_manager.asgi:application
+
+Async views wait for the database on the event loop, so each worker
+handles many concurrent requests; a few workers per CPU is enough.
+
+With ``preload_app`` the master imports Django and runs
+``manager.warmup.warm_up`` before forking, so every worker (including the
+ones restarted by ``max_requests``) starts with the views imported and the
+URL patterns and templates compiled. Database connections are closed before
+the fork and opened by each worker on first use. Set GUNICORN_PRELOAD=False
+to load and warm up the app in each worker instead, which lets HUP reload
+the code.
+"""
+import multiprocessing
+import os
+
+wsgi_app = "task_manager.asgi:application"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+# Restart workers now and then so a slow leak can't grow unbounded.
+max_requests = 1000
+max_requests_jitter = 100
+accesslog = "-"
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True") == "True"
+
+
+def log_warm_up(log, timings):
+    log.info(
+        "Warmed up %d URL patterns in %.3fs and %d templates in %.3fs",
+        timings["url_patterns"],
+        timings["urls_seconds"],
+        timings["templates"],
+        timings["templates_seconds"],
+    )
+    for name in timings["failed_templates"]:
+        log.warning("Template %s doesn't compile", name)
+
+
+def when_ready(server):
+    if preload_app:
+        from manager.warmup import warm_up
+
+        log_warm_up(server.log, warm_up())
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        from manager.warmup import warm_up
+
+        log_warm_up(worker.log, warm_up())
@@ -1,6 +1,16 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Worker, Task, Position, TaskType, Project, Team
+from .models import (
+    Worker,
+    Task,
+    Position,
+    TaskType,
+    Project,
+    Team,
+    OutboundEmail,
+    Job,
+    JobStats,
+)
 
 
 @admin.register(Worker)
@@ -37,6 +47,24 @@ class ProjectAdmin(admin.ModelAdmin):
     list_filter = ("team",)
 
 
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "run_at", "duration")
+    list_filter = ("status", "name")
+
+
+@admin.register(JobStats)
+class JobStatsAdmin(admin.ModelAdmin):
+    list_display = ("name", "runs", "failures", "duration")
+
+
 admin.site.register(Position)
 admin.site.register(TaskType)
 admin.site.register(Team)
@@ -0,0 +1,164 @@
+"""
+Delta-sync JSON API, version 1. ``GET /api/v1/<kind>/?since=<token>``
+returns the tasks, projects, teams or workers created, updated or deleted
+after ``token``, oldest change first, as::
+
+    {"kind": "tasks", "changes": [
+    {"seq": 41, "id": 7, "deleted": false, "data": {...}},
+    {"seq": 42, "id": 3, "deleted": true}
+    ], "next": "42", "has_more": false}
+
+Without ``since`` every row that exists, and the tombstone of every row
+deleted, is returned. Clients store ``next`` and pass it as ``since``,
+following pages while ``has_more``. Each row appears once, at its latest
+change (see ``manager.changelog``). The page is streamed a chunk of rows at
+a time, so memory stays bounded by ``limit``.
+"""
+import hmac
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from manager.changelog import get_entries
+from manager.models import Project, Task, Team, Worker
+from manager.utils import chunked
+
+PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 5000
+CHUNK_SIZE = PAGE_SIZE
+
+
+class InvalidRequest(ValueError):
+    pass
+
+
+def get_ids(through, column, pks, related_column):
+    ids = {pk: [] for pk in pks}
+    rows = (
+        through.objects.filter(**{f"{column}__in": pks})
+        .order_by(related_column)
+        .values_list(column, related_column)
+    )
+    for pk, related_id in rows:
+        ids[pk].append(related_id)
+    return ids
+
+
+def task_rows(pks):
+    assignees = get_ids(Task.assignees.through, "task_id", pks, "worker_id")
+    for row in Task.objects.filter(pk__in=pks).values(
+        "id",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type__name",
+        "project_id",
+        "created_at",
+        "updated_at",
+    ):
+        row["task_type"] = row.pop("task_type__name")
+        row["project"] = row.pop("project_id")
+        row["assignees"] = assignees[row["id"]]
+        yield row
+
+
+def project_rows(pks):
+    teams = get_ids(Project.team.through, "project_id", pks, "team_id")
+    for row in Project.objects.filter(pk__in=pks).values(
+        "id",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "created_at",
+        "updated_at",
+    ):
+        row["teams"] = teams[row["id"]]
+        yield row
+
+
+def team_rows(pks):
+    members = get_ids(Team.members.through, "team_id", pks, "worker_id")
+    for row in Team.objects.filter(pk__in=pks).values(
+        "id", "name", "created_at", "updated_at"
+    ):
+        row["members"] = members[row["id"]]
+        yield row
+
+
+def worker_rows(pks):
+    for row in Worker.objects.filter(pk__in=pks).values(
+        "id",
+        "username",
+        "first_name",
+        "last_name",
+        "email",
+        "position__name",
+        "created_at",
+        "updated_at",
+    ):
+        row["position"] = row.pop("position__name")
+        yield row
+
+
+ROWS = {
+    "tasks": task_rows,
+    "projects": project_rows,
+    "teams": team_rows,
+    "workers": worker_rows,
+}
+
+
+def parse_params(params):
+    """``(since, limit)`` from the query string; raises ``InvalidRequest``."""
+    try:
+        since = int(params.get("since") or 0)
+        limit = int(params.get("limit") or PAGE_SIZE)
+    except ValueError:
+        raise InvalidRequest("since and limit must be integers.")
+    if since < 0 or not 0 < limit <= MAX_PAGE_SIZE:
+        raise InvalidRequest(
+            f"since must be 0 or more and limit between 1 and {MAX_PAGE_SIZE}."
+        )
+    return since, limit
+
+
+def stream(kind, since=0, limit=PAGE_SIZE, chunk_size=CHUNK_SIZE):
+    """Yield the JSON of the page of ``kind`` changes after ``since``."""
+    get_rows = ROWS[kind]
+    # One more than asked for tells whether another page follows.
+    entries = get_entries(kind, since, limit + 1)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    yield json.dumps({"kind": kind})[:-1] + ', "changes": ['
+    separator = "\n"
+    for chunk in chunked(entries, chunk_size):
+        rows = {
+            row["id"]: row
+            for row in get_rows([pk for _, pk, deleted in chunk if not deleted])
+        }
+        for seq, pk, deleted in chunk:
+            change = {"seq": seq, "id": pk, "deleted": deleted}
+            if not deleted:
+                if pk not in rows:
+                    # Deleted since; its tombstone comes on a later page.
+                    continue
+                change["data"] = rows[pk]
+            yield separator + json.dumps(change, cls=DjangoJSONEncoder)
+            separator = ",\n"
+    next_token = str(entries[-1][0] if entries else since)
+    yield "\n], " + json.dumps({"next": next_token, "has_more": has_more})[1:] + "\n"
+
+
+def is_authorized(request):
+    """A logged-in user, or the ``API_TOKEN`` bearer token when it's set."""
+    if request.user.is_authenticated:
+        return True
+    token = getattr(settings, "API_TOKEN", "")
+    return bool(token) and hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
@@ -0,0 +1,271 @@
+"""
+Static asset bundles. ``build_assets`` turns each bundle in ``BUNDLES`` into
+one file under ``static/assets/dist/``, named after a hash of its content:
+
+* CSS is pruned of rules whose classes and ids appear nowhere in the
+  templates, the Python sources or the bundled scripts, then minified;
+* scripts are concatenated in order (the theme's are already minified);
+* every file gets a gzip and, with the ``brotli`` package, a brotli copy,
+  which WhiteNoise serves to clients that accept them.
+
+The ``{% bundle %}`` tag links the built file, or the source files while no
+build exists, so development works without building.
+"""
+import gzip
+import hashlib
+import json
+import re
+import shutil
+from functools import cache
+from importlib import import_module
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+# The output sits next to assets/css so the stylesheets' relative url()s
+# still point at assets/fonts and assets/img.
+OUTPUT_DIR = "assets/dist"
+MANIFEST = "manifest.json"
+SITE_CSS = [
+    "assets/css/nucleo-icons.css",
+    "assets/css/nucleo-svg.css",
+    "assets/css/soft-design-system.css",
+]
+SITE_JS = [
+    "assets/js/core/popper.min.js",
+    "assets/js/core/bootstrap.min.js",
+    "assets/js/soft-design-system.min.js",
+]
+# Every page loads exactly one bundle of each kind.
+BUNDLES = {
+    "css": {"site": SITE_CSS},
+    "js": {
+        "site": SITE_JS,
+        "index": [*SITE_JS, "assets/js/plugins/countup.min.js"],
+        "project": [*SITE_JS, "assets/js/project-events.js"],
+    },
+}
+# Classes only ever built at runtime, e.g. from a variable in a template.
+SAFELIST = {"active", "show", "fade", "collapsing", "disabled"}
+# Rules inside these at-rules are pruned; any other at-rule is kept whole.
+NESTED_AT_RULES = ("@media", "@supports")
+
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+WORD_RE = re.compile(r"[A-Za-z_][\w-]*")
+SELECTOR_NAME_RE = re.compile(r"([.#])(-?[_a-zA-Z][\w-]*)")
+# Classes inside :not() don't need to be present for the rule to apply.
+NEGATION_RE = re.compile(r":not\([^)]*\)")
+BUILT_FILE_RE = re.compile(rf"/{OUTPUT_DIR}/[\w-]+\.[0-9a-f]{{12}}\.(css|js)$")
+
+
+def get_output_dir():
+    return Path(settings.STATICFILES_DIRS[0]) / OUTPUT_DIR
+
+
+@cache
+def load_manifest():
+    """``{kind: {bundle: static path}}`` of the last build, or empty."""
+    path = get_output_dir() / MANIFEST
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def find_source(path):
+    found = finders.find(path)
+    if found is None:
+        raise FileNotFoundError(f"Static file {path!r} not found.")
+    return Path(found)
+
+
+def get_used_words(script_paths=()):
+    """Every word in the templates, Python sources and bundled scripts."""
+    template_dirs = [
+        Path(directory)
+        for engine in engines.all()
+        for directory in getattr(engine, "dirs", [])
+    ]
+    template_dirs += [
+        Path(directory) for directory in get_app_template_dirs("templates")
+    ]
+    files = [path for directory in template_dirs for path in directory.rglob("*.html")]
+    source_dirs = [
+        Path(apps.get_app_config("manager").path),
+        Path(import_module(settings.ROOT_URLCONF).__file__).parent,
+    ]
+    files += [path for directory in source_dirs for path in directory.rglob("*.py")]
+    files += [find_source(path) for path in script_paths]
+
+    words = set(SAFELIST)
+    for path in files:
+        words.update(WORD_RE.findall(path.read_text(errors="ignore")))
+    return words
+
+
+def split_blocks(css):
+    """
+    Split a stylesheet into top-level ``(prelude, body)`` pairs; statements
+    such as ``@charset`` come back with a ``None`` body.
+    """
+    blocks = []
+    depth = 0
+    quote = None
+    start = 0
+    prelude = None
+    for position, char in enumerate(css):
+        if quote:
+            if char == quote and css[position - 1] != "\\":
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char == "{":
+            if depth == 0:
+                prelude = css[start:position].strip()
+                start = position + 1
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((prelude, css[start:position].strip()))
+                start = position + 1
+        elif char == ";" and depth == 0:
+            blocks.append((css[start:position].strip(), None))
+            start = position + 1
+    return blocks
+
+
+def split_selectors(prelude):
+    selectors = []
+    depth = 0
+    start = 0
+    for position, char in enumerate(prelude):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:position].strip())
+            start = position + 1
+    selectors.append(prelude[start:].strip())
+    return selectors
+
+
+def is_used(selector, words):
+    return all(
+        name in words
+        for _, name in SELECTOR_NAME_RE.findall(NEGATION_RE.sub("", selector))
+    )
+
+
+def minify_declarations(body):
+    body = re.sub(r"\s+", " ", body).strip()
+    body = re.sub(r"\s*;\s*", ";", body)
+    return re.sub(r"(^|;)([-\w]+)\s*:\s*", r"\1\2:", body).rstrip(";")
+
+
+def prune_css(css, words):
+    """Drop the rules whose selectors can't match, and minify the rest."""
+    output = []
+    for prelude, body in split_blocks(COMMENT_RE.sub("", css)):
+        if body is None:
+            if prelude:
+                output.append(f"{prelude};")
+        elif prelude.startswith(NESTED_AT_RULES):
+            nested = prune_css(body, words)
+            if nested:
+                output.append(f"{' '.join(prelude.split())}{{{nested}}}")
+        elif prelude.startswith("@"):
+            if prelude.startswith(("@font-face", "@page")):
+                body = minify_declarations(body)
+            else:
+                body = " ".join(body.split())
+            output.append(f"{' '.join(prelude.split())}{{{body}}}")
+        else:
+            selectors = [
+                " ".join(selector.split())
+                for selector in split_selectors(prelude)
+                if is_used(selector, words)
+            ]
+            if selectors:
+                output.append(f"{','.join(selectors)}{{{minify_declarations(body)}}}")
+    return "".join(output)
+
+
+def build_bundle(kind, paths, words):
+    sources = [find_source(path).read_text() for path in paths]
+    if kind == "css":
+        return "".join(prune_css(source, words) for source in sources)
+    return ";\n".join(source.strip() for source in sources) + "\n"
+
+
+def write_file(directory, name, content):
+    """Write ``content`` and its compressed copies; return the sizes."""
+    data = content.encode()
+    (directory / name).write_bytes(data)
+    sizes = {"raw": len(data)}
+    compressed = {"gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data)
+    for extension, payload in compressed.items():
+        (directory / f"{name}.{extension}").write_bytes(payload)
+        sizes[extension] = len(payload)
+    return sizes
+
+
+def build(log=None):
+    """
+    Build every bundle into a fresh output directory and return
+    ``{(kind, bundle): {"source": bytes, "raw": bytes, "gz": bytes, ...}}``.
+    """
+    log = log or (lambda message: None)
+    directory = get_output_dir()
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+    words = get_used_words(BUNDLES["js"]["site"])
+    manifest = {}
+    report = {}
+    for kind, bundles in BUNDLES.items():
+        for bundle, paths in bundles.items():
+            content = build_bundle(kind, paths, words)
+            digest = hashlib.md5(content.encode()).hexdigest()[:12]
+            name = f"{bundle}.{digest}.{kind}"
+            sizes = write_file(directory, name, content)
+            sizes["source"] = sum(find_source(path).stat().st_size for path in paths)
+            manifest.setdefault(kind, {})[bundle] = f"{OUTPUT_DIR}/{name}"
+            report[kind, bundle] = sizes
+            log(
+                f"{OUTPUT_DIR}/{name}: {sizes['source']} source bytes, "
+                f"{sizes['raw']} built, "
+                + ", ".join(
+                    f"{sizes[extension]} {extension}"
+                    for extension in ("gz", "br")
+                    if extension in sizes
+                )
+            )
+    if brotli is None:
+        log("The brotli package isn't installed, so only gzip copies were written.")
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    load_manifest.cache_clear()
+    return report
+
+
+def get_bundle_paths(kind, bundle):
+    """The static paths a page loads for ``bundle``: the build or the sources."""
+    built = load_manifest().get(kind, {}).get(bundle)
+    return [built] if built else BUNDLES[kind][bundle]
+
+
+def is_built_file(url):
+    """Whether ``url`` names a built bundle, whose content never changes."""
+    return BUILT_FILE_RE.search(url) is not None
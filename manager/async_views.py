@@ -0,0 +1,79 @@
+"""
+Building blocks for async views. Under ASGI they wait for the database
+without holding a thread, so one worker can serve many slow requests at
+once. Querysets are fetched with the async ORM before rendering; templates
+are rendered from a ``TemplateResponse``, which Django renders in a thread.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
+from django.http import Http404
+from django.views import generic
+
+from manager.pagination import KeysetPaginationMixin
+
+
+async def ais_authenticated(request):
+    # Loading request.user reads the session and the user row, which the
+    # sync-only ``request.user`` can't do from the event loop.
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def async_login_required(view_func):
+    """``login_required`` for async function views."""
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if await ais_authenticated(request):
+            return await view_func(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path())
+
+    return wrapper
+
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    def dispatch(self, request, *args, **kwargs):
+        return self.adispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        if not await ais_authenticated(request):
+            return self.handle_no_permission()
+        return await generic.View.dispatch(self, request, *args, **kwargs)
+
+
+class AsyncListView(AsyncLoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
+    """ListView whose page and count come from the async ORM."""
+
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            self.page = await self.apaginate_queryset(self.object_list, page_size)
+        else:
+            self.object_list = [obj async for obj in self.object_list]
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.page
+
+
+class AsyncDetailView(AsyncLoginRequiredMixin, generic.DetailView):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        context = await self.aget_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    async def aget_context_data(self, **kwargs):
+        """Override to add context that needs queries."""
+        return self.get_context_data(**kwargs)
+
+    async def aget_object(self):
+        queryset = self.get_queryset().filter(pk=self.kwargs.get(self.pk_url_kwarg))
+        try:
+            return await queryset.aget()
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f"No {queryset.model._meta.verbose_name} found matching the query"
+            )
@@ -0,0 +1,43 @@
+"""
+``CachedModelBackend`` keeps the logged-in ``Worker`` in the cache, so
+``AuthenticationMiddleware`` doesn't read the user row on every request.
+The signal handlers in ``manager.signals`` drop the entry when the worker is
+saved (which covers password, permission and ``is_active`` changes) or
+deleted. Changes made with ``QuerySet.update()`` show up after
+``USER_CACHE_TIMEOUT``.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_KEY = "manager:user"
+
+
+def get_cache_key(user_id):
+    return f"{USER_CACHE_KEY}:{user_id}"
+
+
+def forget_user(user_id):
+    cache.delete(get_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def load_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related("position").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+    def get_user(self, user_id):
+        if not settings.USER_CACHE_TIMEOUT:
+            return self.load_user(user_id)
+        key = get_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = self.load_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,236 @@
+"""
+Open tasks grouped by deadline: overdue, due today and due later this week
+(up to Sunday). The lists and counts only read open tasks up to the end of
+the week, a range scan of the partial index ``task_open_deadline_idx``.
+
+The counts, for everyone and per assignee, are cached per day. The signal
+handlers in ``manager.signals`` move a task between the cached counts with
+``cache.incr`` when its deadline, completion or assignees change, instead of
+counting again; bulk changes bump a version that retires every entry.
+"""
+import time
+from datetime import timedelta
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from manager.models import Task
+
+OVERDUE = "overdue"
+TODAY = "today"
+WEEK = "week"
+BUCKETS = {
+    OVERDUE: "Overdue",
+    TODAY: "Due today",
+    WEEK: "Due this week",
+}
+CACHE_KEY = "manager:task-buckets"
+VERSION_KEY = "manager:task-buckets-version"
+# Counts are exact while the signals keep up; the timeout bounds any drift.
+TIMEOUT = 60 * 60
+EVERYONE = "all"
+
+
+def end_of_week(today):
+    return today + timedelta(days=6 - today.weekday())
+
+
+def get_bounds(bucket, today):
+    if bucket == OVERDUE:
+        return Q(deadline__lt=today)
+    if bucket == TODAY:
+        return Q(deadline=today)
+    return Q(deadline__gt=today, deadline__lte=end_of_week(today))
+
+
+def bucket_for(deadline, is_completed, today):
+    # An instance saved with a string or datetime deadline keeps it as given.
+    deadline = Task._meta.get_field("deadline").to_python(deadline)
+    if is_completed or deadline is None or deadline > end_of_week(today):
+        return None
+    if deadline < today:
+        return OVERDUE
+    if deadline == today:
+        return TODAY
+    return WEEK
+
+
+def get_open_tasks(today=None, worker_id=None):
+    today = today or timezone.localdate()
+    queryset = Task.objects.filter(is_completed=False, deadline__lte=end_of_week(today))
+    if worker_id is not None:
+        queryset = queryset.filter(assignees=worker_id)
+    return queryset
+
+
+def get_queryset(bucket, worker_id=None):
+    today = timezone.localdate()
+    return (
+        get_open_tasks(today, worker_id)
+        .filter(get_bounds(bucket, today))
+        .order_by("deadline", "name")
+    )
+
+
+def get_aggregate(worker_id, today):
+    return get_open_tasks(today, worker_id), {
+        bucket: Count("pk", filter=get_bounds(bucket, today)) for bucket in BUCKETS
+    }
+
+
+def get_keys(scope, today, version):
+    return {
+        bucket: f"{CACHE_KEY}:{version}:{today.isoformat()}:{scope}:{bucket}"
+        for bucket in BUCKETS
+    }
+
+
+def get_counts(worker_id=None):
+    """``{bucket: count}`` for everyone or for the tasks of one worker."""
+    today = timezone.localdate()
+    version = cache.get_or_set(VERSION_KEY, time.time_ns, None)
+    keys = get_keys(worker_id or EVERYONE, today, version)
+    cached = cache.get_many(keys.values())
+    if len(cached) == len(keys):
+        return {bucket: cached[key] for bucket, key in keys.items()}
+    queryset, aggregate = get_aggregate(worker_id, today)
+    counts = queryset.aggregate(**aggregate)
+    cache.set_many({keys[bucket]: counts[bucket] for bucket in BUCKETS}, TIMEOUT)
+    return counts
+
+
+async def aget_counts(worker_id=None):
+    today = timezone.localdate()
+    version = await cache.aget_or_set(VERSION_KEY, time.time_ns, None)
+    keys = get_keys(worker_id or EVERYONE, today, version)
+    cached = await cache.aget_many(keys.values())
+    if len(cached) == len(keys):
+        return {bucket: cached[key] for bucket, key in keys.items()}
+    queryset, aggregate = get_aggregate(worker_id, today)
+    counts = await queryset.aaggregate(**aggregate)
+    await cache.aset_many({keys[bucket]: counts[bucket] for bucket in BUCKETS}, TIMEOUT)
+    return counts
+
+
+def labelled(counts):
+    """``(bucket, label, count)`` rows for templates."""
+    return [(bucket, label, counts[bucket]) for bucket, label in BUCKETS.items()]
+
+
+def adjust(changes, worker_ids, everyone=True):
+    """
+    Apply ``{bucket: delta}`` to the cached counts of the workers and, with
+    ``everyone``, to the overall counts. Entries that aren't cached are
+    counted on their next read, so they are left alone.
+    """
+    today = timezone.localdate()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        return
+    scopes = [EVERYONE] if everyone else []
+    for scope in [*scopes, *worker_ids]:
+        keys = get_keys(scope, today, version)
+        for bucket, delta in changes.items():
+            if delta:
+                try:
+                    cache.incr(keys[bucket], delta)
+                except ValueError:
+                    pass
+
+
+def forget(worker_ids):
+    today = timezone.localdate()
+    version = cache.get(VERSION_KEY)
+    if version is not None:
+        cache.delete_many(
+            [
+                key
+                for worker_id in worker_ids
+                for key in get_keys(worker_id, today, version).values()
+            ]
+        )
+
+
+def invalidate():
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def on_commit(func, *args, **kwargs):
+    transaction.on_commit(partial(func, *args, **kwargs))
+
+
+def task_saved(task, created):
+    today = timezone.localdate()
+    new = bucket_for(task.deadline, task.is_completed, today)
+    if created:
+        # Assignees are added after the task is saved.
+        if new:
+            on_commit(adjust, {new: 1}, [])
+        return
+
+    loaded = getattr(task, "_loaded_values", None)
+    if loaded is None or "deadline" not in loaded or "is_completed" not in loaded:
+        on_commit(invalidate)
+        return
+    old = bucket_for(loaded["deadline"], loaded["is_completed"], today)
+    if old == new:
+        return
+    changes = {}
+    if old:
+        changes[old] = -1
+    if new:
+        changes[new] = changes.get(new, 0) + 1
+    worker_ids = list(task.assignees.values_list("pk", flat=True))
+    on_commit(adjust, changes, worker_ids)
+
+
+def remember_assignees(task):
+    task._assignee_ids = list(task.assignees.values_list("pk", flat=True))
+
+
+def task_deleted(task):
+    loaded = getattr(task, "_loaded_values", None) or {}
+    old = bucket_for(
+        loaded.get("deadline", task.deadline),
+        loaded.get("is_completed", task.is_completed),
+        timezone.localdate(),
+    )
+    if old:
+        on_commit(adjust, {old: -1}, getattr(task, "_assignee_ids", []))
+
+
+def assignees_changed(instance, action, reverse, pk_set):
+    """
+    Keep the per-worker counts in step with ``Task.assignees``. Additions
+    report only the rows actually inserted, so they are applied as
+    increments; the workers affected by a removal are counted again.
+    """
+    if action == "post_add" and pk_set:
+        today = timezone.localdate()
+        if reverse:
+            changes = {}
+            for deadline in (
+                get_open_tasks(today)
+                .filter(pk__in=pk_set)
+                .values_list("deadline", flat=True)
+            ):
+                bucket = bucket_for(deadline, False, today)
+                changes[bucket] = changes.get(bucket, 0) + 1
+            on_commit(adjust, changes, [instance.pk], everyone=False)
+        else:
+            bucket = bucket_for(instance.deadline, instance.is_completed, today)
+            if bucket:
+                on_commit(adjust, {bucket: 1}, list(pk_set), everyone=False)
+    elif action == "post_remove":
+        on_commit(forget, [instance.pk] if reverse else list(pk_set))
+    elif action == "pre_clear":
+        instance._bucket_worker_ids = (
+            [instance.pk]
+            if reverse
+            else list(instance.assignees.values_list("pk", flat=True))
+        )
+    elif action == "post_clear":
+        on_commit(forget, getattr(instance, "_bucket_worker_ids", []))
@@ -0,0 +1,130 @@
+"""
+Bulk task operations applied with set-based UPDATEs and m2m inserts/deletes
+inside one transaction. The project-deadline and assignee rules of
+``TaskProjectForm`` and the team-membership rule of ``toggle_assign_to_task``
+are checked for the whole selection up front, so an action either applies to
+every task or to none.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from manager.models import Task, Worker
+from manager.signals import tasks_bulk_changed
+from manager.utils import chunked
+
+COMPLETE = "complete"
+SET_PRIORITY = "set_priority"
+MOVE_PROJECT = "move_project"
+ADD_ASSIGNEE = "add_assignee"
+REMOVE_ASSIGNEE = "remove_assignee"
+
+ACTION_CHOICES = [
+    (COMPLETE, "Mark as completed"),
+    (SET_PRIORITY, "Change priority"),
+    (MOVE_PROJECT, "Move to project"),
+    (ADD_ASSIGNEE, "Add assignee"),
+    (REMOVE_ASSIGNEE, "Remove assignee"),
+]
+
+
+def format_ids(ids, limit=10):
+    shown = ", ".join(str(pk) for pk in ids[:limit])
+    return shown + (", ..." if len(ids) > limit else "")
+
+
+def check_project_deadline(selected, project):
+    too_late = list(
+        selected.filter(deadline__gt=project.deadline).values_list("pk", flat=True)
+    )
+    if too_late:
+        raise ValidationError(
+            "Deadline can't be after deadline project "
+            f"(tasks {format_ids(too_late)})."
+        )
+
+
+def check_project_assignees(selected, project):
+    outsiders = {}
+    rows = (
+        Task.assignees.through.objects.filter(task__in=selected)
+        .exclude(worker__in=Worker.objects.filter(teams__projects=project))
+        .order_by("worker__username", "task_id")
+        .values_list("worker__username", "task_id")
+    )
+    for username, task_id in rows:
+        outsiders.setdefault(username, []).append(task_id)
+    if outsiders:
+        raise ValidationError(
+            [
+                f"{username} needs to be a member of team who is in project "
+                f"(tasks {format_ids(task_ids)})."
+                for username, task_ids in outsiders.items()
+            ]
+        )
+
+
+def check_team_membership(selected, worker):
+    outsiders = list(
+        selected.filter(project__isnull=False)
+        .exclude(project__team__members=worker)
+        .values_list("pk", flat=True)
+    )
+    if outsiders:
+        raise ValidationError(
+            f"{worker.username} needs to be a member of team who is in project "
+            f"(tasks {format_ids(outsiders)})."
+        )
+
+
+def apply_bulk_action(tasks, action, *, priority=None, project=None, worker=None):
+    """
+    Apply ``action`` to every task in the ``tasks`` queryset and return the
+    number of tasks selected. Raises ``ValidationError`` if any task breaks
+    a rule, leaving all of them untouched.
+    """
+    with transaction.atomic():
+        rows = list(
+            Task.objects.filter(pk__in=tasks.order_by().values("pk"))
+            .select_for_update()
+            .values_list("pk", "project_id")
+        )
+        task_ids = [pk for pk, _ in rows]
+        project_ids = {project_id for _, project_id in rows if project_id}
+        if not task_ids:
+            return 0
+        selected = Task.objects.filter(pk__in=task_ids)
+
+        if action == COMPLETE:
+            fields = {"is_completed": True}
+        elif action == SET_PRIORITY:
+            fields = {"priority": priority}
+        elif action == MOVE_PROJECT:
+            check_project_deadline(selected, project)
+            check_project_assignees(selected, project)
+            fields = {"project": project}
+            project_ids.add(project.pk)
+        elif action in (ADD_ASSIGNEE, REMOVE_ASSIGNEE):
+            if action == ADD_ASSIGNEE:
+                check_team_membership(selected, worker)
+            for chunk in chunked(task_ids):
+                if action == ADD_ASSIGNEE:
+                    worker.tasks.add(*chunk)
+                else:
+                    worker.tasks.remove(*chunk)
+            return len(task_ids)
+        else:
+            raise ValueError(f"Unknown bulk action {action!r}.")
+
+        for chunk in chunked(task_ids):
+            # QuerySet.update() leaves auto_now fields alone.
+            Task.objects.filter(pk__in=chunk).update(
+                **fields, updated_at=timezone.now()
+            )
+        tasks_bulk_changed.send(
+            sender=Task,
+            task_ids=task_ids,
+            project_ids=project_ids,
+            fields=list(fields),
+        )
+    return len(task_ids)
@@ -0,0 +1,82 @@
+"""
+Change numbering for the sync API. Every change to a task, project, team or
+worker, including the ``updated_at`` bumps of ``manager.versions``, moves
+the row's single ``ChangeLog`` entry to the next number of one global
+sequence; a deletion turns it into a tombstone. Clients ask for the entries
+after the last number they saw, so a sync costs one index range scan and
+the rows that changed, whatever the table size.
+
+Numbers must become visible in order, or a client could move past a change
+that commits later under a lower number. ``allocate`` increments the one
+``ChangeSequence`` row, whose lock is held until the writing transaction
+commits, so writers of tracked rows commit one after the other from their
+first recorded change on.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from manager.models import ChangeLog, ChangeSequence, Project, Task, Team, Worker
+from manager.utils import chunked
+
+KINDS = {Task: "tasks", Project: "projects", Team: "teams", Worker: "workers"}
+MODELS = {kind: model for model, kind in KINDS.items()}
+
+
+def allocate(count):
+    """Reserve ``count`` numbers and return the first."""
+    with transaction.atomic():
+        if not ChangeSequence.objects.filter(pk=1).update(last=F("last") + count):
+            ChangeSequence.objects.create(pk=1, last=count)
+        last = ChangeSequence.objects.values_list("last", flat=True).get(pk=1)
+    return last - count + 1
+
+
+def record(model, pks, deleted=False):
+    """Number a change to the ``model`` rows ``pks``."""
+    kind = KINDS.get(model)
+    pks = sorted({pk for pk in pks if pk is not None})
+    if kind is None or not pks:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        first = allocate(len(pks))
+        for offset, chunk in enumerate(chunked(pks, 1000)):
+            ChangeLog.objects.bulk_create(
+                [
+                    ChangeLog(
+                        kind=kind,
+                        object_id=pk,
+                        seq=first + offset * 1000 + position,
+                        deleted=deleted,
+                        changed_at=now,
+                    )
+                    for position, pk in enumerate(chunk)
+                ],
+                update_conflicts=True,
+                unique_fields=["kind", "object_id"],
+                update_fields=["seq", "deleted", "changed_at"],
+            )
+
+
+def backfill():
+    """Record the rows that have no entry, e.g. written with raw SQL."""
+    for model, kind in KINDS.items():
+        logged = ChangeLog.objects.filter(kind=kind).values("object_id")
+        record(
+            model,
+            model._base_manager.exclude(pk__in=logged).values_list("pk", flat=True),
+        )
+
+
+def get_entries(kind, since, limit, until=None):
+    """
+    ``(seq, object_id, deleted)`` of the ``kind`` entries after ``since``, and
+    up to ``until`` if given.
+    """
+    entries = ChangeLog.objects.filter(kind=kind, seq__gt=since)
+    if until is not None:
+        entries = entries.filter(seq__lte=until)
+    return list(
+        entries.order_by("seq").values_list("seq", "object_id", "deleted")[:limit]
+    )
@@ -0,0 +1,80 @@
+"""
+Conditional GETs for the detail pages. A view's ``get_version_queryset``
+reads the newest ``updated_at`` among the rows its page shows in one query
+(see ``manager.versions``), and ``get_validators`` turns it into an ETag and
+a Last-Modified. A client that has the current page gets a 304 before the
+object, its prefetches or the template are loaded.
+
+The ETag also covers what the page shows besides those rows: the user in
+the navigation bar, the release and, for pages that count overdue tasks,
+the date. A page with pending messages is always rendered, so the messages
+are shown and consumed.
+"""
+import hashlib
+from datetime import datetime, time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition
+
+
+class ConditionalMixin:
+    # Whether the page changes at midnight, e.g. because it counts overdue
+    # tasks.
+    depends_on_date = False
+
+    def get_version_queryset(self):
+        """A ``values()`` queryset of the page's modification times."""
+        raise NotImplementedError
+
+    def get_validators(self, version):
+        """``(etag, last_modified)`` of the page at ``version``, or Nones."""
+        if version is None or len(get_messages(self.request)):
+            return None, None
+        user = self.request.user
+        parts = [settings.RELEASE, user.pk, user.updated_at, *version.values()]
+        times = [value for value in version.values() if value is not None]
+        times.append(user.updated_at)
+        if self.depends_on_date:
+            today = timezone.localdate()
+            parts.append(today)
+            times.append(timezone.make_aware(datetime.combine(today, time.min)))
+        return hashlib.md5(repr(parts).encode()).hexdigest(), max(times)
+
+    def patch_response(self, response):
+        # Browsers revalidate instead of guessing a lifetime from
+        # Last-Modified, and shared caches keep out of per-user pages.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ConditionalDetailMixin(ConditionalMixin):
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(self.get_version_queryset().first())
+        response = condition(
+            etag_func=lambda request, *args, **kwargs: etag,
+            last_modified_func=lambda request, *args, **kwargs: last_modified,
+        )(super().get)(request, *args, **kwargs)
+        return self.patch_response(response)
+
+
+class AsyncConditionalDetailMixin(ConditionalMixin):
+    async def get(self, request, *args, **kwargs):
+        # condition() can't wrap a coroutine before Django 5.0; these are
+        # its steps.
+        etag, last_modified = self.get_validators(
+            await self.get_version_queryset().afirst()
+        )
+        etag = quote_etag(etag) if etag else None
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        if timestamp and not response.has_header("Last-Modified"):
+            response.headers["Last-Modified"] = http_date(timestamp)
+        return self.patch_response(response)
@@ -0,0 +1,118 @@
+"""
+Denormalized counters on Project (open/total tasks) and Team (members and
+projects). Signal handlers in ``manager.signals`` keep them in step with
+``F()`` updates; the ``recount`` functions rebuild them from scratch for
+bulk writes and for the ``recount`` management command.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from manager.models import Task, Team, Project
+
+
+def count_subquery(queryset, column):
+    counted = (
+        queryset.filter(**{column: OuterRef("pk")})
+        .order_by()
+        .values(column)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def filter_pks(queryset, pks):
+    return queryset if pks is None else queryset.filter(pk__in=list(pks))
+
+
+def recount_projects(pks=None):
+    return filter_pks(Project.objects.all(), pks).update(
+        total_task_count=count_subquery(Task.objects.all(), "project_id"),
+        open_task_count=count_subquery(
+            Task.objects.filter(is_completed=False), "project_id"
+        ),
+    )
+
+
+def recount_teams(pks=None):
+    return filter_pks(Team.objects.all(), pks).update(
+        member_count=count_subquery(Team.members.through.objects.all(), "team_id"),
+        project_count=count_subquery(Project.team.through.objects.all(), "team_id"),
+    )
+
+
+def add_to_project(project_id, total, open_):
+    if project_id is None or not (total or open_):
+        return
+    Project.objects.filter(pk=project_id).update(
+        total_task_count=F("total_task_count") + total,
+        open_task_count=F("open_task_count") + open_,
+    )
+
+
+def task_saved(task, created):
+    is_open = int(not task.is_completed)
+    if created:
+        add_to_project(task.project_id, 1, is_open)
+        return
+
+    loaded = getattr(task, "_loaded_values", None)
+    if loaded is None or "project_id" not in loaded or "is_completed" not in loaded:
+        recount_projects([task.project_id])
+        return
+    was_open = int(not loaded["is_completed"])
+    if loaded["project_id"] == task.project_id:
+        add_to_project(task.project_id, 0, is_open - was_open)
+    else:
+        add_to_project(loaded["project_id"], -1, -was_open)
+        add_to_project(task.project_id, 1, is_open)
+
+
+def task_deleted(task):
+    loaded = getattr(task, "_loaded_values", None) or {}
+    project_id = loaded.get("project_id", task.project_id)
+    is_completed = loaded.get("is_completed", task.is_completed)
+    add_to_project(project_id, -1, -int(not is_completed))
+
+
+def team_ids_for(worker_or_project):
+    if isinstance(worker_or_project, Project):
+        return Project.team.through.objects.filter(
+            project_id=worker_or_project.pk
+        ).values_list("team_id", flat=True)
+    return Team.members.through.objects.filter(
+        worker_id=worker_or_project.pk
+    ).values_list("team_id", flat=True)
+
+
+def relation_changed(field, instance, action, pk_set):
+    """
+    Adjust ``Team.<field>`` after an m2m change on ``Team.members`` or
+    ``Project.team``. Additions only report rows that were actually inserted,
+    so they are applied as increments; removals recount the affected teams.
+    """
+    is_team = isinstance(instance, Team)
+    if action == "pre_clear" and not is_team:
+        remember_teams(instance)
+    elif action == "post_add" and pk_set:
+        if is_team:
+            Team.objects.filter(pk=instance.pk).update(
+                **{field: F(field) + len(pk_set)}
+            )
+        else:
+            Team.objects.filter(pk__in=pk_set).update(**{field: F(field) + 1})
+    elif action == "post_remove" or action == "post_clear":
+        if is_team:
+            recount_teams([instance.pk])
+        elif action == "post_clear":
+            recount_remembered_teams(instance)
+        else:
+            recount_teams(pk_set or [])
+
+
+def remember_teams(instance):
+    instance._cleared_team_ids = list(team_ids_for(instance))
+
+
+def recount_remembered_teams(instance):
+    recount_teams(getattr(instance, "_cleared_team_ids", []))
@@ -0,0 +1,273 @@
+"""
+Live updates for the project page, as Server-Sent Events. A viewer keeps one
+connection open instead of reloading the page; each task created, completed,
+assigned, edited, moved or deleted arrives as an ``event: task`` whose data
+is the task's new TO DO table row, or ``null`` when the row should go::
+
+    id: 42
+    event: task
+    data: {"id": 7, "project": 3, "html": "<tr ...>...</tr>"}
+
+Changes come from the sync API's change log (see ``manager.changelog``),
+which every process writes. Each process runs one poller while it has
+viewers: it reads the task entries after the last one it saw, renders each
+changed row once and hands it to the viewers of the task's project, and to
+those that show the task if it left. Writes in the same process wake the
+poller on commit, so their events go out at once; writes in other processes
+show up within ``EVENTS_POLL_INTERVAL``. The poll costs one indexed query
+however many viewers there are.
+
+The page carries the change it was rendered at, and its first stream
+starts there, replaying what changed before the viewer subscribed. Django 4.2
+doesn't tell a streaming response that its client went away, so each stream
+ends after ``EVENTS_STREAM_TIMEOUT``; the browser reconnects with the last
+``id`` it got and catches up the same way. Besides each event's, an ``id``
+goes out once the stream has caught up and with every heartbeat, so a quiet
+stream moves it forward too.
+"""
+import asyncio
+import json
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.template.loader import render_to_string
+
+from manager.changelog import get_entries
+from manager.models import ChangeSequence, Project, Task
+
+ROW_TEMPLATE = "includes/project_task_row.html"
+# Changes read per poll, and the most a reconnecting stream catches up on
+# before it asks the page to reload instead.
+BATCH_SIZE = 500
+# Events a slow viewer may fall behind by before it's told to reload.
+QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RETRY_MS = 2000
+RELOAD = object()
+
+
+async def aget_last_seq():
+    return (
+        await ChangeSequence.objects.filter(pk=1)
+        .values_list("last", flat=True)
+        .afirst()
+        or 0
+    )
+
+
+def load_events(since, limit=BATCH_SIZE, until=None, project_id=None):
+    """
+    ``(seq, task id, project id, row html)`` of the task changes after
+    ``since``, up to ``until``. With ``project_id``, the tasks outside that
+    project come as removals, like deleted ones.
+    """
+    try:
+        entries = get_entries("tasks", since, limit, until)
+        tasks = Task.objects.select_related("task_type").prefetch_related("assignees")
+        if project_id is not None:
+            tasks = tasks.filter(project_id=project_id)
+        tasks = tasks.in_bulk([pk for _, pk, deleted in entries if not deleted])
+        events = []
+        for seq, pk, deleted in entries:
+            task = tasks.get(pk)
+            if task is None:
+                events.append((seq, pk, None, None))
+            else:
+                html = render_to_string(ROW_TEMPLATE, {"task": task})
+                events.append((seq, pk, task.project_id, html))
+        return events
+    finally:
+        close_old_connections()
+
+
+async def aget_task_ids(project_id):
+    """Task ids of project ``project_id``, or None if there's no such project."""
+    task_ids = {
+        pk
+        async for pk in Task.objects.filter(project_id=project_id).values_list(
+            "pk", flat=True
+        )
+    }
+    if not task_ids and not await Project.objects.filter(pk=project_id).aexists():
+        return None
+    return task_ids
+
+
+class Subscription:
+    """One viewer of ``project_id``, which shows the tasks ``task_ids``."""
+
+    def __init__(self, project_id, task_ids):
+        self.project_id = project_id
+        self.task_ids = task_ids
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+
+    def accepts(self, event):
+        """Whether ``event`` changes the page, tracking the tasks it shows."""
+        _, pk, project_id, _ = event
+        if project_id == self.project_id:
+            self.task_ids.add(pk)
+            return True
+        if pk in self.task_ids:
+            self.task_ids.discard(pk)
+            return True
+        return False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Tell it to reload once the queue drains a little.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RELOAD)
+
+
+class Broadcaster:
+    """The viewers in this process, fed by one poller on its event loop."""
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.last_seq = None
+        self.poller = None
+        self.loop = None
+        self.wakeup = None
+
+    async def subscribe(self, project_id, task_ids):
+        """
+        ``(subscription, seq)``: the subscription's queue gets every change
+        after ``seq``, the last one published before it.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # E.g. a new test's loop; the old poller went with its own.
+            self.loop = loop
+            self.last_seq = self.poller = None
+        if self.last_seq is None:
+            last_seq = await aget_last_seq()
+            if self.last_seq is None:
+                self.last_seq = last_seq
+        subscription = Subscription(project_id, task_ids)
+        self.subscriptions[project_id].add(subscription)
+        if self.poller is None or self.poller.done():
+            self.wakeup = asyncio.Event()
+            self.poller = loop.create_task(self.run())
+        return subscription, self.last_seq
+
+    def unsubscribe(self, subscription):
+        subscriptions = self.subscriptions[subscription.project_id]
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self.subscriptions[subscription.project_id]
+        if not self.subscriptions and self.wakeup is not None:
+            self.wakeup.set()
+
+    def notify(self):
+        """Poll now; safe to call from any thread, e.g. on commit."""
+        loop, wakeup = self.loop, self.wakeup
+        if loop is None or not self.subscriptions:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # The loop has closed, e.g. between tests.
+            pass
+
+    def publish(self, events):
+        for event in events:
+            for subscriptions in list(self.subscriptions.values()):
+                for subscription in subscriptions:
+                    if subscription.accepts(event):
+                        subscription.put(event)
+
+    async def poll(self):
+        events = await sync_to_async(load_events)(self.last_seq)
+        if events:
+            self.last_seq = events[-1][0]
+            self.publish(events)
+        return len(events) == BATCH_SIZE
+
+    async def run(self):
+        while self.subscriptions:
+            try:
+                if await self.poll():
+                    continue
+            except DatabaseError:
+                # E.g. the database restarted; the next poll tries again.
+                pass
+            try:
+                await asyncio.wait_for(
+                    self.wakeup.wait(), settings.EVENTS_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+        self.last_seq = None
+
+
+broadcaster = Broadcaster()
+
+
+def format_event(event):
+    seq, pk, project_id, html = event
+    data = json.dumps({"id": pk, "project": project_id, "html": html})
+    return f"id: {seq}\nevent: task\ndata: {data}\n\n"
+
+
+def parse_event_id(value):
+    try:
+        seq = int(value)
+    except (TypeError, ValueError):
+        return None
+    return seq if seq >= 0 else None
+
+
+async def stream(project_id, task_ids, since=None):
+    """
+    Yield the SSE stream of project ``project_id``'s task changes after change
+    ``since``, or from now on if it's None.
+    """
+    subscription, published = await broadcaster.subscribe(project_id, task_ids)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        if since is None:
+            since = published
+        elif since < published:
+            # The changes published before the subscription. The page may
+            # show any task that changed, so those outside the project go
+            # out as removals.
+            events = await sync_to_async(load_events)(
+                since, BATCH_SIZE, published, project_id
+            )
+            if len(events) == BATCH_SIZE:
+                yield "event: reload\ndata: null\n\n"
+                return
+            for event in events:
+                subscription.accepts(event)
+                yield format_event(event)
+            since = published
+        yield f"id: {since}\n\n"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EVENTS_STREAM_TIMEOUT
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), min(HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection. Every change
+                # published so far has been sent, so a reconnect can skip them.
+                since = max(since, broadcaster.last_seq or 0)
+                yield f": keep-alive\nid: {since}\n\n"
+                continue
+            if event is RELOAD:
+                yield "event: reload\ndata: null\n\n"
+                return
+            if event[0] <= since:
+                # Already on the page, which may be newer than this row.
+                continue
+            since = event[0]
+            yield format_event(event)
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,140 @@
+"""
+Streaming CSV / NDJSON exports. Rows are read with ``QuerySet.iterator()``,
+so only one chunk of objects (and the related rows prefetched for it) is held
+in memory at a time, however large the table is.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+from manager.forms import ProjectSearchForm, TaskSearchForm, WorkerSearchForm
+from manager.models import Project, Task, Team, Worker
+from manager.search import search
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def join_names(objects, attr="name"):
+    return ";".join(getattr(obj, attr) for obj in objects)
+
+
+class Export:
+    def __init__(self, queryset, search_form, search_field, columns, filters=()):
+        self.queryset = queryset
+        self.search_form = search_form
+        self.search_field = search_field
+        self.columns = columns
+        # Search form fields that filter the model field of the same name.
+        self.filters = filters
+
+    def get_queryset(self, params=None):
+        """
+        The rows to export, filtered the same way as the list view when
+        ``params`` holds that view's search query.
+        """
+        queryset = self.queryset()
+        form = self.search_form(params or {})
+        if not form.is_valid():
+            return queryset
+        for field in self.filters:
+            if form.cleaned_data[field] is not None:
+                queryset = queryset.filter(**{field: form.cleaned_data[field]})
+        return search(queryset, form.cleaned_data[self.search_field])
+
+    def rows(self, queryset, chunk_size=CHUNK_SIZE):
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            yield {name: value(obj) for name, value in self.columns}
+
+
+EXPORTS = {
+    "tasks": Export(
+        queryset=lambda: Task.objects.select_related("task_type", "project")
+        .prefetch_related(
+            Prefetch("assignees", queryset=Worker.objects.only("username"))
+        )
+        .order_by("is_completed", "deadline", "name"),
+        search_form=TaskSearchForm,
+        search_field="name",
+        filters=["priority"],
+        columns=[
+            ("id", lambda task: task.pk),
+            ("name", lambda task: task.name),
+            ("description", lambda task: task.description),
+            ("deadline", lambda task: task.deadline),
+            ("is_completed", lambda task: task.is_completed),
+            ("priority", lambda task: task.get_priority_display()),
+            ("task_type", lambda task: task.task_type and task.task_type.name),
+            ("project", lambda task: task.project and task.project.name),
+            ("assignees", lambda task: join_names(task.assignees.all(), "username")),
+        ],
+    ),
+    "projects": Export(
+        queryset=lambda: Project.objects.prefetch_related(
+            Prefetch("team", queryset=Team.objects.only("name"))
+        ),
+        search_form=ProjectSearchForm,
+        search_field="name",
+        columns=[
+            ("id", lambda project: project.pk),
+            ("name", lambda project: project.name),
+            ("description", lambda project: project.description),
+            ("deadline", lambda project: project.deadline),
+            ("is_completed", lambda project: project.is_completed),
+            ("open_tasks", lambda project: project.open_task_count),
+            ("total_tasks", lambda project: project.total_task_count),
+            ("teams", lambda project: join_names(project.team.all())),
+        ],
+    ),
+    "workers": Export(
+        queryset=lambda: Worker.objects.select_related("position").prefetch_related(
+            Prefetch("teams", queryset=Team.objects.only("name"))
+        ),
+        search_form=WorkerSearchForm,
+        search_field="username",
+        columns=[
+            ("id", lambda worker: worker.pk),
+            ("username", lambda worker: worker.username),
+            ("first_name", lambda worker: worker.first_name),
+            ("last_name", lambda worker: worker.last_name),
+            ("email", lambda worker: worker.email),
+            ("position", lambda worker: worker.position and worker.position.name),
+            ("teams", lambda worker: join_names(worker.teams.all())),
+        ],
+    ),
+}
+
+
+class Echo:
+    """File-like object handing back what ``csv.writer`` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(export, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in export.columns])
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+def ndjson_lines(export, rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream(kind, fmt="csv", params=None, chunk_size=CHUNK_SIZE):
+    """Yield the lines of the ``kind`` export in format ``fmt``."""
+    export = EXPORTS[kind]
+    rows = export.rows(export.get_queryset(params), chunk_size=chunk_size)
+    if fmt == "csv":
+        return csv_lines(export, rows)
+    if fmt == "ndjson":
+        return ndjson_lines(export, rows)
+    raise ValueError(f"Unknown export format {fmt!r}.")
@@ -0,0 +1,303 @@
+"""
+Synthetic data for load testing. Rows are built from a seeded
+``random.Random`` and written in batches, with primary keys assigned up
+front so the m2m through rows can be written without reading anything back.
+The small tables go through ``bulk_create``; tasks and the through tables
+are written as plain tuples with multi-row INSERTs, because building model
+instances costs more than the database does at millions of rows. No signals
+fire, so counters, the search index, the change log and the dashboard caches
+are rebuilt once at the end.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from manager import buckets, changelog, counters, search, stats, workload
+from manager.models import Position, Project, Task, TaskType, Team, Worker
+from manager.utils import chunked
+
+BATCH_SIZE = 5000
+DEFAULT_COUNTS = {
+    "workers": 1000,
+    "teams": 100,
+    "projects": 500,
+    "tasks": 100000,
+}
+PASSWORD = "worker1qazcde3"
+
+POSITION_NAMES = [
+    "Developer",
+    "Senior Developer",
+    "Team Lead",
+    "Designer",
+    "Tester",
+    "Project Manager",
+    "DevOps",
+    "Business Analyst",
+    "Data Engineer",
+    "Support",
+]
+TASK_TYPE_NAMES = [
+    "Bug",
+    "New feature",
+    "Breaking change",
+    "Refactoring",
+    "QA",
+    "Documentation",
+    "Research",
+    "Deployment",
+]
+VERBS = ["Fix", "Add", "Update", "Remove", "Review", "Test", "Document", "Migrate"]
+NOUNS = [
+    "login page",
+    "billing report",
+    "search index",
+    "user profile",
+    "email queue",
+    "dashboard",
+    "export job",
+    "API client",
+    "permissions",
+    "mobile layout",
+]
+ADJECTIVES = ["Red", "Blue", "Green", "Swift", "Silent", "Bright", "Iron", "Solar"]
+ANIMALS = ["Foxes", "Owls", "Wolves", "Hawks", "Otters", "Bears", "Lynxes"]
+FIRST_NAMES = ["Anna", "Ben", "Chloe", "Dmytro", "Emma", "Farid", "Grace", "Hugo"]
+LAST_NAMES = ["Adams", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia"]
+TASK_FIELDS = [
+    "id",
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type",
+    "project",
+    "created_at",
+    "updated_at",
+]
+PRIORITY_WEIGHTS = [(Task.URGENT, 1), (Task.HIGH, 2), (Task.MEDIUM, 4), (Task.LOW, 3)]
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+
+def bulk_insert(model, objects, batch_size):
+    total = 0
+    for batch in chunked(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch, batch_size=batch_size)
+        total += len(batch)
+    return total
+
+
+def insert_rows(model, fields, rows, batch_size):
+    """
+    INSERT ``rows`` (tuples of values for ``fields``) into the table of
+    ``model`` with one multi-row statement per batch.
+    """
+    meta = model._meta
+    columns = ", ".join(
+        connection.ops.quote_name(meta.get_field(field).column) for field in fields
+    )
+    max_params = connection.features.max_query_params or 65535
+    rows_per_statement = max(1, min(batch_size, max_params // len(fields)))
+    row_sql = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    total = 0
+    with connection.cursor() as cursor:
+        for batch in chunked(rows, rows_per_statement):
+            cursor.execute(
+                f"INSERT INTO {connection.ops.quote_name(meta.db_table)} "
+                f"({columns}) VALUES {', '.join([row_sql] * len(batch))}",
+                [value for row in batch for value in row],
+            )
+            total += len(batch)
+    return total
+
+
+def ensure_named(model, names):
+    """Ids of the ``names`` rows of a model with a unique name, created if needed."""
+    model.objects.bulk_create(
+        [model(name=name) for name in names], ignore_conflicts=True
+    )
+    return list(
+        model.objects.filter(name__in=names).order_by("pk").values_list("pk", flat=True)
+    )
+
+
+def generate_fake_data(
+    counts=None, seed=0, batch_size=BATCH_SIZE, index=True, log=None
+):
+    """
+    Create ``counts`` (see ``DEFAULT_COUNTS``) of workers, teams, projects
+    and tasks plus the fixed positions and task types, and return the
+    number of rows created per model. The same seed gives the same data
+    relative to today's date.
+    """
+    counts = {**DEFAULT_COUNTS, **(counts or {})}
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    today = timezone.localdate()
+    created = {}
+
+    position_ids = ensure_named(Position, POSITION_NAMES)
+    task_type_ids = ensure_named(TaskType, TASK_TYPE_NAMES)
+
+    # One hash for every worker: hashing per row would dominate the run.
+    password = make_password(PASSWORD)
+    first_worker = next_pk(Worker)
+    worker_ids = range(first_worker, first_worker + counts["workers"])
+    created["workers"] = bulk_insert(
+        Worker,
+        (
+            Worker(
+                pk=pk,
+                username=f"worker{pk}",
+                password=password,
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+                email=f"worker{pk}@example.com",
+                position_id=rng.choice(position_ids),
+            )
+            for pk in worker_ids
+        ),
+        batch_size,
+    )
+    log(f"Created {created['workers']} workers.")
+
+    first_team = next_pk(Team)
+    team_ids = range(first_team, first_team + counts["teams"])
+    created["teams"] = bulk_insert(
+        Team,
+        (
+            Team(pk=pk, name=f"{rng.choice(ADJECTIVES)} {rng.choice(ANIMALS)} {pk}")
+            for pk in team_ids
+        ),
+        batch_size,
+    )
+    # Every worker is in one to three teams.
+    team_members = {pk: [] for pk in team_ids}
+    if team_ids:
+        for worker_id in worker_ids:
+            for team_id in rng.sample(team_ids, min(len(team_ids), rng.randint(1, 3))):
+                team_members[team_id].append(worker_id)
+    with transaction.atomic():
+        insert_rows(
+            Team.members.through,
+            ["team", "worker"],
+            (
+                (team_id, worker_id)
+                for team_id, members in team_members.items()
+                for worker_id in members
+            ),
+            batch_size,
+        )
+    log(f"Created {created['teams']} teams.")
+
+    first_project = next_pk(Project)
+    project_ids = range(first_project, first_project + counts["projects"])
+    project_deadlines = {}
+    projects = []
+    for pk in project_ids:
+        project_deadlines[pk] = today + timedelta(days=rng.randint(-60, 365))
+        projects.append(
+            Project(
+                pk=pk,
+                name=f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {pk}",
+                description=f"Project {pk} generated for load testing.",
+                deadline=project_deadlines[pk],
+                is_completed=project_deadlines[pk] < today and rng.random() < 0.8,
+            )
+        )
+    created["projects"] = bulk_insert(Project, projects, batch_size)
+    completed_projects = {project.pk for project in projects if project.is_completed}
+    # Every project has one to three teams; its tasks go to their members.
+    project_members = {}
+    project_teams = []
+    for pk in project_ids:
+        teams = rng.sample(team_ids, min(len(team_ids), rng.randint(1, 3)))
+        project_teams.extend((pk, team_id) for team_id in teams)
+        project_members[pk] = sorted(
+            {worker_id for team_id in teams for worker_id in team_members[team_id]}
+        )
+    with transaction.atomic():
+        insert_rows(
+            Project.team.through, ["project", "team"], project_teams, batch_size
+        )
+    log(f"Created {created['projects']} projects.")
+
+    priorities, priority_weights = zip(*PRIORITY_WEIGHTS)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    first_task = next_pk(Task)
+    task_ids = range(first_task, first_task + counts["tasks"])
+    created["tasks"] = 0
+    for batch in chunked(task_ids, batch_size):
+        tasks, assignees = [], []
+        for pk in batch:
+            project_id = (
+                rng.choice(project_ids) if project_ids and rng.random() < 0.9 else None
+            )
+            if project_id:
+                deadline = project_deadlines[project_id] - timedelta(
+                    days=rng.randint(0, 90)
+                )
+                candidates = project_members[project_id]
+            else:
+                deadline = today + timedelta(days=rng.randint(-90, 180))
+                candidates = worker_ids
+            tasks.append(
+                (
+                    pk,
+                    f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{pk}",
+                    f"Task {pk} generated for load testing.",
+                    deadline.isoformat(),
+                    project_id in completed_projects
+                    or rng.random() < (0.8 if deadline < today else 0.2),
+                    rng.choices(priorities, priority_weights)[0],
+                    rng.choice(task_type_ids),
+                    project_id,
+                    now,
+                    now,
+                )
+            )
+            if candidates:
+                assignees.extend(
+                    (pk, worker_id)
+                    for worker_id in rng.sample(
+                        candidates, min(len(candidates), rng.randint(1, 3))
+                    )
+                )
+        with transaction.atomic():
+            insert_rows(Task, TASK_FIELDS, tasks, batch_size)
+            insert_rows(
+                Task.assignees.through, ["task", "worker"], assignees, batch_size
+            )
+        created["tasks"] += len(tasks)
+        log(f"Created {created['tasks']} of {counts['tasks']} tasks.")
+
+    reset_sequences()
+    counters.recount_projects()
+    counters.recount_teams()
+    workload.rebuild()
+    changelog.backfill()
+    if index:
+        for model in search.SEARCH_FIELDS:
+            search.index_objects(model)
+        log("Rebuilt the search index.")
+    stats.invalidate_dashboard_stats()
+    buckets.invalidate()
+    return created
+
+
+def reset_sequences():
+    """Move PostgreSQL id sequences past the ids assigned above."""
+    models = [Worker, Team, Project, Task]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
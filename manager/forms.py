@@ -6,7 +6,15 @@ from django.forms import NumberInput
 from django.forms.utils import ErrorList
 from django.utils import timezone
 
+from manager.bulk import (
+    ACTION_CHOICES,
+    SET_PRIORITY,
+    MOVE_PROJECT,
+    ADD_ASSIGNEE,
+    REMOVE_ASSIGNEE,
+)
 from manager.models import Worker, Task, Position, Project, Team
+from manager.search import search
 
 
 class SignUpForm(UserCreationForm):
@@ -161,12 +169,86 @@ class TaskForm(forms.ModelForm):
 
 
 class TaskSearchForm(forms.Form):
+    # Each ordering matches an index on Task, so a page is an index range scan.
+    ORDERINGS = {
+        "deadline": ("is_completed", "deadline", "name"),
+        "priority": ("is_completed", "priority", "deadline", "name"),
+    }
+
     name = forms.CharField(
         max_length=255,
         required=False,
         label="",
         widget=forms.TextInput(attrs={"placeholder": "Search by name"}),
     )
+    priority = forms.TypedChoiceField(
+        choices=[("", "Any priority"), *Task.PRIORITY_CHOICES],
+        coerce=int,
+        empty_value=None,
+        required=False,
+        label="",
+    )
+    ordering = forms.ChoiceField(
+        choices=[("deadline", "Deadline first"), ("priority", "Most urgent first")],
+        required=False,
+        label="",
+    )
+
+    def filter_queryset(self, queryset):
+        """Apply the cleaned search, priority filter and ordering."""
+        if self.cleaned_data["priority"] is not None:
+            queryset = queryset.filter(priority=self.cleaned_data["priority"])
+        if self.cleaned_data["ordering"]:
+            queryset = queryset.order_by(*self.ORDERINGS[self.cleaned_data["ordering"]])
+        return search(queryset, self.cleaned_data["name"])
+
+
+class TaskBulkActionForm(forms.Form):
+    tasks = forms.ModelMultipleChoiceField(
+        queryset=Task.objects.all(),
+        required=False,
+        widget=forms.MultipleHiddenInput,
+    )
+    select_all = forms.BooleanField(
+        required=False, label="Apply to every task matching the search"
+    )
+    name = forms.CharField(max_length=255, required=False, widget=forms.HiddenInput)
+    # The list's priority filter, so "select all" matches what is listed.
+    filter_priority = forms.TypedChoiceField(
+        choices=Task.PRIORITY_CHOICES,
+        coerce=int,
+        empty_value=None,
+        required=False,
+        widget=forms.HiddenInput,
+    )
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    priority = forms.TypedChoiceField(
+        choices=Task.PRIORITY_CHOICES, coerce=int, empty_value=None, required=False
+    )
+    project = forms.ModelChoiceField(queryset=Project.objects.all(), required=False)
+    # A text input avoids rendering every worker into the task list page.
+    assignee = forms.ModelChoiceField(
+        queryset=Worker.objects.all(),
+        required=False,
+        to_field_name="username",
+        widget=forms.TextInput(attrs={"placeholder": "Assignee username"}),
+    )
+
+    REQUIRED_FIELDS = {
+        SET_PRIORITY: "priority",
+        MOVE_PROJECT: "project",
+        ADD_ASSIGNEE: "assignee",
+        REMOVE_ASSIGNEE: "assignee",
+    }
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("select_all") and not cleaned_data.get("tasks"):
+            raise ValidationError("Select at least one task.")
+        required = self.REQUIRED_FIELDS.get(cleaned_data.get("action"))
+        if required and not cleaned_data.get(required):
+            self.add_error(required, "This field is required for this action.")
+        return cleaned_data
 
 
 class TaskTypeSearchForm(forms.Form):
@@ -215,6 +297,15 @@ class PositionSearchForm(forms.Form):
     )
 
 
+class ImportForm(forms.Form):
+    KIND_CHOICES = [("tasks", "Tasks"), ("workers", "Workers")]
+
+    kind = forms.ChoiceField(choices=KIND_CHOICES)
+    file = forms.FileField(
+        label="CSV file", widget=forms.ClearableFileInput(attrs={"accept": ".csv"})
+    )
+
+
 class ContactForm(forms.Form):
     first_name = forms.CharField(max_length=50)
     last_name = forms.CharField(max_length=50)
@@ -0,0 +1,168 @@
+"""
+Responsive images. ``build_images`` resizes every JPEG and PNG under
+``static/assets/img/`` to the ``WIDTHS`` narrower than the original and
+encodes each size as AVIF and WebP under ``static/assets/responsive/``,
+named after a hash of its content. It needs Pillow; AVIF is skipped when
+the installed Pillow can't write it.
+
+The ``{% responsive_image %}`` tag offers those files in a ``<picture>``
+with ``srcset`` and ``sizes``, so browsers download the smallest file that
+fills the slot, and falls back to the original while no build exists.
+"""
+import hashlib
+import io
+import json
+import re
+import shutil
+from functools import cache
+from pathlib import Path
+
+from django.conf import settings
+
+from manager.assets import find_source
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # pragma: no cover - optional
+    Image = None
+
+SOURCE_DIR = "assets/img"
+OUTPUT_DIR = "assets/responsive"
+MANIFEST = "manifest.json"
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+WIDTHS = [480, 960, 1440, 1920]
+# Best first: browsers take the first <source> whose type they support.
+FORMATS = {
+    "avif": {"type": "image/avif", "options": {"quality": 55}},
+    "webp": {"type": "image/webp", "options": {"quality": 80}},
+}
+
+BUILT_FILE_RE = re.compile(
+    rf"/{OUTPUT_DIR}/[\w/-]+-\d+w\.[0-9a-f]{{12}}\.({'|'.join(FORMATS)})$"
+)
+
+
+def get_output_dir():
+    return Path(settings.STATICFILES_DIRS[0]) / OUTPUT_DIR
+
+
+@cache
+def load_manifest():
+    """
+    ``{source path: {"width": px, "height": px, "variants": {format:
+    [[static path, width], ...]}}}`` of the last build, or empty.
+    """
+    path = get_output_dir() / MANIFEST
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def get_formats():
+    """The formats of ``FORMATS`` the installed Pillow can write."""
+    return [name for name in FORMATS if features.check(name)]
+
+
+def get_widths(width):
+    """The ``WIDTHS`` below ``width``, and ``width`` itself up to the largest."""
+    widths = [candidate for candidate in WIDTHS if candidate < width]
+    if width <= WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+
+def open_image(path):
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def encode(image, width, image_format):
+    height = round(image.height * width / image.width)
+    if width != image.width:
+        image = image.resize((width, height), Image.LANCZOS)
+    output = io.BytesIO()
+    image.save(output, image_format.upper(), **FORMATS[image_format]["options"])
+    return output.getvalue()
+
+
+def build_image(source, name, directory, formats):
+    """
+    Write the variants of the ``source`` file, whose static path is
+    ``name``, and return its manifest entry. A variant no smaller than the
+    source file is dropped, and at full width the source takes its place.
+    """
+    source_size = source.stat().st_size
+    image = open_image(source)
+    stem = Path(name).relative_to(SOURCE_DIR).with_suffix("")
+    (directory / stem).parent.mkdir(parents=True, exist_ok=True)
+    variants = {}
+    for image_format in formats:
+        built = []
+        for width in get_widths(image.width):
+            data = encode(image, width, image_format)
+            if len(data) >= source_size:
+                if width == image.width:
+                    built.append([name, width])
+                continue
+            digest = hashlib.md5(data).hexdigest()[:12]
+            path = f"{stem.as_posix()}-{width}w.{digest}.{image_format}"
+            (directory / path).write_bytes(data)
+            built.append([f"{OUTPUT_DIR}/{path}", width])
+        if any(path != name for path, _ in built):
+            variants[image_format] = built
+    return {"width": image.width, "height": image.height, "variants": variants}
+
+
+def build(log=None):
+    """
+    Build the variants of every source image into a fresh output directory
+    and return ``{source path: {"source": bytes, format: bytes of the
+    smallest variant, ...}}``.
+    """
+    log = log or (lambda message: None)
+    directory = get_output_dir()
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+    formats = get_formats()
+    for name in FORMATS.keys() - set(formats):
+        log(f"This Pillow can't write {name.upper()}, so it was skipped.")
+    source_dir = find_source(SOURCE_DIR)
+    manifest = {}
+    report = {}
+    for source in sorted(source_dir.rglob("*")):
+        if source.suffix.lower() not in SOURCE_SUFFIXES:
+            continue
+        name = f"{SOURCE_DIR}/{source.relative_to(source_dir).as_posix()}"
+        entry = build_image(source, name, directory, formats)
+        manifest[name] = entry
+        sizes = {"source": source.stat().st_size}
+        for image_format, variants in entry["variants"].items():
+            sizes[image_format] = find_source(variants[0][0]).stat().st_size
+        report[name] = sizes
+        log(
+            f"{name}: {sizes['source']} bytes, {entry['width']}px wide; "
+            + ", ".join(
+                f"{sizes[image_format]} {image_format} at "
+                f"{entry['variants'][image_format][0][1]}px"
+                for image_format in entry["variants"]
+            )
+        )
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    load_manifest.cache_clear()
+    return report
+
+
+def get_image(path):
+    """The manifest entry of the static image ``path``, or None."""
+    return load_manifest().get(path)
+
+
+def is_built_file(url):
+    """Whether ``url`` names an image variant, whose content never changes."""
+    return BUILT_FILE_RE.search(url) is not None
@@ -0,0 +1,313 @@
+"""
+Bulk CSV import of tasks and workers. The file is parsed as a stream and
+handled in batches: each batch resolves its foreign keys with a few
+``IN`` queries into lookup dicts, validates every row with the rules of
+the matching forms and writes the valid rows with ``bulk_create``. Invalid
+rows are reported with their line number and skipped; they don't stop the
+rest of the batch.
+
+Columns match the ``manager.export`` output, multiple names in one cell are
+separated by ``;``.
+"""
+import csv
+from collections import defaultdict
+from datetime import date
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.utils import timezone
+
+from manager import changelog, counters, search, stats, versions
+from manager.forms import validate_position_name
+from manager.models import Position, Project, Task, TaskType, Team, Worker
+from manager.signals import tasks_bulk_changed
+from manager.utils import chunked
+
+BATCH_SIZE = 1000
+TASK_FIELDS = ["name", "description", "deadline", "priority", "task_type", "project"]
+# Priorities are written by their labels, as in the export.
+PRIORITIES = {label: value for value, label in Task.PRIORITY_CHOICES}
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, line, error):
+        self.errors.append((line, "; ".join(error.messages)))
+
+
+def split_names(value):
+    return [name.strip() for name in (value or "").split(";") if name.strip()]
+
+
+def read_rows(file):
+    """Yield ``(line number, row dict)`` pairs with stripped values."""
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, {
+            key: (value or "").strip() for key, value in row.items() if key
+        }
+
+
+def group_by_name(queryset):
+    grouped = defaultdict(list)
+    for obj in queryset:
+        grouped[obj.name].append(obj)
+    return grouped
+
+
+def lookup_unique(objects_by_name, name, label):
+    objects = objects_by_name.get(name)
+    if not objects:
+        raise ValidationError(f"Unknown {label} {name!r}.")
+    if len(objects) > 1:
+        raise ValidationError(f"Several {label}s are called {name!r}.")
+    return objects[0]
+
+
+def import_tasks(file, batch_size=BATCH_SIZE):
+    """Create a task for every valid row of the CSV ``file``."""
+    result = ImportResult()
+    task_types = dict(TaskType.objects.values_list("name", "pk"))
+    for batch in chunked(read_rows(file), batch_size):
+        import_task_batch(batch, task_types, result)
+    return result
+
+
+def import_task_batch(batch, task_types, result):
+    projects = group_by_name(
+        Project.objects.filter(
+            name__in={row.get("project") for _, row in batch} - {"", None}
+        ).only("name", "deadline")
+    )
+    usernames = {name for _, row in batch for name in split_names(row.get("assignees"))}
+    workers = dict(
+        Worker.objects.filter(username__in=usernames).values_list("username", "pk")
+    )
+    project_members = defaultdict(set)
+    for project_id, worker_id in Project.team.through.objects.filter(
+        project_id__in=[project.pk for group in projects.values() for project in group],
+        team__members__isnull=False,
+    ).values_list("project_id", "team__members"):
+        project_members[project_id].add(worker_id)
+
+    tasks, assignee_ids = [], []
+    for line, row in batch:
+        try:
+            task, worker_ids = build_task(
+                row, task_types, projects, workers, project_members
+            )
+        except ValidationError as error:
+            result.add_error(line, error)
+            continue
+        tasks.append(task)
+        assignee_ids.append(worker_ids)
+    if not tasks:
+        return
+
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        Task.assignees.through.objects.bulk_create(
+            Task.assignees.through(task_id=task.pk, worker_id=worker_id)
+            for task, worker_ids in zip(tasks, assignee_ids)
+            for worker_id in worker_ids
+        )
+        tasks_bulk_changed.send(
+            sender=Task,
+            task_ids=[task.pk for task in tasks],
+            project_ids={task.project_id for task in tasks if task.project_id},
+            fields=TASK_FIELDS,
+        )
+    result.created += len(tasks)
+
+
+def build_task(row, task_types, projects, workers, project_members):
+    """Validate ``row`` like ``TaskForm``/``TaskProjectForm`` do."""
+    errors = []
+    for field in ("name", "description"):
+        if not row.get(field):
+            errors.append(f"{field.capitalize()} is required.")
+
+    deadline = None
+    try:
+        deadline = date.fromisoformat(row.get("deadline", ""))
+    except ValueError:
+        errors.append("Enter a valid deadline (YYYY-MM-DD).")
+    else:
+        if deadline < timezone.localdate():
+            errors.append("Deadline can't be earlier than current date")
+
+    priority = PRIORITIES.get(row.get("priority") or "Medium")
+    if priority is None:
+        errors.append(f"Unknown priority {row['priority']!r}.")
+
+    task_type_id = task_types.get(row.get("task_type"))
+    if not row.get("task_type"):
+        errors.append("Task type is required.")
+    elif task_type_id is None:
+        errors.append(f"Unknown task type {row['task_type']!r}.")
+
+    project = None
+    if row.get("project"):
+        try:
+            project = lookup_unique(projects, row["project"], "project")
+        except ValidationError as error:
+            errors.extend(error.messages)
+        else:
+            if deadline and deadline > project.deadline:
+                errors.append("Deadline can't be after deadline project")
+
+    usernames = split_names(row.get("assignees"))
+    if not usernames:
+        errors.append("At least one assignee is required.")
+    for username in usernames:
+        if username not in workers:
+            errors.append(f"Unknown worker {username!r}.")
+        elif project and workers[username] not in project_members[project.pk]:
+            errors.append(f"{username} needs to be a member of team who is in project.")
+
+    if errors:
+        raise ValidationError(errors)
+    task = Task(
+        name=row["name"],
+        description=row["description"],
+        deadline=deadline,
+        priority=priority,
+        task_type_id=task_type_id,
+        project=project,
+    )
+    return task, {workers[username] for username in usernames}
+
+
+def import_workers(file, batch_size=BATCH_SIZE):
+    """
+    Create a worker for every valid row of the CSV ``file``. Positions and
+    teams that don't exist yet are created. Rows without a password get an
+    unusable one, so the workers set it through password reset; hashing a
+    password per row is by far the slowest part of an import.
+    """
+    result = ImportResult()
+    positions = dict(Position.objects.values_list("name", "pk"))
+    seen_usernames = set()
+    for batch in chunked(read_rows(file), batch_size):
+        import_worker_batch(batch, positions, seen_usernames, result)
+    return result
+
+
+def import_worker_batch(batch, positions, seen_usernames, result):
+    existing = set(
+        Worker.objects.filter(
+            username__in=[row.get("username") for _, row in batch]
+        ).values_list("username", flat=True)
+    )
+    teams = group_by_name(
+        Team.objects.filter(
+            name__in={
+                name for _, row in batch for name in split_names(row.get("teams"))
+            }
+        ).only("name")
+    )
+
+    workers, team_names = [], []
+    for line, row in batch:
+        try:
+            worker = build_worker(row, existing | seen_usernames, teams)
+        except ValidationError as error:
+            result.add_error(line, error)
+            continue
+        seen_usernames.add(worker.username)
+        workers.append(worker)
+        team_names.append(split_names(row.get("teams")))
+    if not workers:
+        return
+
+    with transaction.atomic():
+        new_positions = Position.objects.bulk_create(
+            Position(name=name)
+            for name in {worker.position_name for worker in workers}
+            if name and name not in positions
+        )
+        positions.update((position.name, position.pk) for position in new_positions)
+        for worker in workers:
+            worker.position_id = positions.get(worker.position_name)
+        Worker.objects.bulk_create(workers)
+
+        new_teams = Team.objects.bulk_create(
+            Team(name=name)
+            for name in {name for names in team_names for name in names}
+            if name not in teams
+        )
+        team_ids = {team.name: team.pk for team in new_teams}
+        team_ids.update((name, group[0].pk) for name, group in teams.items())
+        Team.members.through.objects.bulk_create(
+            Team.members.through(team_id=team_ids[name], worker_id=worker.pk)
+            for worker, names in zip(workers, team_names)
+            for name in set(names)
+        )
+
+        counters.recount_teams(team_ids.values())
+        changelog.record(Worker, [worker.pk for worker in workers])
+        versions.touch_pks(Team, team_ids.values())
+        search.index_objects(Worker, [worker.pk for worker in workers])
+        search.index_objects(Team, [team.pk for team in new_teams])
+        search.index_objects(Position, [position.pk for position in new_positions])
+        if new_teams:
+            transaction.on_commit(stats.invalidate_dashboard_stats)
+    result.created += len(workers)
+
+
+def build_worker(row, taken_usernames, teams):
+    """Validate ``row`` like ``SignUpForm``/``PositionForm`` do."""
+    errors = []
+    username = row.get("username", "")
+    try:
+        Worker._meta.get_field("username").clean(username, None)
+    except ValidationError as error:
+        errors.extend(error.messages)
+    if username in taken_usernames:
+        errors.append(f"A worker called {username!r} already exists.")
+
+    if row.get("email"):
+        try:
+            validate_email(row["email"])
+        except ValidationError as error:
+            errors.extend(error.messages)
+
+    if row.get("position"):
+        try:
+            validate_position_name(row["position"])
+        except ValidationError as error:
+            errors.extend(error.messages)
+
+    for name in split_names(row.get("teams")):
+        if len(teams.get(name, ())) > 1:
+            errors.append(f"Several teams are called {name!r}.")
+
+    worker = Worker(
+        username=username,
+        first_name=row.get("first_name", ""),
+        last_name=row.get("last_name", ""),
+        email=row.get("email", ""),
+    )
+    if row.get("password"):
+        try:
+            validate_password(row["password"], worker)
+        except ValidationError as error:
+            errors.extend(error.messages)
+
+    if errors:
+        raise ValidationError(errors)
+    worker.password = make_password(row.get("password") or None)
+    worker.position_name = row.get("position")
+    return worker
+
+
+IMPORTERS = {
+    "tasks": import_tasks,
+    "workers": import_workers,
+}
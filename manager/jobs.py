@@ -0,0 +1,269 @@
+"""
+Background jobs without a broker. Functions registered with ``@job`` are
+queued as rows of the ``Job`` table by ``enqueue`` and run by the
+``run_worker`` command, which claims due rows (``SKIP LOCKED`` on
+PostgreSQL, a compare-and-set on SQLite) and runs them in a thread or
+process pool. Failed jobs are retried with backoff; ``every=`` makes a job
+periodic, with exactly one pending run of it in the queue at any time.
+
+A job is claimed for ``LEASE``; if its worker dies, another worker runs it
+again once the lease has run out, so jobs should be safe to repeat.
+"""
+import time
+import traceback
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import timedelta
+from multiprocessing import get_context
+
+import django
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F, Prefetch
+from django.utils import timezone
+
+from manager import changelog, counters, mail, stats, workload
+from manager.models import Job, JobStats, OutboundEmail, Task, Worker
+from manager.utils import claim
+
+LEASE = timedelta(minutes=10)
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=1)
+RETENTION = timedelta(days=7)
+POOLS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+class JobType:
+    def __init__(self, func, every, max_attempts):
+        self.func = func
+        self.every = every
+        self.max_attempts = max_attempts
+
+
+REGISTRY = {}
+
+
+def job(name=None, every=None, max_attempts=3):
+    """Register a function as a job; ``every`` (a timedelta) makes it periodic."""
+
+    def register(func):
+        REGISTRY[name or func.__name__] = JobType(func, every, max_attempts)
+        return func
+
+    return register
+
+
+def enqueue(name, run_at=None, **kwargs):
+    """
+    Queue a call of the job ``name`` with JSON-serializable ``kwargs``. The
+    row is written in the caller's transaction, so a rolled back request
+    queues nothing.
+    """
+    if name not in REGISTRY:
+        raise KeyError(f"Unknown job {name!r}.")
+    return Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        run_at=run_at or timezone.now(),
+        max_attempts=REGISTRY[name].max_attempts,
+    )
+
+
+def schedule_periodic():
+    """Queue a first run of every periodic job that has none pending."""
+    Job.objects.bulk_create(
+        [
+            Job(name=name, periodic=True, max_attempts=job_type.max_attempts)
+            for name, job_type in REGISTRY.items()
+            if job_type.every
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def backoff(attempts):
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def claim_jobs(limit):
+    now = timezone.now()
+    claimed = claim(
+        Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING], run_at__lte=now),
+        limit,
+        status=Job.RUNNING,
+        run_at=now + LEASE,
+        started_at=now,
+        attempts=F("attempts") + 1,
+    )
+    for claimed_job in claimed:
+        claimed_job.attempts += 1
+    return claimed
+
+
+def finish(claimed_job, duration, error=None):
+    now = timezone.now()
+    updates = {"finished_at": now, "duration": duration}
+    if error is None:
+        updates.update(status=Job.DONE, last_error="")
+    elif claimed_job.attempts < claimed_job.max_attempts:
+        updates.update(
+            status=Job.QUEUED,
+            run_at=now + backoff(claimed_job.attempts),
+            last_error=error,
+        )
+    else:
+        updates.update(status=Job.FAILED, last_error=error)
+
+    job_type = REGISTRY.get(claimed_job.name)
+    with transaction.atomic():
+        # A worker that outlived its lease finds the job taken over (and
+        # its attempts bumped) and leaves the row alone.
+        current = Job.objects.filter(
+            pk=claimed_job.pk, status=Job.RUNNING, attempts=claimed_job.attempts
+        ).update(**updates)
+        if (
+            current
+            and claimed_job.periodic
+            and updates["status"] != Job.QUEUED
+            and job_type
+        ):
+            Job.objects.create(
+                name=claimed_job.name,
+                periodic=True,
+                run_at=now + job_type.every,
+                max_attempts=job_type.max_attempts,
+            )
+        JobStats.objects.bulk_create(
+            [JobStats(name=claimed_job.name)], ignore_conflicts=True
+        )
+        JobStats.objects.filter(name=claimed_job.name).update(
+            runs=F("runs") + 1,
+            failures=F("failures") + int(error is not None),
+            duration=F("duration") + duration,
+        )
+    return updates["status"]
+
+
+def execute(job_pk):
+    """Run one claimed job and record the outcome; returns a log line."""
+    close_old_connections()
+    try:
+        claimed_job = Job.objects.get(pk=job_pk)
+        error = None
+        start = time.perf_counter()
+        try:
+            job_type = REGISTRY[claimed_job.name]
+            job_type.func(**claimed_job.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+        duration = time.perf_counter() - start
+        status = finish(claimed_job, duration, error)
+        return f"{claimed_job.name} #{job_pk}: {status} in {duration:.3f}s"
+    finally:
+        close_old_connections()
+
+
+def run_due_jobs(limit=100):
+    """Run up to ``limit`` due jobs in this thread, one after another."""
+    return [execute(claimed_job.pk) for claimed_job in claim_jobs(limit)]
+
+
+def run_worker(concurrency=1, pool="thread", poll_interval=1.0, once=False, log=None):
+    """
+    Run due jobs until interrupted, ``concurrency`` at a time in a pool of
+    threads or processes. With ``once``, return when no job is due.
+    """
+    log = log or (lambda message: None)
+    schedule_periodic()
+    if concurrency == 1:
+        # No pool needed: run jobs one by one in this thread.
+        while True:
+            lines = run_due_jobs(limit=1)
+            for line in lines:
+                log(line)
+            if not lines:
+                if once:
+                    return
+                time.sleep(poll_interval)
+
+    options = {"max_workers": concurrency}
+    if pool == "process":
+        # Spawned processes don't inherit this process's database sockets.
+        connections.close_all()
+        options.update(mp_context=get_context("spawn"), initializer=django.setup)
+    with POOLS[pool](**options) as executor:
+        running = set()
+        while True:
+            claimed = claim_jobs(concurrency - len(running))
+            running.update(executor.submit(execute, item.pk) for item in claimed)
+            if not running:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            done, running = wait(
+                running, timeout=poll_interval, return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                log(future.result())
+
+
+# Built-in jobs.
+
+
+@job(every=timedelta(seconds=30))
+def send_queued_mail():
+    mail.send_queued_mail()
+
+
+@job(every=timedelta(seconds=settings.DASHBOARD_STATS_TIMEOUT // 2))
+def warm_dashboard_cache():
+    # Only helps the web processes when they share the cache (REDIS_URL).
+    stats.warm_dashboard_stats()
+
+
+@job(every=timedelta(hours=6))
+def recount():
+    # The signal handlers keep the counters right; this repairs drift from
+    # raw SQL writes.
+    counters.recount_projects()
+    counters.recount_teams()
+    workload.rebuild()
+    changelog.backfill()
+
+
+@job(every=timedelta(days=1))
+def send_deadline_reminders():
+    """Email every assignee the open tasks due tomorrow."""
+    tomorrow = timezone.localdate() + timedelta(days=1)
+    due = Task.objects.filter(deadline=tomorrow, is_completed=False)
+    workers = (
+        Worker.objects.filter(tasks__in=due)
+        .exclude(email="")
+        .distinct()
+        .only("email")
+        .prefetch_related(
+            Prefetch("tasks", queryset=due.only("name"), to_attr="due_tasks")
+        )
+    )
+    for worker in workers.iterator(chunk_size=500):
+        mail.enqueue_mail(
+            "Tasks due tomorrow",
+            "\n".join(f"- {task.name}" for task in worker.due_tasks),
+            None,
+            [worker.email],
+        )
+
+
+@job(every=timedelta(days=1))
+def clean_up():
+    """Delete finished jobs and sent email older than ``RETENTION``."""
+    cutoff = timezone.now() - RETENTION
+    Job.objects.filter(
+        status__in=[Job.DONE, Job.FAILED], finished_at__lt=cutoff
+    ).delete()
+    OutboundEmail.objects.filter(status=OutboundEmail.SENT, sent_at__lt=cutoff).delete()
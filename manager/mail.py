@@ -0,0 +1,109 @@
+"""
+Outbound mail queue. ``enqueue_mail`` stores the message in the
+``OutboundEmail`` table and returns, so a view never waits on the mail
+server. ``send_queued_mail`` (run by the ``send_queued_mail`` command)
+claims due messages in batches and sends each batch over one backend
+connection. A failed message is retried with exponential backoff and given
+up on after ``MAX_ATTEMPTS``.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import BadHeaderError, EmailMessage, get_connection
+from django.utils import timezone
+
+from manager.models import OutboundEmail
+from manager.utils import claim
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = timedelta(minutes=1)
+BACKOFF_MAX = timedelta(hours=1)
+# How long a claimed message is hidden from other workers. If the worker
+# dies mid-batch, the message is picked up again once this runs out.
+LEASE = timedelta(minutes=5)
+
+
+class SendResult:
+    def __init__(self):
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+
+
+def enqueue_mail(subject, message, from_email, recipient_list):
+    """Queue a message; takes the arguments of ``django.core.mail.send_mail``."""
+    # Catch header injection here rather than in the worker, where the
+    # caller could no longer be told.
+    if "\n" in subject or "\r" in subject:
+        raise BadHeaderError("Header values can't contain newlines.")
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipient_list),
+    )
+
+
+def backoff(attempts):
+    return min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+
+
+def record_failure(email, error, max_attempts, now):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= max_attempts:
+        email.status = OutboundEmail.FAILED
+    else:
+        email.next_attempt_at = now + backoff(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def send_queued_mail(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """Send one batch of due messages and return a ``SendResult``."""
+    result = SendResult()
+    now = timezone.now()
+    claimed = claim(
+        OutboundEmail.objects.filter(
+            status=OutboundEmail.PENDING, next_attempt_at__lte=now
+        ),
+        batch_size,
+        next_attempt_at=now + LEASE,
+    )
+    if not claimed:
+        return result
+
+    sent, handled = [], set()
+    try:
+        with get_connection() as backend:
+            for email in claimed:
+                message = EmailMessage(
+                    email.subject,
+                    email.body,
+                    email.from_email,
+                    email.to,
+                    connection=backend,
+                )
+                try:
+                    message.send()
+                except Exception as error:
+                    record_failure(email, error, max_attempts, now)
+                else:
+                    sent.append(email.pk)
+                handled.add(email.pk)
+    except Exception as error:
+        # Opening or closing the connection failed: retry whatever is left.
+        for email in claimed:
+            if email.pk not in handled:
+                record_failure(email, error, max_attempts, now)
+
+    OutboundEmail.objects.filter(pk__in=sent).update(
+        status=OutboundEmail.SENT, sent_at=timezone.now(), last_error=""
+    )
+    result.sent = len(sent)
+    for email in claimed:
+        if email.status == OutboundEmail.FAILED:
+            result.failed += 1
+        elif email.pk not in sent:
+            result.retried += 1
+    return result
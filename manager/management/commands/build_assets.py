@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from manager import assets
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the CSS and JS bundles: prune unused CSS, concatenate the "
+        "scripts each page needs, hash the names and write gzip/brotli copies."
+    )
+
+    def handle(self, *args, **options):
+        report = assets.build(log=self.stdout.write)
+        source = sum(sizes["source"] for sizes in report.values())
+        gz = sum(sizes["gz"] for sizes in report.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {len(report)} bundles: {source} source bytes, {gz} gzipped."
+            )
+        )
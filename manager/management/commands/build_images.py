@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from manager import images
+
+
+class Command(BaseCommand):
+    help = (
+        "Resize the JPEG and PNG images in static/assets/img to several "
+        "widths, encode them as AVIF and WebP and hash the names."
+    )
+
+    def handle(self, *args, **options):
+        if images.Image is None:
+            raise CommandError("Building images needs Pillow: pip install Pillow")
+        report = images.build(log=self.stdout.write)
+        source = sum(sizes["source"] for sizes in report.values())
+        smallest = sum(
+            min(size for name, size in sizes.items() if name != "source")
+            for sizes in report.values()
+            if len(sizes) > 1
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built the variants of {len(report)} images: {source} source "
+                f"bytes, {smallest} at their smallest."
+            )
+        )
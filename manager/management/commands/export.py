@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from manager import export
+
+
+class Command(BaseCommand):
+    help = "Stream tasks, projects or workers as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(export.EXPORTS))
+        parser.add_argument("--format", choices=sorted(export.FORMATS), default="csv")
+        parser.add_argument(
+            "--search", default="", help="Same search query as the list page."
+        )
+        parser.add_argument("--output", help="File to write to instead of stdout.")
+        parser.add_argument("--chunk-size", type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        kind = options["kind"]
+        search_field = export.EXPORTS[kind].search_field
+        lines = export.stream(
+            kind,
+            options["format"],
+            {search_field: options["search"]},
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as out:
+                out.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from manager.fake_data import BATCH_SIZE, DEFAULT_COUNTS, PASSWORD, generate_fake_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a large synthetic dataset of workers, teams, projects and "
+        f"tasks for load testing. Every worker's password is {PASSWORD!r}."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_COUNTS.items():
+            parser.add_argument(f"--{name}", type=int, default=default)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--skip-search-index",
+            action="store_true",
+            help="Don't rebuild the search index afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        created = generate_fake_data(
+            counts={name: options[name] for name in DEFAULT_COUNTS},
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            index=not options["skip_search_index"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Created "
+                + ", ".join(f"{count} {name}" for name, count in created.items())
+                + "."
+            )
+        )
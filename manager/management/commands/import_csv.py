@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from manager import importer
+
+
+class Command(BaseCommand):
+    help = "Create tasks or workers from a CSV file, skipping invalid rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(importer.IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=importer.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with open(options["path"], newline="", encoding="utf-8-sig") as file:
+            result = importer.IMPORTERS[options["kind"]](file, options["batch_size"])
+        for line, message in result.errors:
+            self.stderr.write(f"Line {line}: {message}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} {options['kind']}, "
+                f"skipped {len(result.errors)} rows."
+            )
+        )
@@ -0,0 +1,109 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter, so nothing is imported or compiled yet.
+CHILD = """
+import json, sys, time
+
+start = time.perf_counter()
+timings = {}
+import django
+
+django.setup()
+timings["setup"] = time.perf_counter() - start
+
+step = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+
+get_wsgi_application()
+timings["application"] = time.perf_counter() - step
+
+if sys.argv[2] == "warm":
+    from manager.warmup import warm_up
+
+    step = time.perf_counter()
+    warm_up()
+    timings["warm_up"] = time.perf_counter() - step
+
+from django.test import Client
+
+client = Client(HTTP_HOST="127.0.0.1")
+for name in ["first_request", "second_request"]:
+    step = time.perf_counter()
+    status = client.get(sys.argv[1]).status_code
+    timings[name] = time.perf_counter() - step
+    if status >= 400:
+        sys.exit(f"GET {sys.argv[1]} returned {status}.")
+timings["total"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Time a cold start: Django setup, loading the application, the "
+        "warm-up and the first requests, each in a fresh Python process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            default="/accounts/login/",
+            help="Page to request; it must not need a login.",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--output", help="Also write the median timings to this JSON file."
+        )
+        parser.add_argument(
+            "--max-first-request-ms",
+            type=float,
+            help="Fail when the warmed-up first request takes longer.",
+        )
+
+    def run_child(self, url, mode):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD, url, mode],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode in ["cold", "warm"]:
+            runs = [
+                self.run_child(options["url"], mode) for _ in range(options["repeat"])
+            ]
+            results[mode] = {
+                step: statistics.median(run[step] for run in runs) * 1000
+                for step in runs[0]
+            }
+            self.stdout.write(
+                f"{mode}: "
+                + ", ".join(f"{step} {ms:.1f}ms" for step, ms in results[mode].items())
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(results, output, indent=2, sort_keys=True)
+                output.write("\n")
+        limit = options["max_first_request_ms"]
+        first_request = results["warm"]["first_request"]
+        if limit is not None and first_request > limit:
+            raise CommandError(
+                f"The first request took {first_request:.1f}ms "
+                f"after the warm-up, over the {limit:g}ms budget."
+            )
+        self.stdout.write(self.style.SUCCESS("Startup measured."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from manager import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for every searchable model."
+
+    def handle(self, *args, **options):
+        for model in search.SEARCH_FIELDS:
+            search.index_objects(model)
+            self.stdout.write(f"Reindexed {model._meta.verbose_name_plural}.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from manager import changelog, workload
+from manager.counters import recount_projects, recount_teams
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the denormalized counters and the worker workload table, and "
+        "log rows missing from the sync API's change log."
+    )
+
+    def handle(self, *args, **options):
+        projects = recount_projects()
+        teams = recount_teams()
+        workload.rebuild()
+        changelog.backfill()
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted {projects} projects and {teams} teams.")
+        )
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from manager import jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued and periodic background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=1,
+            help="Jobs to run at the same time.",
+        )
+        parser.add_argument(
+            "--pool",
+            choices=sorted(jobs.POOLS),
+            default="thread",
+            help="Run jobs in threads (I/O-bound jobs) or processes (CPU-bound).",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit when no job is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        jobs.run_worker(
+            concurrency=options["concurrency"],
+            pool=options["pool"],
+            poll_interval=options["interval"],
+            once=options["once"],
+            log=self.stdout.write,
+        )
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from manager import mail
+
+
+class Command(BaseCommand):
+    help = "Send the messages waiting in the outbound mail queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=mail.BATCH_SIZE)
+        parser.add_argument("--max-attempts", type=int, default=mail.MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the queue instead of exiting once it is empty.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between polls of an empty queue.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            result = mail.send_queued_mail(
+                options["batch_size"], options["max_attempts"]
+            )
+            if result.sent or result.retried or result.failed:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Sent {result.sent}, will retry {result.retried}, "
+                        f"gave up on {result.failed}."
+                    )
+                )
+            elif not options["loop"]:
+                self.stdout.write("The mail queue is empty.")
+                return
+            else:
+                time.sleep(options["interval"])
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from manager.stats import warm_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Precompute the home page statistics and store them in the cache."
+
+    def handle(self, *args, **options):
+        stats = warm_dashboard_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dashboard cache warmed: {stats['num_projects']} projects, "
+                f"{stats['num_teams']} teams, {stats['num_tasks']} tasks."
+            )
+        )
@@ -0,0 +1,54 @@
+"""
+Membership checks answered with EXISTS queries against the m2m through
+tables, so their cost doesn't depend on how many tasks or teams a worker has.
+"""
+from manager.models import Task, Team, Project
+
+ADDED = "added"
+REMOVED = "removed"
+
+
+def is_task_assignee(worker, task_id):
+    return Task.assignees.through.objects.filter(
+        task_id=task_id, worker_id=worker.pk
+    ).exists()
+
+
+def is_team_member(worker, team_id):
+    return Team.members.through.objects.filter(
+        team_id=team_id, worker_id=worker.pk
+    ).exists()
+
+
+def is_project_member(worker, project_id):
+    """Whether ``worker`` belongs to one of the teams working on the project."""
+    return Project.team.through.objects.filter(
+        project_id=project_id, team__members=worker.pk
+    ).exists()
+
+
+def can_assign(worker, task):
+    return task.project_id is None or is_project_member(worker, task.project_id)
+
+
+def toggle_task_assignment(worker, task):
+    """
+    Add ``worker`` to ``task`` or remove them from it. Returns ``ADDED``,
+    ``REMOVED`` or ``None`` when the worker isn't in a team on the task's
+    project.
+    """
+    if is_task_assignee(worker, task.pk):
+        worker.tasks.remove(task)
+        return REMOVED
+    if not can_assign(worker, task):
+        return None
+    worker.tasks.add(task)
+    return ADDED
+
+
+def toggle_team_membership(worker, team):
+    if is_team_member(worker, team.pk):
+        worker.teams.remove(team)
+        return REMOVED
+    worker.teams.add(team)
+    return ADDED
@@ -0,0 +1,297 @@
+"""
+Per-view request metrics in the Prometheus text format. ``MetricsMiddleware``
+records, for each resolved URL name, the request count, a latency histogram,
+the number and duration of SQL queries and the time spent rendering
+``TemplateResponse`` templates. ``metrics_view`` serves them at /metrics,
+along with the background job totals kept in ``JobStats``.
+
+The numbers live in the memory of each process, so with several gunicorn
+workers every scrape shows the worker that answered it.
+"""
+import bisect
+import hmac
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count
+from django.http import HttpResponse
+
+from manager.models import Job, JobStats
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED = "<unresolved>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)
+        self.duration = 0.0
+        self.requests = defaultdict(int)
+        self.queries = 0
+        self.query_duration = 0.0
+        self.renders = 0
+        self.render_duration = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = defaultdict(ViewMetrics)
+
+    def record(self, view, method, status, duration, queries, query_duration):
+        with self.lock:
+            metrics = self.views[view]
+            metrics.bucket_counts[bisect.bisect_left(BUCKETS, duration)] += 1
+            metrics.duration += duration
+            metrics.requests[(method, status)] += 1
+            metrics.queries += queries
+            metrics.query_duration += query_duration
+
+    def record_render(self, view, duration):
+        with self.lock:
+            metrics = self.views[view]
+            metrics.renders += 1
+            metrics.render_duration += duration
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+    def render(self):
+        with self.lock:
+            views = sorted(self.views.items())
+            lines = [
+                "# HELP django_http_requests_total Requests by view, method "
+                "and status.",
+                "# TYPE django_http_requests_total counter",
+            ]
+            for view, metrics in views:
+                for (method, status), count in sorted(metrics.requests.items()):
+                    lines.append(
+                        "django_http_requests_total"
+                        f'{{view="{view}",method="{method}",status="{status}"}} {count}'
+                    )
+
+            lines += [
+                "# HELP django_http_request_duration_seconds Time spent in the "
+                "view, middleware and template rendering.",
+                "# TYPE django_http_request_duration_seconds histogram",
+            ]
+            for view, metrics in views:
+                cumulative = 0
+                for bound, count in zip(
+                    (*BUCKETS, "+Inf"), metrics.bucket_counts, strict=True
+                ):
+                    cumulative += count
+                    lines.append(
+                        "django_http_request_duration_seconds_bucket"
+                        f'{{view="{view}",le="{bound}"}} {cumulative}'
+                    )
+                lines += [
+                    f'django_http_request_duration_seconds_sum{{view="{view}"}} '
+                    f"{metrics.duration:.6f}",
+                    f'django_http_request_duration_seconds_count{{view="{view}"}} '
+                    f"{cumulative}",
+                ]
+
+            for name, kind, help_text, attr in SIMPLE_METRICS:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for view, metrics in views:
+                    value = getattr(metrics, attr)
+                    if isinstance(value, float):
+                        value = f"{value:.6f}"
+                    lines.append(f'{name}{{view="{view}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+SIMPLE_METRICS = [
+    (
+        "django_db_queries_total",
+        "counter",
+        "SQL queries run while handling requests.",
+        "queries",
+    ),
+    (
+        "django_db_query_duration_seconds_total",
+        "counter",
+        "Time spent waiting for SQL queries.",
+        "query_duration",
+    ),
+    (
+        "django_template_renders_total",
+        "counter",
+        "TemplateResponse renders.",
+        "renders",
+    ),
+    (
+        "django_template_render_duration_seconds_total",
+        "counter",
+        "Time spent rendering TemplateResponse templates, SQL included.",
+        "render_duration",
+    ),
+]
+
+JOB_METRICS = [
+    ("django_job_runs_total", "counter", "Background job runs.", "runs"),
+    (
+        "django_job_failures_total",
+        "counter",
+        "Background job runs that raised.",
+        "failures",
+    ),
+    (
+        "django_job_duration_seconds_total",
+        "counter",
+        "Time spent running background jobs.",
+        "duration",
+    ),
+]
+
+registry = Registry()
+
+
+def get_view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match and match.view_name else UNRESOLVED
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts queries and adds up their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+# The QueryTimer of the request being handled. Async views run their queries
+# in sync_to_async threads, each on its own connection; those threads copy the
+# request's context, so every connection finds the timer here.
+current_timer = ContextVar("current_timer", default=None)
+
+
+def time_query(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``time_query`` to the connection."""
+    if time_query not in connection.execute_wrappers:
+        # First, because connection.execute_wrapper() pops the last one when
+        # it exits, and this connection may have opened inside one.
+        connection.execute_wrappers.insert(0, time_query)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        start = time.perf_counter()
+        token = current_timer.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        token = current_timer.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, start, timer)
+        return response
+
+    def record(self, request, response, start, timer):
+        registry.record(
+            get_view_name(request),
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            timer.count,
+            timer.duration,
+        )
+
+    def process_template_response(self, request, response):
+        # Called right before the response is rendered; the post-render
+        # callback runs right after.
+        start = time.perf_counter()
+
+        def record_render(rendered):
+            registry.record_render(get_view_name(request), time.perf_counter() - start)
+
+        response.add_post_render_callback(record_render)
+        return response
+
+
+def metrics_view(request):
+    """
+    Metrics for Prometheus. Open to ``INTERNAL_IPS`` or, when
+    ``METRICS_TOKEN`` is set, to requests with that bearer token.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        expected = f"Bearer {token}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            raise PermissionDenied
+    elif request.META.get("REMOTE_ADDR") not in settings.INTERNAL_IPS:
+        raise PermissionDenied
+    return HttpResponse(
+        registry.render() + render_job_metrics(), content_type=CONTENT_TYPE
+    )
+
+
+def render_job_metrics():
+    """Job totals from the database, so they cover every worker process."""
+    job_stats = list(JobStats.objects.all())
+    lines = []
+    for name, kind, help_text, attr in JOB_METRICS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for stats in job_stats:
+            value = getattr(stats, attr)
+            if isinstance(value, float):
+                value = f"{value:.6f}"
+            lines.append(f'{name}{{job="{stats.name}"}} {value}')
+
+    lines += [
+        "# HELP django_jobs Jobs in the queue by status.",
+        "# TYPE django_jobs gauge",
+    ]
+    counts = (
+        Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING])
+        .values_list("status")
+        .annotate(count=Count("*"))
+        .order_by("status")
+    )
+    for status, count in counts:
+        lines.append(f'django_jobs{{status="{status}"}} {count}')
+    return "\n".join(lines) + "\n"
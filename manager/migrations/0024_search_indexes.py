@@ -0,0 +1,67 @@
+from django.db import migrations
+
+# Mirrors manager.search.SEARCH_FIELDS at the time of this migration.
+SEARCH_FIELDS = {
+    "task": ("name", "description"),
+    "project": ("name", "description"),
+    "team": ("name",),
+    "worker": ("username",),
+    "position": ("name",),
+    "tasktype": ("name",),
+}
+
+SEARCH_WEIGHTS = ("A", "B")
+
+SEARCH_CONFIG = "simple"
+
+
+def get_search_index(model_name):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field, weight in zip(SEARCH_FIELDS[model_name], SEARCH_WEIGHTS):
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return GinIndex(vector, name=f"{model_name}_search_idx")
+
+
+def create_search_structures(apps, schema_editor):
+    connection = schema_editor.connection
+    quote_name = schema_editor.quote_name
+    for model_name, fields in SEARCH_FIELDS.items():
+        model = apps.get_model("manager", model_name)
+        if connection.vendor == "postgresql":
+            schema_editor.add_index(model, get_search_index(model_name))
+        elif connection.vendor == "sqlite":
+            table = quote_name(f"{model._meta.db_table}_fts")
+            columns = ", ".join(quote_name(field) for field in fields)
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table} USING fts5("
+                f"{columns}, tokenize='unicode61 remove_diacritics 2')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table} (rowid, {columns}) "
+                f"SELECT id, {columns} FROM {quote_name(model._meta.db_table)}"
+            )
+
+
+def drop_search_structures(apps, schema_editor):
+    connection = schema_editor.connection
+    for model_name in SEARCH_FIELDS:
+        model = apps.get_model("manager", model_name)
+        if connection.vendor == "postgresql":
+            schema_editor.remove_index(model, get_search_index(model_name))
+        elif connection.vendor == "sqlite":
+            table = schema_editor.quote_name(f"{model._meta.db_table}_fts")
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0023_task_project_team_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.3 on 2026-10-18 20:22
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, column):
+    counted = (
+        queryset.filter(**{column: OuterRef("pk")})
+        .order_by()
+        .values(column)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counted, output_field=IntegerField()), 0)
+
+
+def populate_counters(apps, schema_editor):
+    Project = apps.get_model("manager", "Project")
+    Task = apps.get_model("manager", "Task")
+    Team = apps.get_model("manager", "Team")
+    Project.objects.update(
+        total_task_count=count_subquery(Task.objects.all(), "project_id"),
+        open_task_count=count_subquery(
+            Task.objects.filter(is_completed=False), "project_id"
+        ),
+    )
+    Team.objects.update(
+        member_count=count_subquery(Team.members.through.objects.all(), "team_id"),
+        project_count=count_subquery(Project.team.through.objects.all(), "team_id"),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0024_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="open_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="total_task_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="team",
+            name="member_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="team",
+            name="project_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.3 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+PRIORITY_CODES = {"Urgent": 1, "High": 2, "Medium": 3, "Low": 4}
+
+
+def names_to_codes(apps, schema_editor):
+    # Still a CharField here; AlterField then casts the digits to integers.
+    Task = apps.get_model("manager", "Task")
+    for name, code in PRIORITY_CODES.items():
+        Task.objects.filter(priority=name).update(priority=str(code))
+    Task.objects.exclude(
+        priority__in=[str(code) for code in PRIORITY_CODES.values()]
+    ).update(priority=str(PRIORITY_CODES["Medium"]))
+
+
+def codes_to_names(apps, schema_editor):
+    Task = apps.get_model("manager", "Task")
+    for name, code in PRIORITY_CODES.items():
+        Task.objects.filter(priority=str(code)).update(priority=name)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0027_jobs"),
+    ]
+
+    operations = [
+        migrations.RunPython(names_to_codes, codes_to_names),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=models.PositiveSmallIntegerField(
+                choices=[(1, "Urgent"), (2, "High"), (3, "Medium"), (4, "Low")],
+                default=3,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "priority", "deadline", "name"],
+                name="task_status_priority_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.3 on 2026-10-18 21:09
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_workload(apps, schema_editor):
+    Task = apps.get_model("manager", "Task")
+    WorkerWorkload = apps.get_model("manager", "WorkerWorkload")
+    rows = (
+        Task.assignees.through.objects.filter(task__is_completed=False)
+        .values("worker_id", "task__project_id", "task__priority", "task__deadline")
+        .annotate(open_count=models.Count("*"))
+        .order_by()
+    )
+    WorkerWorkload.objects.bulk_create(
+        (
+            WorkerWorkload(
+                worker_id=row["worker_id"],
+                project_id=row["task__project_id"],
+                priority=row["task__priority"],
+                deadline=row["task__deadline"],
+                open_count=row["open_count"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0028_integer_priority"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkerWorkload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "priority",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "Urgent"), (2, "High"), (3, "Medium"), (4, "Low")]
+                    ),
+                ),
+                ("deadline", models.DateField()),
+                ("open_count", models.PositiveIntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="manager.project",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workload",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["worker", "deadline", "priority"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="workerworkload",
+            constraint=models.UniqueConstraint(
+                fields=("worker", "project", "priority", "deadline"),
+                name="workload_unique_key",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="workerworkload",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("project", None)),
+                fields=("worker", "priority", "deadline"),
+                name="workload_unique_key_no_project",
+            ),
+        ),
+        migrations.RunPython(populate_workload, migrations.RunPython.noop),
+    ]
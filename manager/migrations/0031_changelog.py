@@ -0,0 +1,81 @@
+# Generated by Django 4.2.3 on 2026-10-18 23:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+KINDS = {"Task": "tasks", "Project": "projects", "Team": "teams", "Worker": "workers"}
+
+
+def number_existing_rows(apps, schema_editor):
+    # Every existing row is a change a client that never synced hasn't seen.
+    ChangeLog = apps.get_model("manager", "ChangeLog")
+    ChangeSequence = apps.get_model("manager", "ChangeSequence")
+    seq = 0
+    for model_name, kind in KINDS.items():
+        model = apps.get_model("manager", model_name)
+        entries = []
+        for pk in model.objects.order_by("pk").values_list("pk", flat=True).iterator():
+            seq += 1
+            entries.append(ChangeLog(kind=kind, object_id=pk, seq=seq))
+        ChangeLog.objects.bulk_create(entries, batch_size=1000)
+    ChangeSequence.objects.create(pk=1, last=seq)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0030_timestamps"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=10)),
+                ("object_id", models.BigIntegerField()),
+                ("seq", models.BigIntegerField()),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "changed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "ordering": ["seq"],
+                "indexes": [
+                    models.Index(fields=["kind", "seq"], name="changelog_kind_seq_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ChangeSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="changelog",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="changelog_unique_object"
+            ),
+        ),
+        migrations.RunPython(number_existing_rows, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Position(models.Model):
@@ -17,6 +18,8 @@ class Worker(AbstractUser):
     position = models.ForeignKey(
         Position, on_delete=models.SET_NULL, related_name="workers", null=True
     )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name = "worker"
@@ -30,33 +33,77 @@ class Worker(AbstractUser):
         return f"{self.username} ({self.first_name} {self.last_name})"
 
 
-class Team(models.Model):
+class CounterFieldsMixin:
+    """
+    Leaves ``COUNTER_FIELDS`` out of ``save()`` unless ``update_fields`` names
+    them. ``manager.counters`` keeps them with ``F()`` updates, and writing
+    back the value loaded with the instance would undo those made since.
+    """
+
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class Team(CounterFieldsMixin, models.Model):
+    COUNTER_FIELDS = ("member_count", "project_count")
+
     name = models.CharField(max_length=255)
     members = models.ManyToManyField(Worker, related_name="teams")
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    project_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["name"], name="team_name_idx")]
 
     def __str__(self):
         return self.name
 
 
-class Project(models.Model):
+class Project(CounterFieldsMixin, models.Model):
+    COUNTER_FIELDS = ("open_task_count", "total_task_count")
+
     name = models.CharField(max_length=255)
     description = models.TextField(max_length=600)
     is_completed = models.BooleanField(default=False)
     deadline = models.DateField()
     team = models.ManyToManyField(Team, related_name="projects", blank=True)
+    open_task_count = models.PositiveIntegerField(default=0, editable=False)
+    total_task_count = models.PositiveIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["is_completed", "deadline", "name"]
+        indexes = [
+            models.Index(
+                fields=["is_completed", "deadline", "name"],
+                name="project_status_deadline_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @property
+    def completed_task_count(self):
+        return self.total_task_count - self.open_task_count
+
 
 class TaskType(models.Model):
     name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["name"]
@@ -66,19 +113,24 @@ class TaskType(models.Model):
 
 
 class Task(models.Model):
+    # Lower is more urgent, so "most urgent first" is an ascending sort.
+    URGENT = 1
+    HIGH = 2
+    MEDIUM = 3
+    LOW = 4
     PRIORITY_CHOICES = [
-        ("Urgent", "Urgent"),
-        ("High", "High"),
-        ("Medium", "Medium"),
-        ("Low", "Low"),
+        (URGENT, "Urgent"),
+        (HIGH, "High"),
+        (MEDIUM, "Medium"),
+        (LOW, "Low"),
     ]
 
     name = models.CharField(max_length=255)
     description = models.TextField()
     deadline = models.DateField()
     is_completed = models.BooleanField(default=False)
-    priority = models.CharField(
-        max_length=6, choices=PRIORITY_CHOICES, default="Medium"
+    priority = models.PositiveSmallIntegerField(
+        choices=PRIORITY_CHOICES, default=MEDIUM
     )
     task_type = models.ForeignKey(
         TaskType, on_delete=models.SET_NULL, null=True, related_name="tasks"
@@ -87,12 +139,236 @@ class Task(models.Model):
         Project, on_delete=models.SET_NULL, null=True, blank=True, related_name="tasks"
     )
     assignees = models.ManyToManyField(Worker, related_name="tasks")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["deadline", "name", "is_completed"]
+        indexes = [
+            models.Index(
+                fields=["is_completed", "deadline", "name"],
+                name="task_status_deadline_idx",
+            ),
+            models.Index(
+                fields=["deadline", "name"],
+                condition=models.Q(is_completed=False),
+                name="task_open_deadline_idx",
+            ),
+            models.Index(
+                fields=["is_completed", "priority", "deadline", "name"],
+                name="task_status_priority_idx",
+            ),
+            models.Index(
+                fields=["deadline", "name"],
+                condition=models.Q(is_completed=True),
+                name="task_completed_deadline_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what was loaded so signal handlers can tell what changed.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Keep the row and the counters updated by post_save in one transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+        }
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
 
     def get_absolute_url(self):
         return reverse("manager:task-detail", kwargs={"pk": self.pk})
 
     def __str__(self) -> str:
-        return f"Task: {self.name}, priority of task : {self.priority}"
+        return f"Task: {self.name}, priority of task : {self.get_priority_display()}"
+
+
+class OutboundEmail(models.Model):
+    """A message waiting for ``send_queued_mail`` to hand it to the backend."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # When the next attempt is due; a claimed message is pushed forward so
+    # other workers leave it alone while it is being sent.
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["next_attempt_at", "pk"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="outbound_email_due_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
+
+
+class Job(models.Model):
+    """A call of a function registered in ``manager.jobs``, run by ``run_worker``."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    # Periodic jobs put their next run in the queue when they finish.
+    periodic = models.BooleanField(default=False)
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default=QUEUED)
+    # When a queued job is due; for a running job, when its lease runs out
+    # and another worker may take it over.
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["run_at", "pk"]
+        indexes = [
+            models.Index(
+                fields=["run_at"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="job_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=models.Q(periodic=True, status__in=["queued", "running"]),
+                name="job_one_pending_periodic",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.status})"
+
+
+class JobStats(models.Model):
+    """Totals per job name, kept across workers for the /metrics endpoint."""
+
+    name = models.CharField(max_length=100, unique=True)
+    runs = models.PositiveIntegerField(default=0)
+    failures = models.PositiveIntegerField(default=0)
+    duration = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ["name"]
+        verbose_name_plural = "job stats"
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class WorkerWorkload(models.Model):
+    """
+    Open tasks of a worker, counted per project, priority and deadline. Kept
+    up to date by ``manager.workload`` from the task signals, so the worker
+    page reads a handful of rows instead of every task.
+    """
+
+    worker = models.ForeignKey(
+        Worker, on_delete=models.CASCADE, related_name="workload"
+    )
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    priority = models.PositiveSmallIntegerField(choices=Task.PRIORITY_CHOICES)
+    deadline = models.DateField()
+    open_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["worker", "deadline", "priority"]
+        constraints = [
+            # NULLs are distinct in unique constraints, so rows without a
+            # project get a constraint of their own.
+            models.UniqueConstraint(
+                fields=["worker", "project", "priority", "deadline"],
+                name="workload_unique_key",
+            ),
+            models.UniqueConstraint(
+                fields=["worker", "priority", "deadline"],
+                condition=models.Q(project=None),
+                name="workload_unique_key_no_project",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.worker_id}: {self.open_count} {self.get_priority_display()} "
+            f"due {self.deadline}"
+        )
+
+
+class ChangeLog(models.Model):
+    """
+    The latest change to each task, project, team and worker, numbered by
+    ``seq`` from ``ChangeSequence``; deleted rows keep theirs as a tombstone.
+    Written by ``manager.changelog`` and read by the sync API.
+    """
+
+    kind = models.CharField(max_length=10)
+    object_id = models.BigIntegerField()
+    seq = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["seq"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="changelog_unique_object"
+            ),
+        ]
+        indexes = [models.Index(fields=["kind", "seq"], name="changelog_kind_seq_idx")]
+
+    def __str__(self) -> str:
+        action = "deleted" if self.deleted else "changed"
+        return f"{self.seq}: {self.kind} {self.object_id} {action}"
+
+
+class ChangeSequence(models.Model):
+    """The last ``ChangeLog.seq`` handed out, in a single row."""
+
+    last = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return str(self.last)
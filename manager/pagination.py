@@ -0,0 +1,250 @@
+from django.conf import settings
+from django.core import signing
+from django.core.paginator import InvalidPage
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.http import Http404
+
+CURSOR_SALT = "manager.pagination.cursor"
+
+
+def get_ordering_keys(queryset):
+    """
+    Return ``(name, descending)`` pairs describing the effective ordering of
+    ``queryset``, with the primary key appended as the final tie-breaker
+    unless a unique column already makes the ordering total.
+    """
+    model = queryset.model
+    query = queryset.query
+    if query.order_by:
+        ordering = query.order_by
+    elif query.default_ordering:
+        ordering = model._meta.ordering
+    else:
+        ordering = ()
+
+    keys = []
+    seen = set()
+    for item in ordering:
+        if not isinstance(item, str) or item == "?" or LOOKUP_SEP in item:
+            raise ImproperlyConfigured(
+                f"Keyset pagination can't order {model.__name__} by {item!r}."
+            )
+        descending = item.startswith("-")
+        name = item.lstrip("-")
+        if name == "pk":
+            name = model._meta.pk.name
+        if name in seen:
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            if name not in query.annotations:
+                raise
+            field = None
+        else:
+            if field.is_relation or field.null:
+                raise ImproperlyConfigured(
+                    f"Keyset pagination needs a non-null, non-relational "
+                    f"ordering column, got {model.__name__}.{name}."
+                )
+        seen.add(name)
+        keys.append((name, descending))
+        if field is not None and field.unique:
+            return keys
+
+    keys.append((model._meta.pk.name, False))
+    return keys
+
+
+class KeysetPage:
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate by seeking past the last row seen instead of using OFFSET, so
+    every page costs the same and no COUNT(*) is needed.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = get_ordering_keys(queryset)
+
+    def _get_value(self, obj, name):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return getattr(obj, name)
+        return field.value_to_string(obj)
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+    def encode_cursor(self, obj, direction):
+        values = [self._get_value(obj, name) for name, _ in self.keys]
+        return signing.dumps(
+            {"d": direction, "v": values}, salt=CURSOR_SALT, compress=True
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            direction = payload["d"]
+            values = payload["v"]
+            if direction not in ("next", "prev") or len(values) != len(self.keys):
+                raise ValueError
+            values = [
+                self._to_python(name, value)
+                for (name, _), value in zip(self.keys, values)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError, ValidationError):
+            raise Http404("Invalid cursor.")
+        return direction, values
+
+    def _seek_filter(self, values, backwards):
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self.keys, values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        # The redundant bound on the leading column lets the planner walk a
+        # single index range in order instead of merging the OR branches.
+        (name, descending), value = self.keys[0], values[0]
+        lookup = "lte" if descending != backwards else "gte"
+        return Q(**{f"{name}__{lookup}": value}) & condition
+
+    def _ordering(self, backwards):
+        return [
+            f"-{name}" if descending != backwards else name
+            for name, descending in self.keys
+        ]
+
+    def get_page_queryset(self, values=None, backwards=False):
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backwards))
+        return queryset.order_by(*self._ordering(backwards))[: self.per_page + 1]
+
+    def page(self, cursor=None):
+        values, backwards = self.parse_cursor(cursor)
+        object_list = list(self.get_page_queryset(values, backwards))
+        return self.make_page(object_list, values, backwards)
+
+    async def apage(self, cursor=None):
+        values, backwards = self.parse_cursor(cursor)
+        object_list = [obj async for obj in self.get_page_queryset(values, backwards)]
+        return self.make_page(object_list, values, backwards)
+
+    def parse_cursor(self, cursor):
+        if not cursor:
+            return None, False
+        direction, values = self.decode_cursor(cursor)
+        return values, direction == "prev"
+
+    def make_page(self, object_list, values, backwards):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[: self.per_page]
+        if backwards:
+            object_list.reverse()
+        if not object_list:
+            return KeysetPage(object_list)
+
+        has_next = has_more if not backwards else True
+        has_previous = has_more if backwards else values is not None
+        return KeysetPage(
+            object_list,
+            next_cursor=self.encode_cursor(object_list[-1], "next")
+            if has_next
+            else None,
+            previous_cursor=self.encode_cursor(object_list[0], "prev")
+            if has_previous
+            else None,
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that switches to keyset pagination when the view's
+    ``pagination_mode`` (or ``settings.PAGINATION_MODE``) is ``"keyset"``.
+    """
+
+    pagination_mode = None
+    cursor_kwarg = "cursor"
+
+    def get_pagination_mode(self):
+        return self.pagination_mode or settings.PAGINATION_MODE
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.get_pagination_mode() != "keyset":
+            return super().paginate_queryset(queryset, page_size)
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        ``paginate_queryset`` for async views: the COUNT and the page rows
+        are fetched through the async ORM and the page holds a list.
+        """
+        if self.get_pagination_mode() == "keyset":
+            paginator = KeysetPaginator(queryset, page_size)
+            page = await paginator.apage(self.request.GET.get(self.cursor_kwarg))
+            return paginator, page, page.object_list, page.has_other_pages()
+
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # Paginator.count is a cached_property, so this saves it a sync query.
+        paginator.count = await queryset.acount()
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(
+            self.page_kwarg, 1
+        )
+        try:
+            page = paginator.page(
+                paginator.num_pages if page_number == "last" else page_number
+            )
+        except InvalidPage as error:
+            raise Http404(f"Invalid page ({page_number}): {error}")
+        page.object_list = [obj async for obj in page.object_list]
+        return paginator, page, page.object_list, page.has_other_pages()
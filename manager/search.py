@@ -0,0 +1,219 @@
+"""
+Full-text search for the list views.
+
+PostgreSQL searches a ``tsvector`` expression served by a GIN index, SQLite
+searches FTS5 shadow tables kept in sync by ``manager.signals``, and any
+other database falls back to ``icontains``. Every backend orders matches by
+relevance, then by the queryset's own ordering.
+"""
+import re
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import IntegerField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+
+from manager.models import Worker, Task, Position, TaskType, Team, Project
+from manager.utils import chunked
+
+# Searched fields per model, most relevant first. The PostgreSQL GIN
+# indexes and the SQLite FTS5 tables (migration 0024) mirror this mapping.
+SEARCH_FIELDS = {
+    Task: ("name", "description"),
+    Project: ("name", "description"),
+    Team: ("name",),
+    Worker: ("username",),
+    Position: ("name",),
+    TaskType: ("name",),
+}
+
+SEARCH_WEIGHTS = ("A", "B")
+
+FTS5_WEIGHTS = (10.0, 1.0)
+
+SEARCH_CONFIG = "simple"
+
+TERM_RE = re.compile(r"\w+")
+
+# ts_rank() returns a real. Keyset cursors store the rank and seek past it,
+# so it's scaled to an integer, which round-trips exactly and makes equal
+# ranks compare equal, leaving ties to the primary key.
+RANK_SCALE = 1_000_000
+
+
+def get_search_fields(model):
+    return SEARCH_FIELDS[model._meta.concrete_model]
+
+
+def get_terms(query):
+    return TERM_RE.findall(query or "")
+
+
+def get_ordering(queryset):
+    if queryset.query.order_by:
+        return list(queryset.query.order_by)
+    return list(queryset.model._meta.ordering)
+
+
+class SearchBackend(ABC):
+    rank_ordering = "-search_rank"
+
+    def search(self, queryset, query):
+        if not (query or "").strip():
+            return queryset
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        ordering = get_ordering(queryset)
+        queryset = self.filter(queryset, terms)
+        return queryset.order_by(self.rank_ordering, *ordering)
+
+    @abstractmethod
+    def filter(self, queryset, terms):
+        """Keep the rows matching every term, annotated with ``search_rank``."""
+
+    def index_objects(self, model, pks=None):
+        """Bring the index up to date for ``pks`` (or every row)."""
+
+    def remove_objects(self, model, pks):
+        """Drop ``pks`` from the index."""
+
+
+class ContainsSearchBackend(SearchBackend):
+    rank_ordering = "search_rank"
+
+    def filter(self, queryset, terms):
+        fields = get_search_fields(queryset.model)
+        condition = Q()
+        for term in terms:
+            condition &= Q(
+                *(Q(**{f"{field}__icontains": term}) for field in fields),
+                _connector=Q.OR,
+            )
+        # No relevance signal here, so every match ranks the same.
+        return queryset.filter(condition).annotate(search_rank=Value(0))
+
+
+class PostgresSearchBackend(SearchBackend):
+    def get_vector(self, model):
+        from django.contrib.postgres.search import SearchVector
+
+        vector = None
+        for field, weight in zip(get_search_fields(model), SEARCH_WEIGHTS):
+            part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+            vector = part if vector is None else vector + part
+        return vector
+
+    def filter(self, queryset, terms):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        search_query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            search_type="raw",
+            config=SEARCH_CONFIG,
+        )
+        vector = self.get_vector(queryset.model)
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=search_query)
+            .annotate(
+                search_rank=Cast(
+                    SearchRank(vector, search_query) * RANK_SCALE, IntegerField()
+                )
+            )
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    # bm25() returns more negative scores for better matches.
+    rank_ordering = "search_rank"
+
+    @staticmethod
+    def get_table(model):
+        return f"{model._meta.db_table}_fts"
+
+    def filter(self, queryset, terms):
+        model = queryset.model
+        table = connection.ops.quote_name(self.get_table(model))
+        pk_column = "{}.{}".format(
+            connection.ops.quote_name(model._meta.db_table),
+            connection.ops.quote_name(model._meta.pk.column),
+        )
+        weights = ", ".join(
+            str(weight) for weight in FTS5_WEIGHTS[: len(get_search_fields(model))]
+        )
+        match = " ".join('"{}"*'.format(term.replace('"', "")) for term in terms)
+        matching = RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,))
+        return queryset.filter(pk__in=matching).annotate(
+            search_rank=RawSQL(
+                f"SELECT bm25({table}, {weights}) FROM {table} "
+                f"WHERE {table} MATCH %s AND rowid = {pk_column}",
+                (match,),
+            )
+        )
+
+    def index_objects(self, model, pks=None):
+        model = model._meta.concrete_model
+        table = connection.ops.quote_name(self.get_table(model))
+        source = connection.ops.quote_name(model._meta.db_table)
+        pk_column = connection.ops.quote_name(model._meta.pk.column)
+        columns = ", ".join(
+            connection.ops.quote_name(model._meta.get_field(field).column)
+            for field in get_search_fields(model)
+        )
+        with connection.cursor() as cursor:
+            if pks is None:
+                cursor.execute(f"DELETE FROM {table}")
+                cursor.execute(
+                    f"INSERT INTO {table} (rowid, {columns}) "
+                    f"SELECT {pk_column}, {columns} FROM {source}"
+                )
+                return
+            for chunk in chunked(pks):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ({placeholders})", chunk
+                )
+                cursor.execute(
+                    f"INSERT INTO {table} (rowid, {columns}) "
+                    f"SELECT {pk_column}, {columns} FROM {source} "
+                    f"WHERE {pk_column} IN ({placeholders})",
+                    chunk,
+                )
+
+    def remove_objects(self, model, pks):
+        table = connection.ops.quote_name(self.get_table(model._meta.concrete_model))
+        with connection.cursor() as cursor:
+            for chunk in chunked(pks):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ({placeholders})", chunk
+                )
+
+
+VENDOR_BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_backend():
+    backend_path = getattr(settings, "SEARCH_BACKEND", None)
+    if backend_path:
+        return import_string(backend_path)()
+    return VENDOR_BACKENDS.get(connection.vendor, ContainsSearchBackend)()
+
+
+def search(queryset, query):
+    return get_backend().search(queryset, query)
+
+
+def index_objects(model, pks=None):
+    get_backend().index_objects(model, pks)
+
+
+def remove_objects(model, pks):
+    get_backend().remove_objects(model, pks)
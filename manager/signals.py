@@ -0,0 +1,256 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    post_save,
+    post_delete,
+    pre_delete,
+    m2m_changed,
+)
+from django.dispatch import receiver, Signal
+
+from manager import (
+    auth,
+    buckets,
+    changelog,
+    counters,
+    events,
+    metrics,
+    search,
+    stats,
+    versions,
+    workload,
+)
+from manager.models import Worker, Task, Team, Project, Position, TaskType
+
+# Sent after tasks are changed with QuerySet.update()/bulk_create(), which
+# skip post_save. Provides task_ids, project_ids (every project whose tasks
+# were affected, before and after the change) and the changed fields.
+tasks_bulk_changed = Signal()
+
+
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(
+        search.get_search_fields(sender)
+    ):
+        return
+    search.index_objects(sender, [instance.pk])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_objects(sender, [instance.pk])
+
+
+for model in search.SEARCH_FIELDS:
+    post_save.connect(
+        update_search_index,
+        sender=model,
+        dispatch_uid=f"search-index-{model._meta.label_lower}",
+    )
+    post_delete.connect(
+        remove_from_search_index,
+        sender=model,
+        dispatch_uid=f"search-remove-{model._meta.label_lower}",
+    )
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def update_bulk_search_index(sender, task_ids, fields, **kwargs):
+    if set(fields) & set(search.get_search_fields(sender)):
+        search.index_objects(sender, task_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+@receiver(m2m_changed, sender=Task.assignees.through)
+@receiver(m2m_changed, sender=Project.team.through)
+@receiver(m2m_changed, sender=Team.members.through)
+@receiver(tasks_bulk_changed, sender=Task)
+def invalidate_dashboard_stats(**kwargs):
+    transaction.on_commit(stats.invalidate_dashboard_stats)
+
+
+@receiver(post_save, sender=Task)
+def update_project_task_counters(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        counters.task_saved(instance, created)
+
+
+@receiver(post_delete, sender=Task)
+def decrement_project_task_counters(sender, instance, **kwargs):
+    counters.task_deleted(instance)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def recount_bulk_changed_projects(sender, project_ids, **kwargs):
+    counters.recount_projects(project_ids)
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def update_team_member_count(sender, instance, action, pk_set, **kwargs):
+    counters.relation_changed("member_count", instance, action, pk_set)
+
+
+@receiver(m2m_changed, sender=Project.team.through)
+def update_team_project_count(sender, instance, action, pk_set, **kwargs):
+    counters.relation_changed("project_count", instance, action, pk_set)
+
+
+@receiver(pre_delete, sender=Worker)
+@receiver(pre_delete, sender=Project)
+def remember_teams_before_delete(sender, instance, **kwargs):
+    # Deleting a worker or project cascades through the m2m tables without
+    # sending m2m_changed, so the affected teams are recounted afterwards.
+    counters.remember_teams(instance)
+
+
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=Project)
+def recount_teams_after_delete(sender, instance, **kwargs):
+    counters.recount_remembered_teams(instance)
+
+
+@receiver(post_save, sender=Task)
+def move_task_between_buckets(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        buckets.task_saved(instance, created)
+
+
+@receiver(pre_delete, sender=Task)
+def remember_task_assignees(sender, instance, **kwargs):
+    # The assignee rows are gone by post_delete; the bucket and workload
+    # handlers below both read them from the instance.
+    buckets.remember_assignees(instance)
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_buckets(sender, instance, **kwargs):
+    buckets.task_deleted(instance)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def update_worker_buckets(sender, instance, action, reverse, pk_set, **kwargs):
+    buckets.assignees_changed(instance, action, reverse, pk_set)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def invalidate_buckets(sender, **kwargs):
+    transaction.on_commit(buckets.invalidate)
+
+
+@receiver(post_save, sender=Task)
+def update_task_workload(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        workload.task_saved(instance, created)
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_from_workload(sender, instance, **kwargs):
+    workload.task_deleted(instance)
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def update_assignee_workload(sender, instance, action, reverse, pk_set, **kwargs):
+    workload.assignees_changed(instance, action, reverse, pk_set)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def rebuild_bulk_changed_workload(sender, task_ids, fields, **kwargs):
+    workload.tasks_bulk_changed(task_ids, fields)
+
+
+@receiver(pre_delete, sender=Project)
+def remember_project_workers(sender, instance, **kwargs):
+    workload.remember_project_workers(instance)
+
+
+@receiver(post_delete, sender=Project)
+def rebuild_project_workload(sender, instance, **kwargs):
+    workload.project_deleted(instance)
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def forget_cached_user(sender, instance, **kwargs):
+    # After commit, so a request in between can't cache the old row again.
+    transaction.on_commit(partial(auth.forget_user, instance.pk))
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+@receiver(m2m_changed, sender=Project.team.through)
+@receiver(m2m_changed, sender=Team.members.through)
+def touch_relation_sides(sender, instance, action, model, pk_set, **kwargs):
+    versions.relation_changed(instance, action, model, pk_set)
+
+
+@receiver(pre_delete, sender=Task)
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=Team)
+@receiver(pre_delete, sender=Worker)
+@receiver(pre_delete, sender=TaskType)
+@receiver(pre_delete, sender=Position)
+def touch_rows_related_to_deleted(sender, instance, **kwargs):
+    # Before the cascade, while the relations can still be followed.
+    versions.touch_related(instance)
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=TaskType)
+def touch_rows_showing_name(sender, instance, created, raw=False, **kwargs):
+    # Workers show their position's name and tasks their type's, in the
+    # sync API as well as on the pages.
+    if not created and not raw:
+        versions.touch_related(instance)
+
+
+@receiver(post_save, sender=Task)
+def touch_rows_task_moved_from(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        versions.task_saved(instance, created)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def touch_bulk_changed_projects(sender, project_ids, **kwargs):
+    versions.tasks_bulk_changed(project_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Worker)
+def record_change(sender, instance, update_fields=None, **kwargs):
+    # Logging in saves last_login alone, which the sync API doesn't show.
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    changelog.record(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Worker)
+def record_deletion(sender, instance, **kwargs):
+    changelog.record(sender, [instance.pk], deleted=True)
+
+
+@receiver(tasks_bulk_changed, sender=Task)
+def record_bulk_changed_tasks(sender, task_ids, **kwargs):
+    changelog.record(sender, task_ids)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(m2m_changed, sender=Task.assignees.through)
+@receiver(post_save, sender=TaskType)
+@receiver(tasks_bulk_changed, sender=Task)
+def wake_event_poller(**kwargs):
+    # The change log rows are visible to the poller once committed.
+    transaction.on_commit(events.broadcaster.notify)
+
+
+connection_created.connect(metrics.install_query_timer)
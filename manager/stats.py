@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from manager.models import Task, Team, Project
+
+DASHBOARD_CACHE_KEY = "manager:dashboard-stats"
+
+
+def get_cache_key(day=None):
+    # Overdue counts change at midnight without any write, so each day gets
+    # its own entry.
+    day = day or timezone.localdate()
+    return f"{DASHBOARD_CACHE_KEY}:{day.isoformat()}"
+
+
+def get_aggregates():
+    """The ``(queryset, aggregate kwargs)`` pairs, one query per model."""
+    today = timezone.localdate()
+    is_open = Q(is_completed=False)
+    has_assignees = Exists(
+        Task.assignees.through.objects.filter(task_id=OuterRef("pk"))
+    )
+    priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+
+    return [
+        (
+            Project.objects.all(),
+            {
+                "num_projects": Count("pk"),
+                "active_projects": Count("pk", filter=is_open),
+            },
+        ),
+        (Team.objects.all(), {"num_teams": Count("pk")}),
+        (
+            Task.objects.all(),
+            {
+                "num_tasks": Count("pk"),
+                "task_is_done_true": Count("pk", filter=Q(is_completed=True)),
+                "open_tasks": Count("pk", filter=is_open),
+                "overdue_tasks": Count("pk", filter=is_open & Q(deadline__lt=today)),
+                "unassigned_tasks": Count("pk", filter=is_open & ~has_assignees),
+                **{
+                    f"priority_{index}": Count("pk", filter=is_open & Q(priority=value))
+                    for index, value in enumerate(priorities)
+                },
+            },
+        ),
+    ]
+
+
+def merge_aggregates(results):
+    stats = {}
+    for result in results:
+        stats.update(result)
+    stats["open_by_priority"] = [
+        (label, stats.pop(f"priority_{index}"))
+        for index, (_, label) in enumerate(Task.PRIORITY_CHOICES)
+    ]
+    return stats
+
+
+def compute_dashboard_stats():
+    """Compute the home page counters with one aggregate query per model."""
+    return merge_aggregates(
+        queryset.aggregate(**aggregates) for queryset, aggregates in get_aggregates()
+    )
+
+
+async def acompute_dashboard_stats():
+    return merge_aggregates(
+        [
+            await queryset.aaggregate(**aggregates)
+            for queryset, aggregates in get_aggregates()
+        ]
+    )
+
+
+def get_dashboard_stats():
+    key = get_cache_key()
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(key, stats, settings.DASHBOARD_STATS_TIMEOUT)
+    return stats
+
+
+async def aget_dashboard_stats():
+    key = get_cache_key()
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = await acompute_dashboard_stats()
+        await cache.aset(key, stats, settings.DASHBOARD_STATS_TIMEOUT)
+    return stats
+
+
+def warm_dashboard_stats():
+    stats = compute_dashboard_stats()
+    cache.set(get_cache_key(), stats, settings.DASHBOARD_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_dashboard_stats():
+    cache.delete(get_cache_key())
@@ -0,0 +1,62 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from manager import assets, images
+
+register = template.Library()
+
+TAGS = {
+    "css": '<link href="{}" rel="stylesheet" />',
+    "js": '<script src="{}"></script>',
+}
+
+
+@register.simple_tag
+def bundle(kind, name):
+    """Link the ``kind`` ("css" or "js") bundle ``name``; see ``manager.assets``."""
+    return format_html_join(
+        "\n  ",
+        TAGS[kind],
+        ((static(path),) for path in assets.get_bundle_paths(kind, name)),
+    )
+
+
+@register.simple_tag
+def responsive_image(path, alt="", sizes="100vw", loading="lazy", **attrs):
+    """
+    Show the static image ``path`` in the smallest built variant that fills
+    ``sizes``; see ``manager.images``. Other keyword arguments become
+    attributes of the ``<img>``. Pass ``loading="eager"`` for images in
+    the first screenful.
+    """
+    image = images.get_image(path)
+    attrs = {"alt": alt, "loading": loading, "decoding": "async", **attrs}
+    if image:
+        # Lets the browser reserve the space before the file arrives.
+        attrs = {"width": image["width"], "height": image["height"], **attrs}
+    img = format_html(
+        '<img src="{}"{}>',
+        static(path),
+        format_html_join("", ' {}="{}"', attrs.items()),
+    )
+    if not image or not image["variants"]:
+        return img
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (
+                images.FORMATS[image_format]["type"],
+                ", ".join(
+                    f"{static(url)} {width}w"
+                    for url, width in image["variants"][image_format]
+                ),
+                sizes,
+            )
+            # The manifest's keys are sorted; the browser wants the best first.
+            for image_format in images.FORMATS
+            if image_format in image["variants"]
+        ),
+    )
+    return format_html("<picture>{}{}</picture>", sources, img)
@@ -12,3 +12,9 @@ def query_transform(request, **kwargs):
         else:
             updated.pop(parameter, 0)
     return updated.urlencode()
+
+
+@register.simple_tag
+def query_replace(request, parameter, value):
+    """``query_transform`` for a parameter whose name is in a variable."""
+    return query_transform(request, **{parameter: value})
@@ -0,0 +1,106 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from manager import bulk
+from manager.models import Project, Task, TaskType, Team
+
+
+class SyncApiTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="Project", description="", deadline="2030-01-01"
+        )
+        self.task_type = TaskType.objects.create(name="Bug")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {index}",
+                description="",
+                deadline="2030-01-01",
+                project=self.project,
+                task_type=self.task_type,
+            )
+            for index in range(3)
+        ]
+        self.url = reverse("manager:api-changes", kwargs={"kind": "tasks"})
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(self.url, params)
+        self.assertEquals(response.status_code, 200)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_changes_since_a_token(self) -> None:
+        page = self.sync()
+        self.assertEquals(
+            [change["id"] for change in page["changes"]],
+            [task.pk for task in self.tasks],
+        )
+        self.assertEquals(page["changes"][0]["data"]["task_type"], "Bug")
+        self.assertFalse(page["has_more"])
+        self.assertEquals(self.sync(page["next"])["changes"], [])
+
+        self.tasks[1].assignees.add(self.worker)
+        self.task_type.name = "Feature"
+        self.task_type.save()
+        changes = self.sync(page["next"])["changes"]
+
+        # Each task once, at its latest change.
+        self.assertEquals(len(changes), 3)
+        self.assertEquals(changes[0]["data"]["task_type"], "Feature")
+        assigned = next(c for c in changes if c["id"] == self.tasks[1].pk)
+        self.assertEquals(assigned["data"]["assignees"], [self.worker.pk])
+
+    def test_deletions_and_bulk_changes(self) -> None:
+        token = self.sync()["next"]
+        deleted_pk = self.tasks[0].pk
+        self.tasks[0].delete()
+        bulk.apply_bulk_action(Task.objects.filter(pk=self.tasks[2].pk), bulk.COMPLETE)
+
+        changes = self.sync(token)["changes"]
+
+        self.assertEquals(changes[0]["id"], deleted_pk)
+        self.assertTrue(changes[0]["deleted"])
+        self.assertNotIn("data", changes[0])
+        self.assertEquals(changes[1]["id"], self.tasks[2].pk)
+        self.assertTrue(changes[1]["data"]["is_completed"])
+
+    def test_pages_follow_next(self) -> None:
+        first = self.sync(limit=2)
+        self.assertEquals(len(first["changes"]), 2)
+        self.assertTrue(first["has_more"])
+
+        second = self.sync(first["next"], limit=2)
+        self.assertEquals(second["changes"][0]["id"], self.tasks[2].pk)
+        self.assertFalse(second["has_more"])
+
+        team = Team.objects.create(name="Team")
+        team.members.add(self.worker)
+        self.url = reverse("manager:api-changes", kwargs={"kind": "teams"})
+        changes = self.sync()["changes"]
+        self.assertEquals(changes[0]["data"]["members"], [self.worker.pk])
+
+    @override_settings(API_TOKEN="secret")
+    def test_access(self) -> None:
+        response = self.client.get(self.url, {"since": "yesterday"})
+        self.assertEquals(response.status_code, 400)
+
+        self.client.logout()
+        self.assertEquals(self.client.get(self.url).status_code, 401)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(
+            self.client.get(
+                reverse("manager:api-changes", kwargs={"kind": "jobs"}),
+                HTTP_AUTHORIZATION="Bearer secret",
+            ).status_code,
+            404,
+        )
@@ -0,0 +1,92 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from manager import assets
+from manager.middleware import WhiteNoiseMiddleware
+
+CSS = """
+/* comment */
+@charset "UTF-8";
+:root { --color: red; }
+.btn, .unused-thing { color: red; }
+.btn:not(.unused-thing) { margin : 0 ; }
+.unused-thing .btn { color: blue; }
+@media (min-width: 768px) {
+  .col-md-6 { width: 50%; }
+  .unused-thing { width: 10%; }
+}
+@media print { .unused-thing { display: none; } }
+@keyframes spin { from { opacity: 0; } to { opacity: 1; } }
+"""
+
+
+class PruneCssTest(SimpleTestCase):
+    def test_unused_rules_are_dropped(self) -> None:
+        css = assets.prune_css(CSS, {"btn", "col-md-6"})
+
+        self.assertEquals(
+            css,
+            '@charset "UTF-8";'
+            ":root{--color:red}"
+            ".btn{color:red}"
+            ".btn:not(.unused-thing){margin:0}"
+            "@media (min-width: 768px){.col-md-6{width:50%}}"
+            "@keyframes spin{from { opacity: 0; } to { opacity: 1; }}",
+        )
+
+    def test_template_words_are_used(self) -> None:
+        words = assets.get_used_words(assets.SITE_JS)
+
+        # A template, a crispy form template and a form widget attribute.
+        self.assertTrue({"navbar", "invalid-feedback", "form-control"} <= words)
+
+
+class BuildTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(
+            self.settings(STATICFILES_DIRS=[directory.name, *settings.STATICFILES_DIRS])
+        )
+        self.output = Path(directory.name, assets.OUTPUT_DIR)
+        assets.load_manifest.cache_clear()
+        self.addCleanup(assets.load_manifest.cache_clear)
+
+    def render(self):
+        return Template('{% load assets %}{% bundle "css" "site" %}').render(Context())
+
+    def test_sources_are_linked_until_built(self) -> None:
+        html = self.render()
+
+        self.assertIn("/static/assets/css/nucleo-icons.css", html)
+        self.assertEquals(html.count("nucleo-svg.css"), 1)
+
+    def test_build(self) -> None:
+        report = assets.build()
+
+        site_css = assets.load_manifest()["css"]["site"]
+        self.assertRegex(site_css, r"^assets/dist/site\.[0-9a-f]{12}\.css$")
+        self.assertTrue(Path(self.output.parent.parent, site_css + ".gz").exists())
+        sizes = report["css", "site"]
+        # Most of the theme is never used.
+        self.assertLess(sizes["raw"] * 3, sizes["source"])
+        self.assertEquals(
+            self.render(), f'<link href="/static/{site_css}" rel="stylesheet" />'
+        )
+        self.assertEquals(set(assets.load_manifest()["js"]), set(assets.BUNDLES["js"]))
+
+    def test_built_files_are_immutable(self) -> None:
+        middleware = WhiteNoiseMiddleware(lambda request: None)
+
+        self.assertTrue(
+            middleware.immutable_file_test(
+                "", "/static/assets/dist/site.0123456789ab.css"
+            )
+        )
+        self.assertFalse(
+            middleware.immutable_file_test("", "/static/assets/css/nucleo-icons.css")
+        )
@@ -0,0 +1,91 @@
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import resolve, reverse
+
+from manager.models import Task, Project
+
+
+class AsyncViewTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker", password="worker1qazcde3"
+        )
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        for index in range(7):
+            Task.objects.create(
+                name=f"Task {index}",
+                description="Test Description",
+                deadline="2023-12-12",
+                project=self.project,
+            )
+        self.async_client.force_login(self.worker)
+
+    def test_views_are_async(self) -> None:
+        for url in [
+            reverse("manager:index"),
+            reverse("manager:task-list"),
+            reverse("manager:project-detail", kwargs={"pk": self.project.pk}),
+            reverse("manager:worker-detail", kwargs={"pk": self.worker.pk}),
+        ]:
+            self.assertTrue(iscoroutinefunction(resolve(url).func), url)
+
+    @override_settings(DEBUG=True)
+    def test_middleware_chain_stays_async(self) -> None:
+        # Django logs every sync middleware it has to wrap for ASGI.
+        with self.assertNoLogs("django.request", "DEBUG"):
+            handler = ASGIHandler()
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+
+    async def test_login_required(self) -> None:
+        response = await AsyncClient().get(reverse("manager:task-list"))
+
+        self.assertEquals(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse("login")))
+
+    async def test_task_list_offset_pages(self) -> None:
+        response = await self.async_client.get(
+            reverse("manager:task-list"), {"page": "last"}
+        )
+
+        self.assertEquals(response.context["paginator"].count, 7)
+        self.assertEquals(len(response.context["task_list"]), 2)
+        self.assertTrue(response.context["is_paginated"])
+        response = await self.async_client.get(
+            reverse("manager:task-list"), {"page": 9}
+        )
+        self.assertEquals(response.status_code, 404)
+
+    @override_settings(PAGINATION_MODE="keyset")
+    async def test_task_list_keyset_pages(self) -> None:
+        url = reverse("manager:task-list")
+        first = await self.async_client.get(url, {"name": "task"})
+        second = await self.async_client.get(
+            url, {"name": "task", "cursor": first.context["page_obj"].next_cursor}
+        )
+
+        names = [task.name for task in first.context["task_list"]]
+        names += [task.name for task in second.context["task_list"]]
+        self.assertEquals(sorted(names), [f"Task {index}" for index in range(7)])
+
+    async def test_detail_views(self) -> None:
+        response = await self.async_client.get(
+            reverse("manager:project-detail", kwargs={"pk": self.project.pk})
+        )
+        self.assertEquals(response.context["project_pk"], self.project.pk)
+        self.assertContains(response, "Task 6")
+
+        response = await self.async_client.get(
+            reverse("manager:worker-detail", kwargs={"pk": self.worker.pk + 100})
+        )
+        self.assertEquals(response.status_code, 404)
+
+    async def test_index(self) -> None:
+        response = await self.async_client.get(reverse("manager:index"))
+
+        self.assertEquals(response.context["num_tasks"], 7)
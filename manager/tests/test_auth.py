@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from manager.models import Position
+
+CONTACT_URL = reverse("manager:contact")
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    USER_CACHE_TIMEOUT=300,
+)
+class CachedSessionAndUserTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+            position=Position.objects.create(name="Developer"),
+        )
+        self.client.login(username="test_worker", password="worker1qazcde3")
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(CONTACT_URL)
+        return response, [query["sql"] for query in queries]
+
+    def test_second_request_reads_neither_session_nor_user(self) -> None:
+        self.get()
+
+        response, queries = self.get()
+
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(queries, [])
+        self.assertEquals(response.context["user"].position.name, "Developer")
+
+    def test_saving_worker_drops_cached_user(self) -> None:
+        self.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.username = "renamed_worker"
+            self.worker.save()
+
+        self.assertContains(self.client.get(CONTACT_URL), "renamed_worker")
+
+    def test_password_change_logs_out(self) -> None:
+        self.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.set_password("another1qazcde3")
+            self.worker.save()
+
+        response = self.client.get(CONTACT_URL)
+        self.assertFalse(response.context["user"].is_authenticated)
+
+    @override_settings(USER_CACHE_TIMEOUT=0)
+    def test_cache_can_be_turned_off(self) -> None:
+        self.get()
+
+        response, queries = self.get()
+
+        self.assertEquals(len(queries), 1)
+        self.assertIn('"manager_position"', queries[0])
@@ -0,0 +1,203 @@
+"""
+View benchmarks: every GET page in ``manager/urls.py`` is requested through
+the test client against fake datasets of increasing size, recording p50/p95
+latency and the SQL query count. Slow, so only run on request:
+
+    BENCHMARK=1 python manage.py test manager.tests.test_benchmarks
+
+Settings come from the environment:
+
+* ``BENCHMARK_SIZES``: task counts of the datasets, default ``200,2000``
+* ``BENCHMARK_REPEAT``: requests per page, default 20
+* ``BENCHMARK_OUTPUT``: results file, default ``benchmark-results.json``
+* ``BENCHMARK_LATENCY=1``: also check the p95 budgets
+* ``BENCHMARK_UPDATE_BASELINE=1``: write new budgets to the baseline file
+
+The run fails when a page goes over the query budget in
+``benchmark_baseline.json``, or when its query count grows with the dataset
+(an N+1 query). Query counts are exact on any machine; latency depends on the
+machine and its load, so the p95 budgets are only checked on request, on a
+quiet machine comparable to the one that wrote them.
+"""
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from manager import buckets, urls
+from manager.fake_data import generate_fake_data
+from manager.models import Position, Project, Task, TaskType, Team, Worker
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+SIZES = [int(size) for size in os.environ.get("BENCHMARK_SIZES", "200,2000").split(",")]
+REPEAT = int(os.environ.get("BENCHMARK_REPEAT", 20))
+CHECK_LATENCY = bool(os.environ.get("BENCHMARK_LATENCY"))
+OUTPUT_PATH = os.environ.get("BENCHMARK_OUTPUT", "benchmark-results.json")
+# Budgets written by BENCHMARK_UPDATE_BASELINE leave room for slower machines
+# and for timer noise on fast pages.
+P95_HEADROOM = 3
+P95_FLOOR_MS = 100
+
+# Pages that change data on GET or only accept POST.
+SKIPPED = {
+    "task-bulk-action",
+    "task-complete",
+    "toggle-task-assign",
+    "toggle-team-assign",
+    "project_completed",
+    # An event stream stays open until its timeout.
+    "project-events",
+}
+# Pages whose query count is expected to grow with the data.
+SIZE_DEPENDENT = {"export"}
+
+
+def dataset_counts(tasks):
+    return {
+        "workers": max(10, tasks // 20),
+        "teams": max(3, tasks // 200),
+        "projects": max(3, tasks // 50),
+        "tasks": tasks,
+    }
+
+
+def busiest(queryset, relation):
+    """The object with the most related rows, to make N+1 queries show."""
+    return queryset.annotate(related=Count(relation)).order_by("-related").first()
+
+
+def url_kwargs():
+    worker = busiest(Worker.objects.all(), "tasks")
+    task = busiest(Task.objects.filter(project__isnull=False), "assignees")
+    project = busiest(Project.objects.all(), "tasks")
+    return {
+        "worker-detail": {"pk": worker.pk},
+        "worker-update": {"pk": worker.pk},
+        "task-detail": {"pk": task.pk},
+        "task-update": {"pk": task.pk},
+        "task-delete": {"pk": task.pk},
+        "task-update-project": {"pk": task.pk, "project_pk": task.project_id},
+        "task-project-create": {"project_pk": project.pk},
+        "position-update": {"pk": busiest(Position.objects.all(), "workers").pk},
+        "position-delete": {"pk": busiest(Position.objects.all(), "workers").pk},
+        "task-type-detail": {"pk": busiest(TaskType.objects.all(), "tasks").pk},
+        "task-type-update": {"pk": busiest(TaskType.objects.all(), "tasks").pk},
+        "task-type-delete": {"pk": busiest(TaskType.objects.all(), "tasks").pk},
+        "team-detail": {"pk": busiest(Team.objects.all(), "members").pk},
+        "team-update": {"pk": busiest(Team.objects.all(), "members").pk},
+        "team-delete": {"pk": busiest(Team.objects.all(), "members").pk},
+        "project-detail": {"pk": project.pk},
+        "project-update": {"pk": project.pk},
+        "project-delete": {"pk": project.pk},
+        "export": {"kind": "tasks"},
+        "api-changes": {"kind": "tasks"},
+        "task-bucket": {
+            "bucket": max(
+                buckets.BUCKETS, key=lambda bucket: buckets.get_queryset(bucket).count()
+            )
+        },
+    }
+
+
+def page_names():
+    return [
+        pattern.name
+        for pattern in urls.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name not in SKIPPED
+    ]
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+@skipUnless(os.environ.get("BENCHMARK"), "Set BENCHMARK=1 to run view benchmarks.")
+class ViewBenchmarkTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="benchmark", password="worker1qazcde3"
+        )
+        self.client.force_login(self.user)
+
+    def measure(self, url):
+        timings, queries = [], []
+        for _ in range(REPEAT):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = self.client.get(url)
+                # Streaming responses only run their queries when consumed.
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                timings.append((time.perf_counter() - start) * 1000)
+            self.assertLess(response.status_code, 400, url)
+            queries.append(len(captured))
+        return {
+            "url": url,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(percentile(timings, 0.95), 2),
+            # The first request fills caches, later ones show the steady state.
+            "queries": queries[-1],
+            "cold_queries": queries[0],
+        }
+
+    def run_dataset(self, size):
+        results = {}
+        with transaction.atomic():
+            generate_fake_data(dataset_counts(size), seed=size)
+            cache.clear()
+            kwargs = url_kwargs()
+            for name in page_names():
+                url = reverse(f"manager:{name}", kwargs=kwargs.get(name))
+                results[name] = self.measure(url)
+            transaction.set_rollback(True)
+        return results
+
+    def test_views(self) -> None:
+        results = {size: self.run_dataset(size) for size in SIZES}
+        with open(OUTPUT_PATH, "w") as output:
+            json.dump(results, output, indent=2)
+
+        largest = results[max(SIZES)]
+        if os.environ.get("BENCHMARK_UPDATE_BASELINE"):
+            baseline = {
+                name: {
+                    "queries": result["queries"],
+                    "p95_ms": max(
+                        P95_FLOOR_MS, round(result["p95_ms"] * P95_HEADROOM, 1)
+                    ),
+                }
+                for name, result in largest.items()
+            }
+            with open(BASELINE_PATH, "w") as baseline_file:
+                json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+                baseline_file.write("\n")
+        with open(BASELINE_PATH) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        for name in page_names():
+            with self.subTest(view=name):
+                self.assertIn(
+                    name, baseline, "No budget, rerun with BENCHMARK_UPDATE_BASELINE=1"
+                )
+                result = largest[name]
+                self.assertLessEqual(result["queries"], baseline[name]["queries"])
+                if CHECK_LATENCY:
+                    self.assertLessEqual(result["p95_ms"], baseline[name]["p95_ms"])
+                if name not in SIZE_DEPENDENT:
+                    counts = {size: results[size][name]["queries"] for size in SIZES}
+                    self.assertEquals(
+                        len(set(counts.values())),
+                        1,
+                        f"Query count grows with the dataset: {counts}",
+                    )
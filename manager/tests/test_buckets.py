@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manager import buckets
+from manager.models import Task
+from manager.tests.test_query_plans import sqlite_plan_problems
+
+
+class TaskBucketTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.today = timezone.localdate()
+        self.tasks = {}
+        with self.captureOnCommitCallbacks(execute=True):
+            for name, days in [
+                ("overdue", -3),
+                ("today", 0),
+                ("later", 30),
+            ]:
+                self.tasks[name] = Task.objects.create(
+                    name=name,
+                    description="",
+                    deadline=self.today + timedelta(days=days),
+                )
+            self.tasks["overdue"].assignees.add(self.worker)
+
+    def counts(self, worker_id=None):
+        return buckets.get_counts(worker_id)
+
+    def assertCountsMatch(self, worker_id=None) -> None:
+        # The incrementally updated cache agrees with a fresh count.
+        cached = self.counts(worker_id)
+        queryset, aggregate = buckets.get_aggregate(worker_id, self.today)
+        self.assertEquals(cached, queryset.aggregate(**aggregate))
+
+    def test_bucket_for(self) -> None:
+        week_end = buckets.end_of_week(self.today)
+        self.assertEquals(buckets.bucket_for(self.today, False, self.today), "today")
+        self.assertEquals(
+            buckets.bucket_for(self.today - timedelta(days=1), False, self.today),
+            "overdue",
+        )
+        self.assertEquals(buckets.bucket_for(week_end, False, self.today), "week")
+        self.assertIsNone(
+            buckets.bucket_for(week_end + timedelta(days=1), False, self.today)
+        )
+        self.assertIsNone(buckets.bucket_for(self.today, True, self.today))
+
+    def test_counts_are_cached(self) -> None:
+        self.assertEquals(self.counts()["overdue"], 1)
+        self.assertEquals(self.counts(self.worker.pk)["today"], 0)
+
+        with self.assertNumQueries(0):
+            self.counts()
+            self.counts(self.worker.pk)
+
+    def test_save_moves_task_between_buckets(self) -> None:
+        self.counts()
+        self.counts(self.worker.pk)
+        task = self.tasks["overdue"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.deadline = self.today
+            task.save()
+        with self.assertNumQueries(0):
+            self.assertEquals(self.counts()["today"], 2)
+            self.assertEquals(self.counts(self.worker.pk)["today"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.is_completed = True
+            task.save()
+        self.assertCountsMatch()
+        self.assertCountsMatch(self.worker.pk)
+
+    def test_create_delete_and_assign(self) -> None:
+        self.counts()
+        self.counts(self.worker.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks["today"].assignees.add(self.worker)
+            self.worker.tasks.add(self.tasks["later"])
+            Task.objects.create(name="new", description="", deadline=self.today)
+        self.assertEquals(self.counts()["today"], 2)
+        self.assertEquals(self.counts(self.worker.pk)["today"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tasks["overdue"].delete()
+            self.tasks["today"].assignees.remove(self.worker)
+        self.assertCountsMatch()
+        self.assertCountsMatch(self.worker.pk)
+        self.assertEquals(self.counts(self.worker.pk)["overdue"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.worker.tasks.add(self.tasks["today"])
+            self.worker.tasks.clear()
+        self.assertCountsMatch(self.worker.pk)
+
+    def test_bulk_change_invalidates(self) -> None:
+        self.counts()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("manager:task-bulk-action"),
+                {"action": "complete", "tasks": [self.tasks["overdue"].pk]},
+            )
+
+        self.assertEquals(self.counts()["overdue"], 0)
+
+    def test_list_view(self) -> None:
+        url = reverse("manager:task-bucket", kwargs={"bucket": "overdue"})
+
+        response = self.client.get(url, {"worker": self.worker.pk})
+
+        self.assertEquals(list(response.context["task_list"]), [self.tasks["overdue"]])
+        self.assertContains(response, "Due this week")
+        self.assertEquals(
+            self.client.get(url.replace("overdue", "someday")).status_code, 404
+        )
+
+    def test_worker_widget(self) -> None:
+        response = self.client.get(
+            reverse("manager:worker-detail", kwargs={"pk": self.worker.pk})
+        )
+
+        self.assertIn(("overdue", "Overdue", 1), response.context["task_buckets"])
+        self.assertContains(response, f"?worker={self.worker.pk}")
+
+    def test_lists_use_the_open_task_index(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("Plan checked on SQLite only.")
+        for bucket in buckets.BUCKETS:
+            with self.subTest(bucket=bucket):
+                plan = buckets.get_queryset(bucket)[:5].explain()
+                self.assertIn("task_open_deadline_idx", plan)
+                self.assertEquals(sqlite_plan_problems(plan), [])
@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from manager import bulk
+from manager.models import Task, Team, Project
+
+BULK_URL = reverse("manager:task-bulk-action")
+
+
+class BulkActionTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        self.short_project = Project.objects.create(
+            name="short project",
+            description="test project details",
+            deadline="2023-12-01",
+        )
+        self.tasks = [
+            Task.objects.create(
+                name=f"Sprint task {index}",
+                description="Test Description",
+                deadline="2023-12-12",
+                project=self.project,
+            )
+            for index in range(4)
+        ]
+
+    def test_complete_updates_counters(self) -> None:
+        count = bulk.apply_bulk_action(Task.objects.all(), bulk.COMPLETE)
+
+        self.project.refresh_from_db()
+        self.assertEquals(count, 4)
+        self.assertFalse(Task.objects.filter(is_completed=False).exists())
+        self.assertEquals(self.project.open_task_count, 0)
+
+    def test_move_project_respects_deadline(self) -> None:
+        with self.assertRaises(ValidationError):
+            bulk.apply_bulk_action(
+                Task.objects.all(), bulk.MOVE_PROJECT, project=self.short_project
+            )
+        self.assertEquals(self.project.tasks.count(), 4)
+
+        other = Project.objects.create(
+            name="other project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        bulk.apply_bulk_action(Task.objects.all(), bulk.MOVE_PROJECT, project=other)
+        self.project.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEquals(self.project.total_task_count, 0)
+        self.assertEquals(other.total_task_count, 4)
+
+    def test_move_project_requires_assignees_in_project_team(self) -> None:
+        self.tasks[0].assignees.add(self.worker)
+        other = Project.objects.create(
+            name="other project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        with self.assertRaisesMessage(
+            ValidationError,
+            "test_worker needs to be a member of team who is in project "
+            f"(tasks {self.tasks[0].pk}).",
+        ):
+            bulk.apply_bulk_action(Task.objects.all(), bulk.MOVE_PROJECT, project=other)
+        self.assertEquals(self.project.tasks.count(), 4)
+
+        team = Team.objects.create(name="test team")
+        team.members.add(self.worker)
+        other.team.add(team)
+        bulk.apply_bulk_action(Task.objects.all(), bulk.MOVE_PROJECT, project=other)
+        self.assertEquals(other.tasks.count(), 4)
+
+    def test_add_assignee_requires_project_team(self) -> None:
+        with self.assertRaises(ValidationError):
+            bulk.apply_bulk_action(
+                Task.objects.all(), bulk.ADD_ASSIGNEE, worker=self.worker
+            )
+        self.assertFalse(self.worker.tasks.exists())
+
+        team = Team.objects.create(name="test team")
+        team.members.add(self.worker)
+        self.project.team.add(team)
+        bulk.apply_bulk_action(
+            Task.objects.all(), bulk.ADD_ASSIGNEE, worker=self.worker
+        )
+        self.assertEquals(self.worker.tasks.count(), 4)
+
+        bulk.apply_bulk_action(
+            Task.objects.filter(pk=self.tasks[0].pk),
+            bulk.REMOVE_ASSIGNEE,
+            worker=self.worker,
+        )
+        self.assertEquals(self.worker.tasks.count(), 3)
+
+    def test_view_with_selected_ids(self) -> None:
+        response = self.client.post(
+            BULK_URL,
+            {
+                "tasks": [self.tasks[0].pk, self.tasks[1].pk],
+                "action": bulk.SET_PRIORITY,
+                "priority": Task.URGENT,
+            },
+        )
+
+        self.assertRedirects(response, reverse("manager:task-list"))
+        self.assertEquals(Task.objects.filter(priority=Task.URGENT).count(), 2)
+
+    def test_view_with_saved_filter(self) -> None:
+        Task.objects.create(
+            name="Unrelated", description="Test Description", deadline="2023-12-12"
+        )
+        self.client.post(
+            BULK_URL,
+            {"select_all": "on", "name": "sprint", "action": bulk.COMPLETE},
+        )
+
+        self.assertEquals(Task.objects.filter(is_completed=True).count(), 4)
+
+    def test_view_reports_rule_violations(self) -> None:
+        response = self.client.post(
+            BULK_URL,
+            {
+                "select_all": "on",
+                "action": bulk.MOVE_PROJECT,
+                "project": self.short_project.pk,
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "Deadline can&#x27;t be after deadline project")
+
+    def test_view_requires_selection(self) -> None:
+        response = self.client.post(BULK_URL, {"action": bulk.COMPLETE}, follow=True)
+
+        self.assertContains(response, "Select at least one task.")
+        self.assertFalse(Task.objects.filter(is_completed=True).exists())
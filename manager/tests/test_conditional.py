@@ -0,0 +1,104 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from manager.models import Position, Project, Task, TaskType, Team
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="Project", description="", deadline=date(2030, 1, 1)
+        )
+        self.task = Task.objects.create(
+            name="Task",
+            description="",
+            deadline=date(2030, 1, 1),
+            project=self.project,
+            task_type=TaskType.objects.create(name="Bug"),
+        )
+        self.task_url = reverse("manager:task-detail", kwargs={"pk": self.task.pk})
+        self.project_url = reverse(
+            "manager:project-detail", kwargs={"pk": self.project.pk}
+        )
+
+    def assertNotModified(self, url, response) -> None:
+        repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEquals(repeat.status_code, 304)
+
+    def assertModified(self, url, response) -> None:
+        repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEquals(repeat.status_code, 200)
+        self.assertNotEquals(repeat["ETag"], response["ETag"])
+
+    def test_repeat_visit_is_not_modified(self) -> None:
+        response = self.client.get(self.task_url)
+        self.assertEquals(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # The session, the user and the version; no object, prefetch or
+        # template.
+        with self.assertNumQueries(3):
+            self.assertNotModified(self.task_url, response)
+        repeat = self.client.get(
+            self.task_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEquals(repeat.status_code, 304)
+
+    def test_changes_to_shown_rows_modify_the_page(self) -> None:
+        response = self.client.get(self.task_url)
+        self.task.assignees.add(self.worker)
+        self.assertModified(self.task_url, response)
+
+        response = self.client.get(self.task_url)
+        self.task.task_type.name = "Feature"
+        self.task.task_type.save()
+        self.assertModified(self.task_url, response)
+
+        response = self.client.get(self.task_url)
+        position = Position.objects.create(name="Developer")
+        self.worker.position = position
+        self.worker.save()
+        response = self.client.get(self.task_url)
+        position.name = "Tester"
+        position.save()
+        self.assertModified(self.task_url, response)
+
+    def test_tasks_leaving_a_project_modify_its_page(self) -> None:
+        response = self.client.get(self.project_url)
+        self.assertEquals(response.status_code, 200)
+        self.assertNotModified(self.project_url, response)
+
+        self.task.project = None
+        self.task.save()
+        self.assertModified(self.project_url, response)
+
+        response = self.client.get(self.project_url)
+        Task.objects.create(
+            name="Other",
+            description="",
+            deadline=date(2030, 1, 1),
+            project=self.project,
+        ).delete()
+        self.assertModified(self.project_url, response)
+
+        response = self.client.get(self.project_url)
+        Team.objects.create(name="Team").projects.add(self.project)
+        self.assertModified(self.project_url, response)
+
+    def test_pending_messages_are_shown(self) -> None:
+        response = self.client.get(self.task_url)
+        self.client.get(reverse("manager:toggle-task-assign", args=[self.task.pk]))
+
+        repeat = self.client.get(self.task_url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEquals(repeat.status_code, 200)
+        self.assertNotIn("ETag", repeat)
+        self.assertContains(repeat, "You need to be a member of team")
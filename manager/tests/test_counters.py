@@ -0,0 +1,159 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from manager.models import Task, Team, Project
+
+
+class ProjectTaskCounterTest(TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        self.other_project = Project.objects.create(
+            name="other project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+
+    def create_task(self, **kwargs):
+        return Task.objects.create(
+            name="Test Task",
+            description="Test Description",
+            deadline="2023-12-12",
+            **kwargs,
+        )
+
+    def assertCounts(self, project, total, open_) -> None:
+        project.refresh_from_db()
+        self.assertEquals(
+            (project.total_task_count, project.open_task_count), (total, open_)
+        )
+
+    def test_create_and_complete(self) -> None:
+        task = self.create_task(project=self.project)
+        self.create_task(project=self.project, is_completed=True)
+        self.assertCounts(self.project, 2, 1)
+
+        task.is_completed = True
+        task.save()
+        self.assertCounts(self.project, 2, 0)
+
+    def test_move_between_projects(self) -> None:
+        task = Task.objects.get(pk=self.create_task(project=self.project).pk)
+
+        task.project = self.other_project
+        task.save()
+
+        self.assertCounts(self.project, 0, 0)
+        self.assertCounts(self.other_project, 1, 1)
+
+    def test_delete(self) -> None:
+        task = self.create_task(project=self.project)
+
+        task.delete()
+
+        self.assertCounts(self.project, 0, 0)
+
+    def test_project_completion_uses_counter(self) -> None:
+        worker = get_user_model().objects.create_user(
+            username="test_worker", password="worker1qazcde3"
+        )
+        self.client.force_login(worker)
+        self.create_task(project=self.project)
+        url = reverse("manager:project_completed", kwargs={"pk": self.project.pk})
+
+        self.client.get(url)
+        self.project.refresh_from_db()
+        self.assertFalse(self.project.is_completed)
+
+        self.project.tasks.update(is_completed=True)
+        call_command("recount", stdout=StringIO())
+        self.client.get(url)
+        self.project.refresh_from_db()
+        self.assertTrue(self.project.is_completed)
+
+    def test_saving_a_stale_project_keeps_counters(self) -> None:
+        stale = Project.objects.get(pk=self.project.pk)
+        self.create_task(project=self.project)
+
+        stale.name = "renamed project"
+        stale.save()
+
+        self.assertCounts(self.project, 1, 1)
+        self.assertEquals(self.project.name, "renamed project")
+
+        stale.total_task_count = 5
+        stale.save(update_fields=["total_task_count"])
+        self.assertCounts(self.project, 5, 1)
+
+
+class TeamCounterTest(TestCase):
+    def setUp(self) -> None:
+        self.team = Team.objects.create(name="test team")
+        self.workers = [
+            get_user_model().objects.create_user(
+                username=f"worker_{index}", password="worker1qazcde3"
+            )
+            for index in range(3)
+        ]
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+
+    def assertCounts(self, members, projects) -> None:
+        self.team.refresh_from_db()
+        self.assertEquals(
+            (self.team.member_count, self.team.project_count), (members, projects)
+        )
+
+    def test_members_from_both_sides(self) -> None:
+        self.team.members.add(*self.workers)
+        self.team.members.add(self.workers[0])
+        self.assertCounts(3, 0)
+
+        self.workers[1].teams.remove(self.team)
+        self.assertCounts(2, 0)
+
+        self.workers[0].teams.clear()
+        self.assertCounts(1, 0)
+
+        self.workers[2].delete()
+        self.assertCounts(0, 0)
+
+    def test_projects_from_both_sides(self) -> None:
+        self.project.team.add(self.team)
+        self.assertCounts(0, 1)
+
+        self.team.projects.clear()
+        self.assertCounts(0, 0)
+
+        self.project.team.add(self.team)
+        self.project.delete()
+        self.assertCounts(0, 0)
+
+    def test_saving_a_stale_team_keeps_counters(self) -> None:
+        stale = Team.objects.get(pk=self.team.pk)
+        self.team.members.add(*self.workers)
+        self.project.team.add(self.team)
+
+        stale.name = "renamed team"
+        stale.save()
+
+        self.assertCounts(3, 1)
+        self.assertEquals(self.team.name, "renamed team")
+
+    def test_recount_repairs_drift(self) -> None:
+        self.team.members.add(*self.workers)
+        Team.objects.update(member_count=42, project_count=7)
+
+        call_command("recount", stdout=StringIO())
+
+        self.assertCounts(3, 0)
@@ -0,0 +1,144 @@
+import asyncio
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from manager import events
+from manager.models import Project, Task
+
+
+@override_settings(EVENTS_POLL_INTERVAL=0.01)
+class ProjectEventsTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.async_client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="Project", description="", deadline=date(2030, 1, 1)
+        )
+        self.other = Project.objects.create(
+            name="Other", description="", deadline=date(2030, 1, 1)
+        )
+        self.task = Task.objects.create(
+            name="Task", description="", deadline=date(2030, 1, 1), project=self.project
+        )
+
+    async def next_event(self, subscription):
+        return await asyncio.wait_for(subscription.queue.get(), 5)
+
+    async def test_changes_reach_the_viewers_of_the_project(self) -> None:
+        broadcaster = events.Broadcaster()
+        viewer, _ = await broadcaster.subscribe(self.project.pk, {self.task.pk})
+        other_viewer, _ = await broadcaster.subscribe(self.other.pk, set())
+
+        new_task = await sync_to_async(Task.objects.create)(
+            name="New", description="", deadline=date(2030, 1, 2), project=self.project
+        )
+        _, pk, project_id, html = await self.next_event(viewer)
+        self.assertEquals((pk, project_id), (new_task.pk, self.project.pk))
+        self.assertIn('id="task-%d"' % new_task.pk, html)
+
+        await sync_to_async(new_task.assignees.add)(self.worker)
+        _, pk, _, html = await self.next_event(viewer)
+        self.assertIn("test_worker", html)
+
+        # Moving the task out reaches both pages.
+        new_task.project = self.other
+        await sync_to_async(new_task.save)()
+        _, pk, project_id, _ = await self.next_event(viewer)
+        self.assertEquals((pk, project_id), (new_task.pk, self.other.pk))
+        _, pk, _, _ = await self.next_event(other_viewer)
+        self.assertEquals(pk, new_task.pk)
+        self.assertNotIn(new_task.pk, viewer.task_ids)
+
+        deleted_pk = self.task.pk
+        await sync_to_async(self.task.delete)()
+        _, pk, project_id, html = await self.next_event(viewer)
+        self.assertEquals((pk, project_id, html), (deleted_pk, None, None))
+        self.assertTrue(other_viewer.queue.empty())
+
+        broadcaster.unsubscribe(viewer)
+        broadcaster.unsubscribe(other_viewer)
+        await asyncio.wait_for(broadcaster.poller, 5)
+
+    async def test_reconnect_catches_up(self) -> None:
+        since = await events.aget_last_seq()
+        self.task.is_completed = True
+        await sync_to_async(self.task.save)()
+
+        content = events.stream(self.project.pk, {self.task.pk}, since)
+
+        self.assertEquals(await anext(content), "retry: 2000\n\n")
+        event = await anext(content)
+        self.assertTrue(event.startswith(f"id: {since + 1}\nevent: task\n"))
+        self.assertIn('data-completed=\\"true\\"', event)
+        # Caught up, so a reconnect without an event starts from here.
+        self.assertEquals(await anext(content), f"id: {since + 1}\n\n")
+        await content.aclose()
+        await asyncio.wait_for(events.broadcaster.poller, 5)
+
+    async def test_stream_starts_from_the_rendered_page(self) -> None:
+        rendered_at = await events.aget_last_seq()
+        other_viewer, _ = await events.broadcaster.subscribe(
+            self.project.pk, {self.task.pk}
+        )
+        moved = await sync_to_async(Task.objects.create)(
+            name="Moved", description="", deadline=date(2030, 1, 2), project=self.other
+        )
+        self.task.is_completed = True
+        await sync_to_async(self.task.save)()
+        # Published before the page's stream subscribes.
+        await self.next_event(other_viewer)
+
+        content = events.stream(self.project.pk, {self.task.pk}, rendered_at)
+
+        await anext(content)
+        removal, update = await anext(content), await anext(content)
+        self.assertIn('"id": %d, "project": null, "html": null' % moved.pk, removal)
+        self.assertTrue(update.startswith(f"id: {rendered_at + 2}\nevent: task\n"))
+        self.assertIn('data-completed=\\"true\\"', update)
+        self.assertEquals(await anext(content), f"id: {rendered_at + 2}\n\n")
+        await content.aclose()
+        events.broadcaster.unsubscribe(other_viewer)
+        await asyncio.wait_for(events.broadcaster.poller, 5)
+
+
+class ProjectEventViewTest(TransactionTestCase):
+    # The view reads in the request's own thread and connection, which only
+    # sees committed rows.
+    def setUp(self) -> None:
+        worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.async_client.force_login(worker)
+        self.project = Project.objects.create(
+            name="Project", description="", deadline=date(2030, 1, 1)
+        )
+
+    async def test_stream_response(self) -> None:
+        response = await self.async_client.get(
+            reverse("manager:project-events", kwargs={"pk": self.project.pk})
+        )
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response["Content-Type"], "text/event-stream")
+        self.assertEquals(response["Cache-Control"], "no-cache")
+
+        response = await self.async_client.get(
+            reverse("manager:project-events", kwargs={"pk": self.project.pk + 1})
+        )
+        self.assertEquals(response.status_code, 404)
+
+    async def test_page_carries_the_change_it_shows(self) -> None:
+        response = await self.async_client.get(
+            reverse("manager:project-detail", kwargs={"pk": self.project.pk})
+        )
+
+        self.assertContains(
+            response, 'data-last-seq="%d"' % await events.aget_last_seq()
+        )
@@ -0,0 +1,111 @@
+import csv
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from manager import export
+from manager.models import Task, TaskType, Team, Project
+
+
+class ExportTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        self.project.team.add(Team.objects.create(name="test team"))
+        task_type = TaskType.objects.create(name="Bug")
+        for index in range(6):
+            task = Task.objects.create(
+                name=f"Report task {index}" if index % 2 else f"Other task {index}",
+                description="Test Description",
+                deadline="2023-12-12",
+                task_type=task_type,
+                project=self.project,
+            )
+            task.assignees.add(self.worker)
+
+    def read_stream(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_honors_search(self) -> None:
+        response = self.client.get(
+            reverse("manager:export", kwargs={"kind": "tasks"}), {"name": "report"}
+        )
+
+        self.assertEquals(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(self.read_stream(response))))
+        self.assertEquals(len(rows), 3)
+        self.assertEquals(rows[0]["task_type"], "Bug")
+        self.assertEquals(rows[0]["project"], "test project")
+        self.assertEquals(rows[0]["assignees"], "test_worker")
+
+    def test_ndjson_export(self) -> None:
+        response = self.client.get(
+            reverse("manager:export", kwargs={"kind": "projects"}),
+            {"format": "ndjson"},
+        )
+
+        rows = [json.loads(line) for line in self.read_stream(response).splitlines()]
+        self.assertEquals(rows[0]["teams"], "test team")
+        self.assertEquals(rows[0]["total_tasks"], 6)
+        self.assertEquals(rows[0]["deadline"], "2024-12-22")
+
+    def test_unknown_export(self) -> None:
+        url = reverse("manager:export", kwargs={"kind": "passwords"})
+        self.assertEquals(self.client.get(url).status_code, 404)
+
+    def test_queries_per_chunk_are_constant(self) -> None:
+        export_ = export.EXPORTS["tasks"]
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(export_.rows(export_.get_queryset(), chunk_size=2))
+
+        self.assertEquals(len(rows), 6)
+        # One query for each chunk of tasks and one for their assignees.
+        self.assertLessEqual(len(queries), 2 * 4)
+
+    def test_command(self) -> None:
+        out = StringIO()
+
+        call_command("export", "workers", "--format", "ndjson", stdout=out)
+
+        self.assertEquals(json.loads(out.getvalue())["username"], "test_worker")
+
+
+class AsgiExportTest(TransactionTestCase):
+    # The ASGI request reads in its own thread and connection, which only
+    # sees committed rows.
+    def setUp(self) -> None:
+        worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.async_client.force_login(worker)
+        Task.objects.bulk_create(
+            Task(name=f"Task {index}", description="", deadline="2023-12-12")
+            for index in range(1200)
+        )
+
+    async def test_streams_as_it_reads(self) -> None:
+        response = await self.async_client.get(
+            reverse("manager:export", kwargs={"kind": "tasks"})
+        )
+
+        # An async iterator, which ASGI sends chunk by chunk.
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEquals(len(chunks), 3)
+        rows = list(csv.DictReader(StringIO(b"".join(chunks).decode())))
+        self.assertEquals(len(rows), 1200)
@@ -0,0 +1,74 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase
+
+from manager import counters
+from manager.fake_data import generate_fake_data
+from manager.models import Task, Team, Project, Worker
+from manager.search import search
+
+COUNTS = {"workers": 30, "teams": 5, "projects": 8, "tasks": 120}
+
+
+class FakeDataTest(TestCase):
+    def snapshot(self):
+        return list(
+            Task.objects.order_by("pk").values_list(
+                "name", "deadline", "priority", "is_completed", "project__name"
+            )
+        )
+
+    def test_counts_and_relations(self) -> None:
+        created = generate_fake_data(COUNTS, seed=1, batch_size=50)
+
+        self.assertEquals(created, COUNTS)
+        self.assertEquals(Task.objects.count(), 120)
+        self.assertEquals(Worker.objects.count(), 30)
+        self.assertFalse(
+            Team.members.through.objects.filter(team__isnull=True).exists()
+        )
+        # Every assignee of a project task is in one of the project's teams.
+        self.assertFalse(
+            Task.assignees.through.objects.filter(task__project__isnull=False)
+            .exclude(worker__teams__projects=F("task__project"))
+            .exists()
+        )
+        self.assertEquals(counters.recount_projects(), 8)
+        self.assertEquals(
+            sum(Project.objects.values_list("total_task_count", flat=True)),
+            Task.objects.filter(project__isnull=False).count(),
+        )
+        self.assertTrue(search(Task.objects.all(), "dashboard").exists())
+
+    def test_same_seed_same_data(self) -> None:
+        with transaction.atomic():
+            generate_fake_data(COUNTS, seed=7, batch_size=50, index=False)
+            first = self.snapshot()
+            transaction.set_rollback(True)
+
+        generate_fake_data(COUNTS, seed=7, batch_size=50, index=False)
+
+        self.assertEquals(self.snapshot(), first)
+
+    def test_command(self) -> None:
+        out = StringIO()
+
+        call_command(
+            "generate_fake_data",
+            "--workers=3",
+            "--teams=1",
+            "--projects=2",
+            "--tasks=10",
+            stdout=out,
+        )
+
+        self.assertIn(
+            "Created 3 workers, 1 teams, 2 projects, 10 tasks.", out.getvalue()
+        )
+        new_task = Task.objects.create(
+            name="After", description="Test Description", deadline="2023-12-12"
+        )
+        self.assertGreater(new_task.pk, 10)
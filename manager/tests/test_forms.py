@@ -69,7 +69,7 @@ class TaskProjectFormTest(TestCase):
             "deadline": datetime.datetime(
                 year=2023, month=9, day=24, tzinfo=zoneinfo.ZoneInfo(key="Europe/Kiev")
             ),
-            "priority": "Medium",
+            "priority": Task.MEDIUM,
             "task_type": task_type,
             "assignees": assignees,
         }
@@ -101,7 +101,7 @@ class TaskProjectFormTest(TestCase):
             deadline=datetime.datetime(
                 year=2023, month=9, day=24, tzinfo=zoneinfo.ZoneInfo(key="Europe/Kiev")
             ),
-            priority="Medium",
+            priority=Task.MEDIUM,
             task_type=task_type,
         )
 
@@ -150,7 +150,7 @@ class TaskFormTest(TestCase):
             "deadline": datetime.datetime(
                 year=2023, month=9, day=24, tzinfo=zoneinfo.ZoneInfo(key="Europe/Kiev")
             ),
-            "priority": "Medium",
+            "priority": Task.MEDIUM,
             "task_type": task_type,
             "assignees": assignees,
         }
@@ -173,7 +173,7 @@ class TaskFormTest(TestCase):
             deadline=datetime.datetime(
                 year=2024, month=9, day=24, tzinfo=zoneinfo.ZoneInfo(key="Europe/Kiev")
             ),
-            priority="Medium",
+            priority=Task.MEDIUM,
             task_type=task_type,
         )
 
@@ -0,0 +1,105 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import skipIf
+
+from django.conf import settings
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from manager import images
+from manager.middleware import WhiteNoiseMiddleware
+
+TEMPLATE = (
+    '{% load assets %}{% responsive_image "assets/img/photo.jpg" '
+    'alt="A photo" sizes="50vw" class="w-100" %}'
+)
+
+
+class ResponsiveImageTest(SimpleTestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(
+            self.settings(STATICFILES_DIRS=[directory.name, *settings.STATICFILES_DIRS])
+        )
+        self.static = Path(directory.name)
+        images.load_manifest.cache_clear()
+        self.addCleanup(images.load_manifest.cache_clear)
+
+    def render(self):
+        return Template(TEMPLATE).render(Context())
+
+    def test_original_is_shown_until_built(self) -> None:
+        self.assertEquals(
+            self.render(),
+            '<img src="/static/assets/img/photo.jpg" alt="A photo" '
+            'loading="lazy" decoding="async" class="w-100">',
+        )
+
+    def test_variants_are_offered(self) -> None:
+        output = self.static / images.OUTPUT_DIR
+        output.mkdir(parents=True)
+        manifest = {
+            "assets/img/photo.jpg": {
+                "width": 1200,
+                "height": 800,
+                "variants": {
+                    "avif": [["assets/responsive/photo-480w.0123456789ab.avif", 480]],
+                    "webp": [
+                        ["assets/responsive/photo-480w.0123456789ab.webp", 480],
+                        ["assets/img/photo.jpg", 1200],
+                    ],
+                },
+            }
+        }
+        (output / images.MANIFEST).write_text(json.dumps(manifest))
+
+        self.assertEquals(
+            self.render(),
+            "<picture>"
+            '<source type="image/avif" '
+            'srcset="/static/assets/responsive/photo-480w.0123456789ab.avif 480w" '
+            'sizes="50vw">'
+            '<source type="image/webp" '
+            'srcset="/static/assets/responsive/photo-480w.0123456789ab.webp 480w, '
+            '/static/assets/img/photo.jpg 1200w" sizes="50vw">'
+            '<img src="/static/assets/img/photo.jpg" width="1200" height="800" '
+            'alt="A photo" loading="lazy" decoding="async" class="w-100">'
+            "</picture>",
+        )
+
+    @skipIf(images.Image is None, "Pillow isn't installed")
+    def test_build(self) -> None:
+        source = self.static / images.SOURCE_DIR / "photo.jpg"
+        source.parent.mkdir(parents=True)
+        images.Image.linear_gradient("L").resize((1000, 600)).convert("RGB").save(
+            source, quality=100
+        )
+
+        report = images.build()
+
+        image = images.get_image("assets/img/photo.jpg")
+        self.assertEquals((image["width"], image["height"]), (1000, 600))
+        webp = image["variants"]["webp"]
+        # Never wider than the original.
+        self.assertEquals([width for _, width in webp], [480, 960, 1000])
+        self.assertRegex(
+            webp[0][0], r"^assets/responsive/photo-480w\.[0-9a-f]{12}\.webp$"
+        )
+        self.assertTrue((self.static / webp[0][0]).exists())
+        self.assertLess(report["assets/img/photo.jpg"]["webp"], source.stat().st_size)
+        self.assertIn("<picture>", self.render())
+
+    def test_variants_are_immutable(self) -> None:
+        middleware = WhiteNoiseMiddleware(lambda request: None)
+
+        self.assertTrue(
+            middleware.immutable_file_test(
+                "",
+                "/static/assets/responsive/curved-images/curved-480w.0123456789ab.avif",
+            )
+        )
+        self.assertFalse(
+            middleware.immutable_file_test("", "/static/assets/img/meeting.jpg")
+        )
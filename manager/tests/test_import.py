@@ -0,0 +1,143 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manager import importer
+from manager.models import Position, Task, TaskType, Team, Project
+from manager.search import search
+
+
+class ImportTestMixin:
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.team = Team.objects.create(name="test team")
+        self.team.members.add(self.worker)
+        self.deadline = timezone.localdate() + timedelta(days=10)
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline=self.deadline + timedelta(days=10),
+        )
+        self.project.team.add(self.team)
+        TaskType.objects.create(name="Bug")
+
+
+class TaskImportTest(ImportTestMixin, TestCase):
+    def csv(self, *rows):
+        header = "name,description,deadline,priority,task_type,project,assignees"
+        return StringIO("\n".join([header, *rows]) + "\n")
+
+    def test_valid_rows_are_created(self) -> None:
+        result = importer.import_tasks(
+            self.csv(
+                f"Import one,Text,{self.deadline},High,Bug,test project,test_worker",
+                f"Import two,Text,{self.deadline},,Bug,,test_worker",
+            ),
+            batch_size=1,
+        )
+
+        self.assertEquals((result.created, result.errors), (2, []))
+        task = Task.objects.get(name="Import one")
+        self.assertEquals(task.priority, Task.HIGH)
+        self.assertEquals(list(task.assignees.all()), [self.worker])
+        self.project.refresh_from_db()
+        self.assertEquals(self.project.total_task_count, 1)
+        self.assertEquals(search(Task.objects.all(), "import").count(), 2)
+
+    def test_invalid_rows_are_reported(self) -> None:
+        late = self.project.deadline + timedelta(days=1)
+        get_user_model().objects.create_user(
+            username="outsider", password="worker1qazcde3"
+        )
+        result = importer.import_tasks(
+            self.csv(
+                f"Too late,Text,{late},High,Bug,test project,test_worker",
+                f"Outsider,Text,{self.deadline},High,Bug,test project,outsider",
+                f"Unknown,Text,{self.deadline},Someday,Feature,,nobody",
+                f"Fine,Text,{self.deadline},Low,Bug,test project,test_worker",
+            )
+        )
+
+        self.assertEquals(result.created, 1)
+        self.assertEquals([line for line, _ in result.errors], [2, 3, 4])
+        self.assertIn("after deadline project", result.errors[0][1])
+        self.assertIn("needs to be a member", result.errors[1][1])
+        self.assertEquals(
+            result.errors[2][1],
+            "Unknown priority 'Someday'.; Unknown task type 'Feature'.; "
+            "Unknown worker 'nobody'.",
+        )
+        self.assertEquals(Task.objects.get().name, "Fine")
+
+
+class WorkerImportTest(ImportTestMixin, TestCase):
+    def test_workers_positions_and_teams(self) -> None:
+        result = importer.import_workers(
+            StringIO(
+                "username,first_name,last_name,email,position,teams\n"
+                "alice,Alice,Smith,alice@example.com,Designer,test team;new team\n"
+                "bob,Bob,Brown,,Designer,new team\n"
+                "test_worker,,,,,\n"
+                "carol,,,not-an-email,Dev0ps,\n"
+            )
+        )
+
+        self.assertEquals(result.created, 2)
+        self.assertEquals([line for line, _ in result.errors], [4, 5])
+        alice = get_user_model().objects.get(username="alice")
+        self.assertEquals(alice.position.name, "Designer")
+        self.assertFalse(alice.has_usable_password())
+        self.assertEquals(Position.objects.filter(name="Designer").count(), 1)
+        new_team = Team.objects.get(name="new team")
+        self.assertEquals(new_team.member_count, 2)
+        self.team.refresh_from_db()
+        self.assertEquals(self.team.member_count, 2)
+
+    def test_upload_view(self) -> None:
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="worker1qazcde3"
+        )
+        self.client.force_login(admin)
+        upload = SimpleUploadedFile(
+            "workers.csv", b"\xef\xbb\xbfusername,position\ndave,Tester\n"
+        )
+
+        response = self.client.post(
+            reverse("manager:import"), {"kind": "workers", "file": upload}
+        )
+
+        self.assertContains(response, "Created 1 row.")
+        self.assertTrue(get_user_model().objects.filter(username="dave").exists())
+
+    def test_upload_requires_permission(self) -> None:
+        self.client.force_login(self.worker)
+        upload = SimpleUploadedFile("workers.csv", b"username\ndave\n")
+
+        response = self.client.post(
+            reverse("manager:import"), {"kind": "workers", "file": upload}
+        )
+
+        self.assertEquals(response.status_code, 403)
+
+    def test_command(self) -> None:
+        out, err = StringIO(), StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "workers.csv")
+            with open(path, "w") as file:
+                file.write("username\nerin\nerin\n")
+
+            call_command("import_csv", "workers", path, stdout=out, stderr=err)
+
+        self.assertIn("Created 1 workers, skipped 1 rows.", out.getvalue())
+        self.assertIn("Line 3: A worker called 'erin' already exists.", err.getvalue())
@@ -0,0 +1,164 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manager import jobs
+from manager.models import Job, JobStats, OutboundEmail, Project, Task
+
+
+calls = []
+
+
+@jobs.job(name="test-record")
+def record(**kwargs):
+    calls.append(kwargs)
+
+
+@jobs.job(name="test-fail", max_attempts=2)
+def fail():
+    raise ValueError("broken")
+
+
+class JobTest(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+
+    def test_enqueued_job_runs_once(self) -> None:
+        job = jobs.enqueue("test-record", answer=42)
+
+        self.assertEquals(len(jobs.run_due_jobs()), 1)
+        self.assertEquals(jobs.run_due_jobs(), [])
+
+        self.assertEquals(calls, [{"answer": 42}])
+        job.refresh_from_db()
+        self.assertEquals((job.status, job.attempts), (Job.DONE, 1))
+        self.assertIsNotNone(job.duration)
+        stats = JobStats.objects.get(name="test-record")
+        self.assertEquals((stats.runs, stats.failures), (1, 0))
+
+    def test_unknown_job(self) -> None:
+        with self.assertRaises(KeyError):
+            jobs.enqueue("no-such-job")
+
+    def test_future_job_waits(self) -> None:
+        jobs.enqueue("test-record", run_at=timezone.now() + timedelta(minutes=1))
+
+        self.assertEquals(jobs.run_due_jobs(), [])
+
+    def test_claimed_job_is_not_claimed_again(self) -> None:
+        jobs.enqueue("test-record")
+
+        self.assertEquals(len(jobs.claim_jobs(10)), 1)
+        self.assertEquals(jobs.claim_jobs(10), [])
+
+    def test_expired_lease_is_taken_over(self) -> None:
+        job = jobs.enqueue("test-record")
+        (claimed,) = jobs.claim_jobs(10)
+        Job.objects.update(run_at=timezone.now())
+
+        jobs.run_due_jobs()
+        # The first worker finishing late doesn't overwrite the result.
+        jobs.finish(claimed, 1.0, error="late")
+
+        job.refresh_from_db()
+        self.assertEquals((job.status, job.attempts), (Job.DONE, 2))
+
+    def test_failed_job_is_retried_then_given_up(self) -> None:
+        job = jobs.enqueue("test-fail")
+
+        jobs.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEquals(job.status, Job.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("ValueError: broken", job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        jobs.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEquals((job.status, job.attempts), (Job.FAILED, 2))
+        stats = JobStats.objects.get(name="test-fail")
+        self.assertEquals((stats.runs, stats.failures), (2, 2))
+
+    def test_periodic_job_schedules_its_next_run(self) -> None:
+        with mock.patch.dict(
+            jobs.REGISTRY,
+            {"test-record": jobs.JobType(record, timedelta(minutes=5), 3)},
+            clear=True,
+        ):
+            jobs.schedule_periodic()
+            jobs.schedule_periodic()
+            self.assertEquals(Job.objects.count(), 1)
+
+            jobs.run_due_jobs()
+
+        self.assertEquals(len(calls), 1)
+        pending = Job.objects.get(status=Job.QUEUED)
+        self.assertTrue(pending.periodic)
+        self.assertGreater(pending.run_at, timezone.now() + timedelta(minutes=4))
+
+    def test_command(self) -> None:
+        jobs.enqueue("test-record")
+        jobs.enqueue("test-record")
+        out = StringIO()
+
+        with mock.patch.dict(
+            jobs.REGISTRY, {"test-record": jobs.REGISTRY["test-record"]}, clear=True
+        ):
+            call_command("run_worker", "--once", stdout=out)
+
+        self.assertEquals(len(calls), 2)
+        self.assertEquals(out.getvalue().count(": done in "), 2)
+
+
+class BuiltInJobTest(TestCase):
+    def test_deadline_reminders(self) -> None:
+        worker = get_user_model().objects.create_user(
+            username="test_worker", password="worker1qazcde3", email="w@example.com"
+        )
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        for name, deadline, is_completed in [
+            ("Due", tomorrow, False),
+            ("Done", tomorrow, True),
+            ("Later", tomorrow + timedelta(days=1), False),
+        ]:
+            task = Task.objects.create(
+                name=name,
+                description="",
+                deadline=deadline,
+                is_completed=is_completed,
+            )
+            task.assignees.add(worker)
+
+        jobs.send_deadline_reminders()
+
+        email = OutboundEmail.objects.get()
+        self.assertEquals(email.to, ["w@example.com"])
+        self.assertEquals(email.body, "- Due")
+
+    def test_clean_up(self) -> None:
+        old = timezone.now() - jobs.RETENTION - timedelta(days=1)
+        Job.objects.create(name="recount", status=Job.DONE, finished_at=old)
+        Job.objects.create(name="recount", status=Job.QUEUED)
+
+        jobs.clean_up()
+
+        self.assertEquals(
+            list(Job.objects.values_list("status", flat=True)), ["queued"]
+        )
+
+    def test_metrics(self) -> None:
+        Project.objects.create(name="p", description="", deadline=timezone.localdate())
+        jobs.enqueue("recount")
+        jobs.run_due_jobs()
+        jobs.enqueue("recount")
+
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="127.0.0.1")
+
+        self.assertContains(response, 'django_job_runs_total{job="recount"} 1')
+        self.assertContains(response, 'django_jobs{status="queued"} 1')
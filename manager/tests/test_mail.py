@@ -0,0 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.mail import BadHeaderError
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from manager.mail import enqueue_mail, send_queued_mail
+from manager.models import OutboundEmail
+
+
+class MailQueueTest(TestCase):
+    def test_enqueue_does_not_send(self) -> None:
+        email = enqueue_mail("Hello", "Body", None, ["to@example.com"])
+
+        self.assertEquals(mail.outbox, [])
+        self.assertEquals(email.status, OutboundEmail.PENDING)
+        self.assertEquals(email.from_email, "admin@example.com")
+
+    def test_enqueue_rejects_header_injection(self) -> None:
+        with self.assertRaises(BadHeaderError):
+            enqueue_mail("Hello\nBcc: x@example.com", "Body", None, ["a@example.com"])
+
+    def test_batch_uses_one_connection(self) -> None:
+        for number in range(3):
+            enqueue_mail(f"Message {number}", "Body", None, ["to@example.com"])
+        enqueue_mail("Later", "Body", None, ["to@example.com"])
+        OutboundEmail.objects.filter(subject="Later").update(
+            next_attempt_at=timezone.now() + timedelta(hours=1)
+        )
+
+        with mock.patch(
+            "manager.mail.get_connection", wraps=mail.get_connection
+        ) as get_connection:
+            result = send_queued_mail()
+
+        self.assertEquals(get_connection.call_count, 1)
+        self.assertEquals((result.sent, result.retried, result.failed), (3, 0, 0))
+        self.assertEquals(
+            [message.subject for message in mail.outbox],
+            ["Message 0", "Message 1", "Message 2"],
+        )
+        self.assertEquals(
+            OutboundEmail.objects.filter(status=OutboundEmail.SENT).count(), 3
+        )
+
+    def test_failures_back_off_then_give_up(self) -> None:
+        email = enqueue_mail("Hello", "Body", None, ["to@example.com"])
+
+        with mock.patch(
+            "django.core.mail.EmailMessage.send", side_effect=OSError("refused")
+        ):
+            result = send_queued_mail(max_attempts=2)
+            email.refresh_from_db()
+            self.assertEquals(result.retried, 1)
+            self.assertEquals(email.attempts, 1)
+            self.assertEquals(email.last_error, "OSError: refused")
+            self.assertGreater(email.next_attempt_at, timezone.now())
+
+            # Not due yet, so nothing is claimed.
+            self.assertEquals(send_queued_mail(max_attempts=2).retried, 0)
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            result = send_queued_mail(max_attempts=2)
+
+        email.refresh_from_db()
+        self.assertEquals(result.failed, 1)
+        self.assertEquals(email.status, OutboundEmail.FAILED)
+
+    def test_command(self) -> None:
+        enqueue_mail("Hello", "Body", None, ["to@example.com"])
+        out = StringIO()
+
+        call_command("send_queued_mail", stdout=out)
+
+        self.assertIn("Sent 1, will retry 0, gave up on 0.", out.getvalue())
+        self.assertIn("The mail queue is empty.", out.getvalue())
+        self.assertEquals(len(mail.outbox), 1)
+
+
+@override_settings(CONTACT_EMAIL="team@example.com")
+class ContactViewTest(TestCase):
+    # The page is linked from the public footer, so it takes anonymous
+    # visitors.
+    def test_message_is_queued(self) -> None:
+        response = self.client.post(
+            reverse("manager:contact"),
+            {
+                "first_name": "Anna",
+                "last_name": "Adams",
+                "email_address": "anna@example.com",
+                "message": "Hello there",
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "Message sent.")
+        self.assertEquals(mail.outbox, [])
+        email = OutboundEmail.objects.get()
+        self.assertEquals(email.to, ["team@example.com"])
+        self.assertIn("anna@example.com", email.body)
+
+    def test_invalid_form_is_not_queued(self) -> None:
+        response = self.client.post(reverse("manager:contact"), {"first_name": "A"})
+
+        self.assertEquals(response.status_code, 200)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_bad_header_is_a_form_error(self) -> None:
+        with mock.patch(
+            "manager.views.enqueue_mail", side_effect=BadHeaderError("newline")
+        ):
+            response = self.client.post(
+                reverse("manager:contact"),
+                {
+                    "first_name": "Anna",
+                    "last_name": "Adams",
+                    "email_address": "anna@example.com",
+                    "message": "Hello there",
+                },
+            )
+
+        self.assertContains(response, "Invalid header found.")
+        self.assertNotContains(response, "Message sent.")
@@ -0,0 +1,121 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from manager.models import Position, Task, Team, Project
+
+
+class MembershipTestMixin:
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="Developer")
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+            position=self.position,
+        )
+        self.client.force_login(self.worker)
+        self.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        self.team = Team.objects.create(name="test team")
+        self.task = Task.objects.create(
+            name="Test Task",
+            description="Test Description",
+            deadline="2023-12-12",
+            project=self.project,
+        )
+
+    def add_workers(self, count):
+        workers = [
+            get_user_model().objects.create_user(
+                username=f"extra_{index}_{count}",
+                password="worker1qazcde3",
+                position=self.position,
+            )
+            for index in range(count)
+        ]
+        self.task.assignees.add(*workers)
+        self.team.members.add(*workers)
+        return workers
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEquals(response.status_code, 200)
+        return len(queries)
+
+
+class TaskMembershipTest(MembershipTestMixin, TestCase):
+    def test_toggle_requires_project_team(self) -> None:
+        url = reverse("manager:toggle-task-assign", kwargs={"pk": self.task.pk})
+
+        self.client.get(url)
+        self.assertFalse(self.task.assignees.filter(pk=self.worker.pk).exists())
+
+        self.team.members.add(self.worker)
+        self.project.team.add(self.team)
+        self.client.get(url)
+        self.assertTrue(self.task.assignees.filter(pk=self.worker.pk).exists())
+
+        self.client.get(url)
+        self.assertFalse(self.task.assignees.filter(pk=self.worker.pk).exists())
+
+    def test_toggle_without_project(self) -> None:
+        task = Task.objects.create(
+            name="Loose Task", description="Test Description", deadline="2023-12-12"
+        )
+        url = reverse("manager:toggle-task-assign", kwargs={"pk": task.pk})
+
+        self.client.get(url)
+
+        self.assertTrue(task.assignees.filter(pk=self.worker.pk).exists())
+
+    def test_detail_flags_assignee(self) -> None:
+        url = reverse("manager:task-detail", kwargs={"pk": self.task.pk})
+        self.assertFalse(self.client.get(url).context["is_assignee"])
+
+        self.task.assignees.add(self.worker)
+        self.assertTrue(self.client.get(url).context["is_assignee"])
+
+    def test_detail_query_count_is_constant(self) -> None:
+        url = reverse("manager:task-detail", kwargs={"pk": self.task.pk})
+        self.add_workers(1)
+        baseline = self.count_queries(url)
+
+        self.add_workers(20)
+        for task_index in range(20):
+            Task.objects.create(
+                name=f"Other {task_index}",
+                description="Test Description",
+                deadline="2023-12-12",
+            ).assignees.add(self.worker)
+
+        self.assertEquals(self.count_queries(url), baseline)
+
+
+class TeamMembershipTest(MembershipTestMixin, TestCase):
+    def test_toggle_team(self) -> None:
+        url = reverse("manager:toggle-team-assign", kwargs={"pk": self.team.pk})
+
+        self.client.get(url)
+        self.assertTrue(self.team.members.filter(pk=self.worker.pk).exists())
+
+        self.client.get(url)
+        self.assertFalse(self.team.members.filter(pk=self.worker.pk).exists())
+
+    def test_detail_query_count_is_constant(self) -> None:
+        url = reverse("manager:team-detail", kwargs={"pk": self.team.pk})
+        self.project.team.add(self.team)
+        self.add_workers(1)
+        baseline = self.count_queries(url)
+
+        self.add_workers(20)
+        for index in range(5):
+            Team.objects.create(name=f"Other {index}").members.add(self.worker)
+
+        self.assertEquals(self.count_queries(url), baseline)
+        self.assertContains(self.client.get(url), "(position: Developer)")
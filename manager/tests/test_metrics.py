@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from manager.metrics import registry
+from manager.models import Task
+
+METRICS_URL = reverse("metrics")
+
+
+class MetricsTest(TestCase):
+    def setUp(self) -> None:
+        registry.reset()
+        self.client.force_login(
+            get_user_model().objects.create_user(
+                username="test_worker", password="worker1qazcde3"
+            )
+        )
+
+    def scrape(self, **extra):
+        response = self.client.get(METRICS_URL, **extra)
+        self.assertEquals(response.status_code, 200)
+        return response.content.decode()
+
+    def test_records_requests_queries_and_templates(self) -> None:
+        Task.objects.create(
+            name="Test Task", description="Test Description", deadline="2023-12-12"
+        )
+        self.client.get(reverse("manager:task-list"))
+        self.client.get(reverse("manager:task-list"))
+        self.client.get("/no-such-page/")
+
+        metrics = self.scrape()
+
+        self.assertIn(
+            'django_http_requests_total{view="manager:task-list",method="GET",'
+            'status="200"} 2',
+            metrics,
+        )
+        self.assertIn(
+            'django_http_request_duration_seconds_bucket{view="manager:task-list",'
+            'le="+Inf"} 2',
+            metrics,
+        )
+        self.assertIn(
+            'django_template_renders_total{view="manager:task-list"} 2', metrics
+        )
+        self.assertIn('view="<unresolved>",method="GET",status="404"', metrics)
+        queries = next(
+            line
+            for line in metrics.splitlines()
+            if line.startswith('django_db_queries_total{view="manager:task-list"}')
+        )
+        self.assertGreater(int(queries.split()[-1]), 2)
+
+    def test_access_control(self) -> None:
+        self.assertEquals(
+            self.client.get(METRICS_URL, REMOTE_ADDR="10.0.0.1").status_code, 403
+        )
+        with override_settings(METRICS_TOKEN="secret"):
+            self.assertEquals(self.client.get(METRICS_URL).status_code, 403)
+            self.scrape(REMOTE_ADDR="10.0.0.1", HTTP_AUTHORIZATION="Bearer secret")
+
+    async def test_records_async_requests(self) -> None:
+        await self.async_client.get(reverse("manager:index"))
+
+        self.assertEquals(registry.views["manager:index"].requests[("GET", 302)], 1)
+
+        # The async views query in sync_to_async threads.
+        worker = await get_user_model().objects.aget(username="test_worker")
+        await sync_to_async(self.async_client.force_login)(worker)
+        response = await self.async_client.get(reverse("manager:index"))
+
+        self.assertEquals(response.status_code, 200)
+        self.assertGreater(registry.views["manager:index"].queries, 0)
@@ -0,0 +1,129 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from manager.models import TaskType, Task, Project
+from manager.pagination import KeysetPaginator
+
+TASK_LIST_URL = reverse("manager:task-list")
+
+
+@override_settings(PAGINATION_MODE="keyset")
+class KeysetPaginationViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        task_type = TaskType.objects.create(name="Test Task Type")
+        project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        for task_id in range(8):
+            Task.objects.create(
+                name=f"Test Task {task_id}",
+                description="Test Description",
+                deadline=f"2023-12-{task_id + 10}",
+                is_completed=task_id % 3 == 0,
+                priority=Task.LOW,
+                task_type=task_type,
+                project=project,
+            )
+
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+
+    def test_first_page_has_only_next_cursor(self) -> None:
+        response = self.client.get(TASK_LIST_URL)
+
+        page = response.context["page_obj"]
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(response.context["is_paginated"])
+        self.assertEquals(len(response.context["task_list"]), 5)
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+
+    def test_cursors_walk_forward_and_back(self) -> None:
+        first = self.client.get(TASK_LIST_URL)
+        first_ids = [task.id for task in first.context["task_list"]]
+
+        second = self.client.get(
+            TASK_LIST_URL, {"cursor": first.context["page_obj"].next_cursor}
+        )
+        second_ids = [task.id for task in second.context["task_list"]]
+        self.assertEquals(len(second_ids), 3)
+        self.assertFalse(set(first_ids) & set(second_ids))
+        self.assertFalse(second.context["page_obj"].has_next())
+
+        back = self.client.get(
+            TASK_LIST_URL, {"cursor": second.context["page_obj"].previous_cursor}
+        )
+        self.assertEquals([task.id for task in back.context["task_list"]], first_ids)
+
+    def test_pages_follow_view_ordering(self) -> None:
+        ids = []
+        cursor = None
+        while True:
+            params = {"cursor": cursor} if cursor else {}
+            page = self.client.get(TASK_LIST_URL, params).context["page_obj"]
+            ids.extend(task.id for task in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+
+        expected = Task.objects.order_by(
+            "is_completed", "deadline", "name", "id"
+        ).values_list("id", flat=True)
+        self.assertEquals(ids, list(expected))
+
+    def test_no_count_query(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(TASK_LIST_URL)
+
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+        )
+
+    def test_search_keeps_working(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"name": "Task 7"})
+
+        self.assertEquals(len(response.context["task_list"]), 1)
+        self.assertFalse(response.context["is_paginated"])
+
+    def test_tampered_cursor_returns_404(self) -> None:
+        response = self.client.get(TASK_LIST_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEquals(response.status_code, 404)
+
+    def test_template_renders_next_link_only(self) -> None:
+        response = self.client.get(TASK_LIST_URL)
+
+        self.assertContains(response, "cursor=")
+        self.assertNotContains(response, "page=2")
+
+
+class KeysetPaginatorTest(TestCase):
+    def test_descending_ordering(self) -> None:
+        for index in range(5):
+            get_user_model().objects.create_user(
+                username=f"worker_{index}", password="worker1qazcde3"
+            )
+        queryset = get_user_model().objects.order_by("-username")
+        paginator = KeysetPaginator(queryset, 2)
+
+        usernames = []
+        page = paginator.page()
+        while True:
+            usernames.extend(worker.username for worker in page)
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+
+        self.assertEquals(
+            usernames, [f"worker_{index}" for index in reversed(range(5))]
+        )
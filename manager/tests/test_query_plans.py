@@ -0,0 +1,123 @@
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from manager.models import Position, TaskType, Team, Project, Task
+from manager.pagination import KeysetPaginator
+from manager.views import (
+    WorkerListView,
+    TaskListView,
+    CompletedTaskListView,
+    PositionListView,
+    TaskTypeListView,
+    TeamListView,
+    ProjectListView,
+)
+
+LIST_VIEWS = (
+    WorkerListView,
+    TaskListView,
+    CompletedTaskListView,
+    PositionListView,
+    TaskTypeListView,
+    TeamListView,
+    ProjectListView,
+)
+
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (\w+)$")
+
+
+def sqlite_plan_problems(plan):
+    problems = []
+    for line in plan.splitlines():
+        detail = line.split(" ", 3)[-1].strip()
+        if "USE TEMP B-TREE" in detail:
+            problems.append(detail)
+        elif SQLITE_FULL_SCAN.search(detail):
+            problems.append(detail)
+    return problems
+
+
+def postgresql_plan_problems(plan):
+    problems = []
+    nodes = [json.loads(plan)[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node["Node Type"] in ("Seq Scan", "Sort", "Incremental Sort"):
+            problems.append(f"{node['Node Type']} on {node.get('Relation Name')}")
+        nodes.extend(node.get("Plans", ()))
+    return problems
+
+
+class ListViewQueryPlanTest(TestCase):
+    """
+    Run EXPLAIN on the first page of every list view and fail if the planner
+    has to scan a whole table or sort rows in a temporary structure.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        Position.objects.create(name="Developer")
+        Team.objects.create(name="Test Team")
+        task_type = TaskType.objects.create(name="Test Task Type")
+        Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline="2024-12-22",
+        )
+        Task.objects.create(
+            name="Test Task",
+            description="Test Description",
+            deadline="2023-12-12",
+            is_completed=True,
+            task_type=task_type,
+        )
+
+    def get_queryset(self, view_class, params=None):
+        request = RequestFactory().get("/", params)
+        request.user = self.worker
+        view = view_class()
+        view.setup(request)
+        return view.get_queryset(), view.paginate_by
+
+    def explain(self, queryset):
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return postgresql_plan_problems(queryset.explain(format="json"))
+        if connection.vendor == "sqlite":
+            return sqlite_plan_problems(queryset.explain())
+        self.skipTest(f"No plan checks for {connection.vendor}.")
+
+    def test_list_views_use_indexes(self) -> None:
+        for view_class in LIST_VIEWS:
+            with self.subTest(view=view_class.__name__):
+                queryset, page_size = self.get_queryset(view_class)
+
+                self.assertEquals(self.explain(queryset[:page_size]), [])
+
+    def test_keyset_pages_use_indexes(self) -> None:
+        for view_class in LIST_VIEWS:
+            with self.subTest(view=view_class.__name__):
+                queryset, page_size = self.get_queryset(view_class)
+                paginator = KeysetPaginator(queryset, page_size)
+                cursor = paginator.encode_cursor(queryset.first(), "next")
+                _, values = paginator.decode_cursor(cursor)
+
+                for backwards in (False, True):
+                    page_queryset = paginator.get_page_queryset(values, backwards)
+                    self.assertEquals(self.explain(page_queryset), [])
+
+    def test_most_urgent_first_uses_index(self) -> None:
+        for params in ({"ordering": "priority"}, {"priority": Task.URGENT}):
+            with self.subTest(params=params):
+                queryset, page_size = self.get_queryset(TaskListView, params)
+
+                self.assertEquals(self.explain(queryset[:page_size]), [])
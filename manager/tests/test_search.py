@@ -0,0 +1,126 @@
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.db.models import IntegerField
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from manager.models import Task, Project, Team
+from manager.search import PostgresSearchBackend, SearchBackend, search
+
+try:
+    from django.db.backends.postgresql import psycopg_any
+except ImportError:  # pragma: no cover - optional
+    psycopg_any = None
+
+TASK_LIST_URL = reverse("manager:task-list")
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.by_description = Task.objects.create(
+            name="Write docs",
+            description="Describe the deployment pipeline",
+            deadline="2023-12-10",
+        )
+        cls.by_name = Task.objects.create(
+            name="Deployment checklist",
+            description="Everything we check before a release",
+            deadline="2023-12-12",
+        )
+        Task.objects.create(
+            name="Unrelated",
+            description="Nothing to see here",
+            deadline="2023-12-11",
+        )
+
+    def test_name_matches_rank_above_description_matches(self) -> None:
+        results = list(search(Task.objects.all(), "deploy"))
+
+        self.assertEquals(results, [self.by_name, self.by_description])
+
+    def test_all_terms_must_match(self) -> None:
+        results = list(search(Task.objects.all(), "deployment pipeline"))
+
+        self.assertEquals(results, [self.by_description])
+
+    def test_empty_query_returns_everything(self) -> None:
+        self.assertEquals(search(Task.objects.all(), "").count(), 3)
+
+    def test_punctuation_only_query_matches_nothing(self) -> None:
+        self.assertEquals(search(Task.objects.all(), "!!!").count(), 0)
+
+    def test_index_follows_updates_and_deletes(self) -> None:
+        self.by_name.name = "Release checklist"
+        self.by_name.save()
+        self.assertEquals(
+            list(search(Task.objects.all(), "release")),
+            [self.by_name],
+        )
+
+        self.by_name.delete()
+        self.assertEquals(search(Task.objects.all(), "release").count(), 0)
+
+    def test_project_and_team_search(self) -> None:
+        project = Project.objects.create(
+            name="Apollo",
+            description="Moon landing",
+            deadline="2024-12-22",
+        )
+        team = Team.objects.create(name="Mission control")
+
+        self.assertEquals(list(search(Project.objects.all(), "moon")), [project])
+        self.assertEquals(list(search(Team.objects.all(), "miss")), [team])
+
+    @override_settings(SEARCH_BACKEND="manager.search.ContainsSearchBackend")
+    def test_contains_fallback_backend(self) -> None:
+        results = search(Task.objects.all(), "deploy")
+
+        self.assertEquals(set(results), {self.by_name, self.by_description})
+
+
+class SearchViewTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        for index in range(7):
+            Task.objects.create(
+                name=f"Sprint task {index}",
+                description="Test Description",
+                deadline="2023-12-12",
+            )
+
+    def test_worker_list_searches_username_prefix(self) -> None:
+        get_user_model().objects.create_user(
+            username="another_user", password="worker1qazcde3"
+        )
+        response = self.client.get(reverse("manager:worker-list"), {"username": "test"})
+
+        self.assertEquals(list(response.context["worker_list"]), [self.worker])
+
+    @override_settings(PAGINATION_MODE="keyset")
+    def test_keyset_pagination_over_search_results(self) -> None:
+        first = self.client.get(TASK_LIST_URL, {"name": "sprint"})
+        second = self.client.get(
+            TASK_LIST_URL,
+            {"name": "sprint", "cursor": first.context["page_obj"].next_cursor},
+        )
+
+        ids = [task.id for task in first.context["task_list"]]
+        ids += [task.id for task in second.context["task_list"]]
+        self.assertEquals(
+            sorted(ids), sorted(Task.objects.values_list("id", flat=True))
+        )
+
+    @skipIf(psycopg_any is None, "psycopg isn't installed")
+    def test_postgres_rank_is_an_exact_cursor_value(self) -> None:
+        queryset = PostgresSearchBackend().filter(Task.objects.all(), ["sprint"])
+
+        rank = queryset.query.annotations["search_rank"]
+        self.assertIsInstance(rank.output_field, IntegerField)
+        with self.assertRaises(TypeError):
+            SearchBackend()
@@ -0,0 +1,102 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manager.models import Task, Team, Project
+from manager.stats import get_dashboard_stats
+
+INDEX_URL = reverse("manager:index")
+
+
+class DashboardStatsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        today = timezone.localdate()
+        cls.project = Project.objects.create(
+            name="test project",
+            description="test project details",
+            deadline=today + datetime.timedelta(days=30),
+        )
+        Project.objects.create(
+            name="done project",
+            description="test project details",
+            deadline=today,
+            is_completed=True,
+        )
+        Team.objects.create(name="test team")
+        Task.objects.create(
+            name="overdue",
+            description="Test Description",
+            deadline=today - datetime.timedelta(days=1),
+            priority=Task.URGENT,
+        )
+        Task.objects.create(
+            name="upcoming",
+            description="Test Description",
+            deadline=today + datetime.timedelta(days=1),
+        )
+        Task.objects.create(
+            name="done",
+            description="Test Description",
+            deadline=today - datetime.timedelta(days=1),
+            is_completed=True,
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_counters(self) -> None:
+        stats = get_dashboard_stats()
+
+        self.assertEquals(stats["num_projects"], 2)
+        self.assertEquals(stats["active_projects"], 1)
+        self.assertEquals(stats["num_teams"], 1)
+        self.assertEquals(stats["num_tasks"], 3)
+        self.assertEquals(stats["task_is_done_true"], 1)
+        self.assertEquals(stats["open_tasks"], 2)
+        self.assertEquals(stats["overdue_tasks"], 1)
+        self.assertEquals(stats["unassigned_tasks"], 2)
+        self.assertIn(("Urgent", 1), stats["open_by_priority"])
+        self.assertIn(("Medium", 1), stats["open_by_priority"])
+
+    def test_one_query_per_model_then_cached(self) -> None:
+        with self.assertNumQueries(3):
+            get_dashboard_stats()
+        with self.assertNumQueries(0):
+            get_dashboard_stats()
+
+    def test_invalidated_by_task_changes(self) -> None:
+        get_dashboard_stats()
+        task = Task.objects.get(name="upcoming")
+        with self.captureOnCommitCallbacks(execute=True):
+            task.is_completed = True
+            task.save()
+
+        self.assertEquals(get_dashboard_stats()["task_is_done_true"], 2)
+
+    def test_invalidated_by_team_membership(self) -> None:
+        get_dashboard_stats()
+        worker = get_user_model().objects.create_user(
+            username="test_worker", password="worker1qazcde3"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.get(name="overdue").assignees.add(worker)
+
+        self.assertEquals(get_dashboard_stats()["unassigned_tasks"], 1)
+
+    def test_index_uses_cached_stats(self) -> None:
+        worker = get_user_model().objects.create_user(
+            username="test_worker", password="worker1qazcde3"
+        )
+        self.client.force_login(worker)
+        get_dashboard_stats()
+
+        response = self.client.get(INDEX_URL)
+
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.context["num_projects"], 2)
+        self.assertContains(response, "Overdue tasks")
@@ -30,7 +30,7 @@ class PrivateTaskListTest(TestCase):
                 description="Test Description",
                 deadline="2023-12-12",
                 is_completed=False,
-                priority="Low",
+                priority=Task.LOW,
                 task_type=task_type,
                 project=project,
             )
@@ -73,3 +73,30 @@ class PrivateTaskListTest(TestCase):
         self.assertTrue("is_paginated" in response.context)
         self.assertTrue(response.context["is_paginated"] is True)
         self.assertEquals(len(response.context["task_list"]), 3)
+
+    def test_most_urgent_first(self) -> None:
+        urgent = Task.objects.create(
+            name="Urgent task",
+            description="Test Description",
+            deadline="2023-12-20",
+            priority=Task.URGENT,
+        )
+
+        response = self.client.get(TASK_LIST_URL, {"ordering": "priority"})
+
+        self.assertEquals(response.context["task_list"][0], urgent)
+        self.assertContains(response, "Urgent")
+
+    def test_filter_by_priority(self) -> None:
+        Task.objects.create(
+            name="High task",
+            description="Test Description",
+            deadline="2023-12-20",
+            priority=Task.HIGH,
+        )
+
+        response = self.client.get(TASK_LIST_URL, {"priority": Task.HIGH})
+
+        self.assertEquals(
+            [task.name for task in response.context["task_list"]], ["High task"]
+        )
@@ -0,0 +1,35 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase
+
+from manager import warmup
+
+
+class WarmUpTest(SimpleTestCase):
+    def test_compiles_urls_and_templates(self) -> None:
+        timings = warmup.warm_up()
+
+        self.assertGreater(timings["url_patterns"], 50)
+        self.assertEquals(timings["failed_templates"], [])
+        loader = engines["django"].engine.template_loaders[0]
+        self.assertIn("manager/task_list.html", loader.get_template_cache)
+        self.assertIn("includes/pagination.html", loader.get_template_cache)
+
+    def test_measure_startup_command(self) -> None:
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory, "startup.json")
+
+            call_command(
+                "measure_startup", "--repeat=1", f"--output={output}", stdout=out
+            )
+
+            results = json.loads(output.read_text())
+        self.assertIn("warm_up", results["warm"])
+        self.assertNotIn("warm_up", results["cold"])
+        self.assertIn("Startup measured.", out.getvalue())
@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from manager import bulk, workload
+from manager.models import Project, Task, WorkerWorkload
+
+
+def get_rows():
+    fields = ["worker_id", "project_id", "priority", "deadline", "open_count"]
+    return list(WorkerWorkload.objects.order_by(*fields).values_list(*fields))
+
+
+class WorkerWorkloadTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.other = get_user_model().objects.create_user(
+            username="other_worker",
+            password="worker1qazcde3",
+        )
+        self.today = timezone.localdate()
+        self.project = Project.objects.create(
+            name="Project", description="", deadline=self.today
+        )
+        self.tasks = [
+            Task.objects.create(
+                name=f"Task {number}",
+                description="",
+                deadline=self.today + timedelta(days=number - 1),
+                priority=Task.HIGH if number % 2 else Task.LOW,
+                project=self.project if number < 2 else None,
+            )
+            for number in range(4)
+        ]
+        for task in self.tasks:
+            task.assignees.add(self.worker)
+        self.tasks[0].assignees.add(self.other)
+
+    def assertRowsMatchRebuild(self) -> None:
+        # The incrementally maintained rows agree with a recount.
+        rows = get_rows()
+        workload.rebuild()
+        self.assertEquals(rows, get_rows())
+
+    def test_summary(self) -> None:
+        Task.objects.create(
+            name="Done", description="", deadline=self.today, is_completed=True
+        ).assignees.add(self.worker)
+
+        summary = workload.get_summary(self.worker.pk)
+
+        self.assertEquals(summary["open"], 4)
+        self.assertEquals(summary["overdue"], 1)
+        self.assertEquals(summary["next_deadline"], self.today)
+        self.assertEquals(summary["priorities"], [("High", 2), ("Low", 2)])
+        self.assertEquals(
+            summary["projects"],
+            [(self.project.pk, "Project", 2), (None, None, 2)],
+        )
+        self.assertRowsMatchRebuild()
+
+    def test_saves_move_tasks_between_rows(self) -> None:
+        task = self.tasks[0]
+        task.priority = Task.URGENT
+        task.deadline = self.today + timedelta(days=5)
+        task.project = None
+        task.save()
+        self.assertRowsMatchRebuild()
+
+        self.tasks[1].is_completed = True
+        self.tasks[1].save()
+        self.assertRowsMatchRebuild()
+        self.assertEquals(workload.get_summary(self.worker.pk)["open"], 3)
+
+        self.tasks[2].delete()
+        self.assertRowsMatchRebuild()
+
+    def test_assignee_changes(self) -> None:
+        self.other.tasks.add(*self.tasks[1:])
+        self.assertRowsMatchRebuild()
+
+        self.tasks[1].assignees.remove(self.worker)
+        self.other.tasks.remove(self.tasks[2])
+        self.assertRowsMatchRebuild()
+
+        self.tasks[0].assignees.clear()
+        self.worker.tasks.clear()
+        self.assertRowsMatchRebuild()
+        self.assertEquals(workload.get_summary(self.worker.pk)["open"], 0)
+
+    def test_bulk_changes_and_deleted_project(self) -> None:
+        bulk.apply_bulk_action(
+            Task.objects.filter(pk__in=[self.tasks[0].pk, self.tasks[2].pk]),
+            bulk.COMPLETE,
+        )
+        self.assertRowsMatchRebuild()
+
+        self.project.delete()
+        self.assertRowsMatchRebuild()
+        self.assertEquals(
+            workload.get_summary(self.worker.pk)["projects"], [(None, None, 2)]
+        )
+
+
+class WorkerDetailViewTest(TestCase):
+    def setUp(self) -> None:
+        self.worker = get_user_model().objects.create_user(
+            username="test_worker",
+            password="worker1qazcde3",
+        )
+        self.client.force_login(self.worker)
+        self.url = reverse("manager:worker-detail", kwargs={"pk": self.worker.pk})
+
+    def create_tasks(self, count, is_completed) -> None:
+        today = timezone.localdate()
+        for number in range(count):
+            Task.objects.create(
+                name=f"Task {number}",
+                description="",
+                deadline=today + timedelta(days=number),
+                is_completed=is_completed,
+            ).assignees.add(self.worker)
+
+    def test_lists_are_paginated(self) -> None:
+        self.create_tasks(12, False)
+        self.create_tasks(3, True)
+
+        response = self.client.get(self.url)
+
+        open_tasks = response.context["open_tasks"]
+        self.assertEquals(len(open_tasks), 10)
+        self.assertEquals(len(response.context["completed_tasks"]), 3)
+        self.assertEquals(response.context["workload"]["open"], 12)
+
+        second = self.client.get(self.url, {"open": open_tasks.next_cursor})
+        self.assertEquals(len(second.context["open_tasks"]), 2)
+        self.assertEquals(len(second.context["completed_tasks"]), 3)
+
+    def test_query_count_does_not_grow_with_tasks(self) -> None:
+        self.create_tasks(2, False)
+        self.client.get(self.url)
+        with self.assertNumQueries(7):
+            self.client.get(self.url)
+
+        self.create_tasks(20, False)
+        self.create_tasks(20, True)
+        self.client.get(self.url)
+        with self.assertNumQueries(7):
+            self.client.get(self.url)
@@ -2,11 +2,17 @@ from django.urls import path
 
 from manager.views import (
     index,
+    contact,
+    export_view,
+    api_changes,
+    import_view,
     register_user,
     WorkerListView,
     WorkerDetailView,
     WorkerUpdateView,
     TaskListView,
+    task_bulk_action,
+    TaskBucketListView,
     TaskDetailView,
     TaskCreateView,
     TaskUpdateView,
@@ -34,6 +40,7 @@ from manager.views import (
     ProjectUpdateView,
     ProjectDeleteView,
     project_completed_true,
+    project_events,
     task_completed_true,
     toggle_assign_to_task,
     toggle_assign_to_team,
@@ -42,10 +49,20 @@ from manager.views import (
 urlpatterns = [
     path("", index, name="index"),
     path("register/", register_user, name="register"),
+    path("contact/", contact, name="contact"),
+    path("export/<str:kind>/", export_view, name="export"),
+    path("api/v1/<str:kind>/", api_changes, name="api-changes"),
+    path("import/", import_view, name="import"),
     path("workers/", WorkerListView.as_view(), name="worker-list"),
     path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
     path("workers/<int:pk>/update/", WorkerUpdateView.as_view(), name="worker-update"),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/bulk/", task_bulk_action, name="task-bulk-action"),
+    path(
+        "tasks/due/<str:bucket>/",
+        TaskBucketListView.as_view(),
+        name="task-bucket",
+    ),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path("tasks/<int:pk>/task-complete/", task_completed_true, name="task-complete"),
     path(
@@ -108,6 +125,7 @@ urlpatterns = [
     path("teams/<int:pk>/delete/", TeamDeleteView.as_view(), name="team-delete"),
     path("projects/", ProjectListView.as_view(), name="project-list"),
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project-detail"),
+    path("projects/<int:pk>/events/", project_events, name="project-events"),
     path("projects/create/", ProjectCreateView.as_view(), name="project-create"),
     path(
         "projects/<int:pk>/update/", ProjectUpdateView.as_view(), name="project-update"
@@ -0,0 +1,49 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db import connections, transaction
+
+
+def chunked(items, size=500):
+    """Split any iterable into lists of at most ``size`` items, lazily."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def ajoin_chunks(lines, size=500):
+    """
+    Yield the text of ``size`` lines of the sync iterable ``lines`` at a time,
+    each chunk produced in the request's sync thread. Under ASGI, Django 4.2
+    reads a sync streaming iterator to the end before sending anything; an
+    async one is sent as it goes.
+    """
+    iterator = iter(lines)
+    next_chunk = sync_to_async(lambda: list(islice(iterator, size)))
+    try:
+        while chunk := await next_chunk():
+            yield "".join(chunk)
+    finally:
+        # E.g. the client went away: let a QuerySet.iterator() cursor go.
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close)()
+
+
+def claim(queryset, limit, **updates):
+    """
+    Take up to ``limit`` rows of ``queryset`` for this process by applying
+    ``updates``, which must move the rows out of ``queryset``. Rows another
+    process is claiming at the same time are skipped, never shared.
+    """
+    if connections[queryset.db].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=queryset.db):
+            claimed = list(queryset.select_for_update(skip_locked=True)[:limit])
+            queryset.model._base_manager.using(queryset.db).filter(
+                pk__in=[obj.pk for obj in claimed]
+            ).update(**updates)
+        return claimed
+    # Without SKIP LOCKED (SQLite) each row is claimed with a compare-and-set:
+    # the UPDATE only matches while the row is still in ``queryset``.
+    return [
+        obj for obj in queryset[:limit] if queryset.filter(pk=obj.pk).update(**updates)
+    ]
@@ -0,0 +1,113 @@
+"""
+Modification times of the rows the detail pages show. ``Task``,
+``Project``, ``Team``, ``Worker`` and ``TaskType`` have ``created_at`` and
+an indexed ``updated_at`` that ``save()`` sets. The signal handlers in
+``manager.signals`` also bump ``updated_at`` where a page's content changes
+without a save of its row:
+
+* both sides of an m2m change, e.g. a task and the worker assigned to it;
+* the rows related to a deleted row, e.g. the project of a deleted task;
+* the project a task moves out of, or a bulk change moves tasks out of;
+* the workers of a renamed position.
+
+A page's version is then the newest ``updated_at`` among the rows it
+shows; ``manager.conditional`` turns it into ETag and Last-Modified. Each
+bump is also a change for the sync API (see ``manager.changelog``).
+"""
+from django.db.models import Subquery
+from django.utils import timezone
+
+from manager import changelog
+from manager.models import Project, Task, TaskType, Team, Worker
+from manager.utils import chunked
+
+TRACKED = [Task, Project, Team, Worker, TaskType]
+
+
+def touch(queryset):
+    """Bump ``updated_at`` of ``queryset`` without sending signals."""
+    model = queryset.model
+    if model not in changelog.KINDS:
+        return queryset.update(updated_at=timezone.now())
+    pks = list(queryset.values_list("pk", flat=True))
+    now = timezone.now()
+    for chunk in chunked(pks, 1000):
+        model._base_manager.filter(pk__in=chunk).update(updated_at=now)
+    changelog.record(model, pks)
+    return len(pks)
+
+
+def touch_pks(model, pks):
+    pks = [pk for pk in pks if pk is not None]
+    if pks:
+        touch(model._base_manager.filter(pk__in=pks))
+
+
+def get_relations(model):
+    """Relations of ``model`` to tracked models, declared on either side."""
+    return [
+        relation
+        for relation in model._meta.get_fields()
+        if relation.is_relation and relation.related_model in TRACKED
+    ]
+
+
+def get_related(instance, relation):
+    # On either side, the remote field is named after the lookup from the
+    # related model back to ``instance``'s model.
+    return relation.related_model._base_manager.filter(
+        **{relation.remote_field.name: instance.pk}
+    )
+
+
+def touch_related(instance):
+    for relation in get_relations(type(instance)):
+        touch(get_related(instance, relation))
+
+
+def relation_changed(instance, action, model, pk_set):
+    """Bump both sides of an m2m change."""
+    if action in ("post_add", "post_remove") and pk_set:
+        touch_pks(type(instance), [instance.pk])
+        touch_pks(model, pk_set)
+    elif action == "pre_clear":
+        touch_pks(type(instance), [instance.pk])
+        for relation in get_relations(type(instance)):
+            if relation.many_to_many and relation.related_model is model:
+                touch(get_related(instance, relation))
+
+
+def task_saved(task, created):
+    """Bump the project and task type a saved task moved out of."""
+    if created:
+        return
+    loaded = getattr(task, "_loaded_values", None) or {}
+    for attname, model in [("project_id", Project), ("task_type_id", TaskType)]:
+        if loaded.get(attname) != getattr(task, attname):
+            touch_pks(model, [loaded.get(attname)])
+
+
+def tasks_bulk_changed(project_ids):
+    # ``project_ids`` holds the projects before and after the change.
+    touch_pks(Project, project_ids)
+
+
+def get_latest(queryset):
+    """Subquery of the newest ``updated_at`` in ``queryset``."""
+    return Subquery(queryset.order_by("-updated_at").values("updated_at")[:1])
+
+
+def get_version_queryset(model, pk, **related):
+    """
+    ``{"updated_at": ..., "<name>_updated_at": ...}`` of ``model`` row
+    ``pk``, with the newest ``updated_at`` of each ``related`` queryset,
+    which refers to the row as ``OuterRef("pk")``.
+    """
+    latest = {
+        f"{name}_updated_at": get_latest(queryset) for name, queryset in related.items()
+    }
+    return (
+        model._base_manager.filter(pk=pk)
+        .annotate(**latest)
+        .values("updated_at", *latest)
+    )
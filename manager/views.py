@@ -1,15 +1,29 @@
+import io
+
 from django.contrib import messages
-from django.core.mail import send_mail, BadHeaderError
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import OuterRef, Prefetch
+from django.conf import settings
 
 from .forms import ContactForm
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
-
-from django.http import HttpResponseRedirect, HttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.core.mail import BadHeaderError
+
+from django.http import (
+    Http404,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import render, get_object_or_404, redirect
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy, reverse
+from django.utils.http import urlencode
 from django.views import generic
+from django.views.decorators.http import require_POST
 
 from manager.forms import (
     SignUpForm,
@@ -24,24 +38,43 @@ from manager.forms import (
     TeamSearchForm,
     ProjectSearchForm,
     TaskForm,
+    TaskBulkActionForm,
+    ImportForm,
+)
+from manager import (
+    api,
+    buckets,
+    bulk,
+    events,
+    export,
+    importer,
+    membership,
+    versions,
+    workload,
 )
 from manager.models import Worker, Task, Position, TaskType, Team, Project
+from manager.pagination import KeysetPaginationMixin, KeysetPaginator
+from manager.async_views import (
+    AsyncDetailView,
+    AsyncListView,
+    async_login_required,
+)
+from manager.conditional import AsyncConditionalDetailMixin, ConditionalDetailMixin
+from manager.mail import enqueue_mail
+from manager.search import search
+from manager.stats import aget_dashboard_stats
+from manager.utils import ajoin_chunks
 
 
-@login_required
-def index(request):
+@async_login_required
+async def index(request):
     """View function for the home page of the site."""
-    num_projects = Project.objects.count()
-    num_teams = Team.objects.count()
-    task_is_done_true = Task.objects.filter(is_completed=True).count()
-
-    context = {
-        "num_projects": num_projects,
-        "num_teams": num_teams,
-        "task_is_done_true": task_is_done_true,
-    }
+    context = await aget_dashboard_stats()
+    context["task_buckets"] = buckets.labelled(
+        await buckets.aget_counts(request.user.pk)
+    )
 
-    return render(request, "manager/index.html", context=context)
+    return TemplateResponse(request, "manager/index.html", context=context)
 
 
 def register_user(request):
@@ -69,7 +102,7 @@ def register_user(request):
     )
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+class WorkerListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = Worker
     paginate_by = 5
     template_name = "manager/worker_list.html"
@@ -84,14 +117,58 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
         queryset = get_user_model().objects.all()
         form = WorkerSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(username__icontains=form.cleaned_data["username"])
+            return search(queryset, form.cleaned_data["username"])
         return queryset
 
 
-class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
+class WorkerDetailView(AsyncConditionalDetailMixin, AsyncDetailView):
+    """
+    The worker's workload summary and their open and completed tasks, each
+    list paginated with its own cursor so the page costs the same however
+    many tasks the worker has had.
+    """
+
     model = Worker
-    queryset = Worker.objects.all().prefetch_related("tasks__task_type")
+    queryset = Worker.objects.select_related("position")
     template_name = "manager/worker_detail.html"
+    paginate_by = 10
+    depends_on_date = True
+
+    def get_version_queryset(self):
+        return versions.get_version_queryset(
+            Worker,
+            self.kwargs["pk"],
+            tasks=Task.objects.filter(assignees=OuterRef("pk")),
+            task_types=TaskType.objects.filter(tasks__assignees=OuterRef("pk")),
+            projects=Project.objects.filter(tasks__assignees=OuterRef("pk")),
+        )
+
+    def get_task_pages(self):
+        tasks = Task.objects.filter(assignees=self.object.pk).select_related(
+            "task_type"
+        )
+        return {
+            "open_tasks": (
+                tasks.filter(is_completed=False).order_by("deadline", "name"),
+                "open",
+            ),
+            "completed_tasks": (
+                tasks.filter(is_completed=True).order_by("-deadline", "-name"),
+                "completed",
+            ),
+        }
+
+    async def aget_context_data(self, **kwargs):
+        context = await super().aget_context_data(**kwargs)
+        context["task_buckets"] = buckets.labelled(
+            await buckets.aget_counts(self.object.pk)
+        )
+        context["workload"] = await workload.aget_summary(self.object.pk)
+        for name, (queryset, cursor_kwarg) in self.get_task_pages().items():
+            context[name] = await KeysetPaginator(queryset, self.paginate_by).apage(
+                self.request.GET.get(cursor_kwarg)
+            )
+        return context
 
 
 class WorkerUpdateView(LoginRequiredMixin, generic.UpdateView):
@@ -104,32 +181,189 @@ class WorkerUpdateView(LoginRequiredMixin, generic.UpdateView):
         return reverse_lazy("manager:worker-detail", kwargs={"pk": worker_id})
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+class TaskListView(AsyncListView):
     model = Task
     paginate_by = 5
     template_name = "manager/task_list.html"
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(TaskListView, self).get_context_data(**kwargs)
-        name = self.request.GET.get("name", "")
-        context["search_form"] = TaskSearchForm(initial={"name": name})
+        context["search_form"] = TaskSearchForm(initial=self.request.GET.dict())
+        context["bulk_form"] = TaskBulkActionForm(
+            initial={
+                "name": self.request.GET.get("name", ""),
+                "filter_priority": self.request.GET.get("priority", ""),
+            }
+        )
         return context
 
     def get_queryset(self):
         queryset = (
-            Task.objects.all().select_related("task_type").order_by("is_completed")
+            Task.objects.all()
+            .select_related("task_type")
+            .order_by(*TaskSearchForm.ORDERINGS["deadline"])
         )
         form = TaskSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return form.filter_queryset(queryset)
         return queryset
 
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskBucketListView(AsyncListView):
+    """Open tasks that are overdue, due today or due this week."""
+
+    paginate_by = 5
+    template_name = "manager/task_bucket_list.html"
+
+    def get_worker_id(self):
+        worker_id = self.request.GET.get("worker", "")
+        return int(worker_id) if worker_id.isdigit() else None
+
+    def get_queryset(self):
+        if self.kwargs["bucket"] not in buckets.BUCKETS:
+            raise Http404("Unknown task bucket")
+        return buckets.get_queryset(
+            self.kwargs["bucket"], self.get_worker_id()
+        ).select_related("task_type")
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["bucket"] = self.kwargs["bucket"]
+        context["bucket_label"] = buckets.BUCKETS[self.kwargs["bucket"]]
+        context["buckets"] = buckets.BUCKETS
+        context["worker_id"] = self.get_worker_id()
+        return context
+
+
+@login_required
+@require_POST
+def task_bulk_action(request):
+    form = TaskBulkActionForm(request.POST)
+    redirect_url = reverse("manager:task-list")
+    params = {
+        "name": form.data.get("name"),
+        "priority": form.data.get("filter_priority"),
+    }
+    if any(params.values()):
+        redirect_url += "?" + urlencode(
+            {key: value for key, value in params.items() if value}
+        )
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return HttpResponseRedirect(redirect_url)
+
+    if form.cleaned_data["select_all"]:
+        tasks = search(Task.objects.all(), form.cleaned_data["name"])
+        if form.cleaned_data["filter_priority"] is not None:
+            tasks = tasks.filter(priority=form.cleaned_data["filter_priority"])
+    else:
+        tasks = form.cleaned_data["tasks"]
+    try:
+        updated = bulk.apply_bulk_action(
+            tasks,
+            form.cleaned_data["action"],
+            priority=form.cleaned_data["priority"],
+            project=form.cleaned_data["project"],
+            worker=form.cleaned_data["assignee"],
+        )
+    except ValidationError as error:
+        for message in error.messages:
+            messages.error(request, message)
+    else:
+        messages.success(request, f"Updated {updated} task{'s' * (updated != 1)}.")
+    return HttpResponseRedirect(redirect_url)
+
+
+def streaming_content(request, lines):
+    if isinstance(request, ASGIRequest):
+        return ajoin_chunks(lines)
+    return lines
+
+
+@login_required
+def export_view(request, kind):
+    """Stream every matching row of ``kind`` as CSV or NDJSON."""
+    fmt = request.GET.get("format", "csv")
+    if kind not in export.EXPORTS or fmt not in export.FORMATS:
+        raise Http404("Unknown export.")
+    response = StreamingHttpResponse(
+        streaming_content(request, export.stream(kind, fmt, request.GET)),
+        content_type=export.FORMATS[fmt],
+    )
+    response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+
+def api_changes(request, kind):
+    """The ``kind`` rows changed since the ``since`` token, as JSON."""
+    if kind not in api.ROWS:
+        raise Http404("Unknown kind.")
+    if not api.is_authorized(request):
+        return JsonResponse({"error": "Authentication required."}, status=401)
+    try:
+        since, limit = api.parse_params(request.GET)
+    except api.InvalidRequest as error:
+        return JsonResponse({"error": str(error)}, status=400)
+    response = StreamingHttpResponse(
+        streaming_content(request, api.stream(kind, since, limit)),
+        content_type="application/json",
+    )
+    response["Cache-Control"] = "private, no-store"
+    return response
+
+
+IMPORT_PERMISSIONS = {
+    "tasks": "manager.add_task",
+    "workers": "manager.add_worker",
+}
+
+
+@login_required
+def import_view(request):
+    """Create tasks or workers from an uploaded CSV file."""
+    result = None
+    if request.method == "POST":
+        form = ImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            kind = form.cleaned_data["kind"]
+            if not request.user.has_perm(IMPORT_PERMISSIONS[kind]):
+                raise PermissionDenied
+            file = io.TextIOWrapper(form.cleaned_data["file"], encoding="utf-8-sig")
+            result = importer.IMPORTERS[kind](file)
+    else:
+        form = ImportForm(initial={"kind": request.GET.get("kind")})
+    return render(request, "manager/import.html", {"form": form, "result": result})
+
+
+class TaskDetailView(LoginRequiredMixin, ConditionalDetailMixin, generic.DetailView):
     model = Task
-    queryset = Task.objects.all().select_related("task_type")
+    queryset = (
+        Task.objects.all()
+        .select_related("task_type", "project")
+        .prefetch_related(
+            Prefetch("assignees", queryset=Worker.objects.select_related("position"))
+        )
+    )
     template_name = "manager/task_detail.html"
 
+    def get_version_queryset(self):
+        return versions.get_version_queryset(
+            Task,
+            self.kwargs["pk"],
+            task_type=TaskType.objects.filter(tasks=OuterRef("pk")),
+            project=Project.objects.filter(tasks=OuterRef("pk")),
+            assignees=Worker.objects.filter(tasks=OuterRef("pk")),
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["is_assignee"] = membership.is_task_assignee(
+            self.request.user, self.object.pk
+        )
+        return context
+
 
 class TaskCreateWithProjectView(LoginRequiredMixin, generic.CreateView):
     model = Task
@@ -202,9 +436,11 @@ class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
     template_name = "manager/task_form.html"
 
 
-class CompletedTaskListView(LoginRequiredMixin, generic.ListView):
+class CompletedTaskListView(
+    LoginRequiredMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Task
-    queryset = Task.objects.filter(is_completed=True)
+    queryset = Task.objects.filter(is_completed=True).order_by("deadline", "name")
     paginate_by = 5
     template_name = "manager/completed_task_list.html"
 
@@ -224,7 +460,7 @@ class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "manager/task_confirm_delete.html"
 
 
-class PositionListView(LoginRequiredMixin, generic.ListView):
+class PositionListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = Position
     paginate_by = 5
     template_name = "manager/position_list.html"
@@ -239,7 +475,7 @@ class PositionListView(LoginRequiredMixin, generic.ListView):
         queryset = Position.objects.all()
         form = PositionSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search(queryset, form.cleaned_data["name"])
         return queryset
 
 
@@ -264,7 +500,7 @@ class PositionDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "manager/position_confirm_delete.html"
 
 
-class TaskTypeListView(LoginRequiredMixin, generic.ListView):
+class TaskTypeListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = TaskType
     paginate_by = 5
     context_object_name = "task_type_list"
@@ -280,16 +516,25 @@ class TaskTypeListView(LoginRequiredMixin, generic.ListView):
         queryset = TaskType.objects.all()
         form = TaskTypeSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search(queryset, form.cleaned_data["name"])
         return queryset
 
 
-class TaskTypeDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskTypeDetailView(
+    LoginRequiredMixin, ConditionalDetailMixin, generic.DetailView
+):
     model = TaskType
     queryset = TaskType.objects.all()
     context_object_name = "task_type_detail"
     template_name = "manager/task_type_detail.html"
 
+    def get_version_queryset(self):
+        return versions.get_version_queryset(
+            TaskType,
+            self.kwargs["pk"],
+            tasks=Task.objects.filter(task_type=OuterRef("pk")),
+        )
+
 
 class TaskTypeCreateView(LoginRequiredMixin, generic.CreateView):
     model = TaskType
@@ -316,25 +561,14 @@ class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
 
 @login_required
 def toggle_assign_to_task(request, pk):
-    worker = get_object_or_404(Worker, id=request.user.id)
     task = get_object_or_404(Task, pk=pk)
-    projects = worker.teams.values_list("projects", flat=True)
-    if task.project:
-        if task in worker.tasks.all():
-            worker.tasks.remove(pk)
-        elif task not in worker.tasks.all() and task.project in projects:
-            worker.tasks.add(pk)
-        else:
-            messages.info(request, "You need to be a member of team who is in project")
-    elif task in worker.tasks.all():
-        worker.tasks.remove(pk)
-    else:
-        worker.tasks.add(pk)
+    if membership.toggle_task_assignment(request.user, task) is None:
+        messages.info(request, "You need to be a member of team who is in project")
 
     return HttpResponseRedirect(reverse_lazy("manager:task-detail", args=[pk]))
 
 
-class TeamListView(LoginRequiredMixin, generic.ListView):
+class TeamListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = Team
     paginate_by = 5
     template_name = "manager/team_list.html"
@@ -346,18 +580,36 @@ class TeamListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Team.objects.all()
+        queryset = Team.objects.all().prefetch_related("projects")
         form = TeamSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search(queryset, form.cleaned_data["name"])
         return queryset
 
 
-class TeamDetailView(LoginRequiredMixin, generic.DetailView):
+class TeamDetailView(LoginRequiredMixin, ConditionalDetailMixin, generic.DetailView):
     model = Team
-    queryset = Team.objects.all().prefetch_related("members__teams__projects")
+    queryset = Team.objects.all().prefetch_related(
+        Prefetch("members", queryset=Worker.objects.select_related("position")),
+        "projects",
+    )
     template_name = "manager/team_detail.html"
 
+    def get_version_queryset(self):
+        return versions.get_version_queryset(
+            Team,
+            self.kwargs["pk"],
+            members=Worker.objects.filter(teams=OuterRef("pk")),
+            projects=Project.objects.filter(team=OuterRef("pk")),
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["is_member"] = membership.is_team_member(
+            self.request.user, self.object.pk
+        )
+        return context
+
 
 class TeamCreateView(LoginRequiredMixin, generic.CreateView):
     model = Team
@@ -381,16 +633,12 @@ class TeamDeleteView(LoginRequiredMixin, generic.DeleteView):
 
 @login_required
 def toggle_assign_to_team(request, pk):
-    worker = get_object_or_404(Worker, id=request.user.id)
     team = get_object_or_404(Team, pk=pk)
-    if team in worker.teams.all():
-        worker.teams.remove(pk)
-    else:
-        worker.teams.add(pk)
+    membership.toggle_team_membership(request.user, team)
     return HttpResponseRedirect(reverse_lazy("manager:team-detail", args=[pk]))
 
 
-class ProjectListView(LoginRequiredMixin, generic.ListView):
+class ProjectListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = Project
     paginate_by = 3
     template_name = "manager/project_list.html"
@@ -402,23 +650,65 @@ class ProjectListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Project.objects.all()
+        queryset = Project.objects.all().prefetch_related("team")
         form = ProjectSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return search(queryset, form.cleaned_data["name"])
         return queryset
 
 
-class ProjectDetailView(LoginRequiredMixin, generic.DetailView):
+class ProjectDetailView(AsyncConditionalDetailMixin, AsyncDetailView):
     model = Project
-    queryset = Project.objects.all().prefetch_related("team__projects__tasks")
+    queryset = Project.objects.all().prefetch_related(
+        "team",
+        Prefetch(
+            "tasks",
+            queryset=Task.objects.select_related("task_type").prefetch_related(
+                "assignees"
+            ),
+        ),
+    )
     template_name = "manager/project-detail.html"
 
-    def get(self, request, pk, *args, **kwargs):
-        self.object = self.get_object()
-        context = self.get_context_data(object=self.object)
-        context["project_pk"] = pk
-        return self.render_to_response(context)
+    def get_version_queryset(self):
+        return versions.get_version_queryset(
+            Project,
+            self.kwargs["pk"],
+            team=Team.objects.filter(projects=OuterRef("pk")),
+            tasks=Task.objects.filter(project=OuterRef("pk")),
+            task_types=TaskType.objects.filter(tasks__project=OuterRef("pk")),
+            assignees=Worker.objects.filter(tasks__project=OuterRef("pk")),
+        )
+
+    async def aget_object(self):
+        # Read before the tasks: the page's event stream starts after it.
+        self.last_seq = await events.aget_last_seq()
+        return await super().aget_object()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["project_pk"] = self.object.pk
+        context["last_seq"] = self.last_seq
+        return context
+
+
+@async_login_required
+async def project_events(request, pk):
+    """Stream changes to the project's tasks as Server-Sent Events."""
+    task_ids = await events.aget_task_ids(pk)
+    if task_ids is None:
+        raise Http404("No project found matching the query")
+    since = events.parse_event_id(request.headers.get("Last-Event-ID"))
+    if since is None:
+        # The first connection starts from the change the page shows.
+        since = events.parse_event_id(request.GET.get("since"))
+    response = StreamingHttpResponse(
+        events.stream(pk, task_ids, since), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Proxies such as nginx would otherwise hold events back in a buffer.
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 class ProjectCreateView(LoginRequiredMixin, generic.CreateView):
@@ -444,8 +734,7 @@ class ProjectDeleteView(LoginRequiredMixin, generic.DeleteView):
 @login_required
 def project_completed_true(request, pk):
     project = get_object_or_404(Project, pk=pk)
-    tasks = project.tasks.filter(is_completed=False).count()
-    if not tasks:
+    if not project.open_task_count:
         project.is_completed = True
         project.save()
     else:
@@ -463,27 +752,25 @@ def contact(request):
     if request.method == "POST":
         form = ContactForm(request.POST)
         if form.is_valid():
-            subject = "Website Inquiry"
             body = {
                 "first_name": form.cleaned_data["first_name"],
                 "last_name": form.cleaned_data["last_name"],
                 "email": form.cleaned_data["email_address"],
                 "message": form.cleaned_data["message"],
             }
-            message = "\n".join(body.values())
-
+            # Queued rather than sent, so the request never waits on SMTP.
             try:
-                send_mail(subject, message, "admin@example.com", ["admin@example.com"])
+                enqueue_mail(
+                    "Website Inquiry",
+                    "\n".join(body.values()),
+                    None,
+                    [settings.CONTACT_EMAIL],
+                )
             except BadHeaderError:
-                return HttpResponse("Invalid header found.")
-            messages.success(request, "Message sent.")
-            return redirect("main:homepage")
-    messages.error(
-        request,
-        (
-            "It`s necessary to complete all tasks " "of project before finishing project"
-        ),
-    )
-
-    form = ContactForm()
+                form.add_error(None, "Invalid header found.")
+            else:
+                messages.success(request, "Message sent.")
+                return redirect("manager:contact")
+    else:
+        form = ContactForm()
     return render(request, "manager/contact.html", {"form": form})
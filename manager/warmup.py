@@ -0,0 +1,75 @@
+"""
+Work a fresh process would otherwise do on its first requests: importing
+the views, compiling the URL patterns and compiling the templates. Run in
+the gunicorn master with ``preload_app``, it happens once before the
+workers fork and they share the result; ``measure_startup`` times it.
+"""
+import time
+from pathlib import Path
+
+from django.db import connections
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+def compile_url_patterns(resolver=None):
+    """Compile every URL pattern's regex and fill the reverse lookup tables."""
+    resolver = resolver or get_resolver()
+    count = 0
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            count += compile_url_patterns(pattern)
+        elif isinstance(pattern, URLPattern):
+            count += 1
+    # Reversing populates these per namespace on first use.
+    resolver.reverse_dict
+    resolver.namespace_dict
+    resolver.app_dict
+    return count
+
+
+def get_template_names(directory):
+    directory = Path(directory)
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob("*.html")
+        if path.is_file()
+    )
+
+
+def compile_templates():
+    """
+    Load every template in the engines' ``DIRS`` so the cached loader holds
+    them compiled. Returns the names that failed to compile.
+    """
+    count = 0
+    failed = []
+    for engine in engines.all():
+        for directory in getattr(engine, "dirs", []):
+            for name in get_template_names(directory):
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError:
+                    failed.append(name)
+                else:
+                    count += 1
+    return count, failed
+
+
+def warm_up():
+    """Run the warm-up and return how long each step took, in seconds."""
+    timings = {}
+    start = time.perf_counter()
+    # Importing the URLconf imports every view module.
+    timings["url_patterns"] = compile_url_patterns()
+    timings["urls_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    timings["templates"], timings["failed_templates"] = compile_templates()
+    timings["templates_seconds"] = time.perf_counter() - start
+
+    # Connections opened while warming up must not be shared with forked
+    # workers.
+    connections.close_all()
+    return timings
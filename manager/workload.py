@@ -0,0 +1,236 @@
+"""
+Per-worker workload: each worker's open tasks counted by project, priority
+and deadline in ``WorkerWorkload``. The signal handlers in
+``manager.signals`` move a task between rows with ``F()`` updates when its
+deadline, priority, project or completion changes or when it gains an
+assignee. Removals, bulk writes and deleted projects rebuild the rows of the
+workers they touch, and ``rebuild`` repairs drift from raw SQL writes.
+
+The summary is folded from the worker's rows when it is read. The rows
+don't depend on the date, so the overdue count and the next deadline are
+correct on the day after without a refresh.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from manager.models import Task, WorkerWorkload
+from manager.utils import chunked
+
+KEY_FIELDS = ["is_completed", "project_id", "priority", "deadline"]
+# Fields of tasks_bulk_changed that move a task between rows.
+BULK_FIELDS = {"is_completed", "project", "project_id", "priority", "deadline"}
+
+
+def get_key(values):
+    """``(project_id, priority, deadline)`` of an open task, else None."""
+    if values["is_completed"]:
+        return None
+    # An instance saved with a string priority or deadline keeps it as given.
+    return (
+        values["project_id"],
+        Task._meta.get_field("priority").to_python(values["priority"]),
+        Task._meta.get_field("deadline").to_python(values["deadline"]),
+    )
+
+
+def get_task_key(task):
+    return get_key({field: getattr(task, field) for field in KEY_FIELDS})
+
+
+def add(worker_ids, key, delta):
+    """Add ``delta`` to the ``key`` row of each of ``worker_ids``."""
+    if not worker_ids or key is None or not delta:
+        return
+    project_id, priority, deadline = key
+    rows = WorkerWorkload.objects.filter(
+        worker_id__in=worker_ids,
+        project_id=project_id,
+        priority=priority,
+        deadline=deadline,
+    )
+    if delta > 0:
+        WorkerWorkload.objects.bulk_create(
+            [
+                WorkerWorkload(
+                    worker_id=worker_id,
+                    project_id=project_id,
+                    priority=priority,
+                    deadline=deadline,
+                )
+                for worker_id in worker_ids
+            ],
+            ignore_conflicts=True,
+        )
+        rows.update(open_count=F("open_count") + delta)
+    else:
+        # Rows that drifted below zero are left for ``rebuild``.
+        rows.filter(open_count__gte=-delta).update(open_count=F("open_count") + delta)
+        rows.filter(open_count=0).delete()
+
+
+def rebuild(worker_ids=None):
+    """Recount the rows of ``worker_ids`` (or every worker) from the tasks."""
+    rows = WorkerWorkload.objects.all()
+    assignments = Task.assignees.through.objects.filter(task__is_completed=False)
+    if worker_ids is not None:
+        worker_ids = list(worker_ids)
+        if not worker_ids:
+            return
+        rows = rows.filter(worker_id__in=worker_ids)
+        assignments = assignments.filter(worker_id__in=worker_ids)
+    counts = (
+        assignments.values(
+            "worker_id", "task__project_id", "task__priority", "task__deadline"
+        )
+        .annotate(open_count=Count("*"))
+        .order_by()
+    )
+    with transaction.atomic():
+        rows.delete()
+        for chunk in chunked(counts.iterator(), 1000):
+            WorkerWorkload.objects.bulk_create(
+                WorkerWorkload(
+                    worker_id=row["worker_id"],
+                    project_id=row["task__project_id"],
+                    priority=row["task__priority"],
+                    deadline=row["task__deadline"],
+                    open_count=row["open_count"],
+                )
+                for row in chunk
+            )
+
+
+def get_rows(worker_id):
+    return (
+        WorkerWorkload.objects.filter(worker_id=worker_id)
+        .order_by()
+        .values_list(
+            "project_id", "project__name", "priority", "deadline", "open_count"
+        )
+    )
+
+
+def summarize(rows, today):
+    """
+    Fold workload rows into the open count, the overdue count, the next
+    deadline from today on and the open counts by priority and by project.
+    """
+    priorities = Counter()
+    projects = Counter()
+    project_names = {}
+    overdue = 0
+    next_deadline = None
+    for project_id, project_name, priority, deadline, open_count in rows:
+        priorities[priority] += open_count
+        projects[project_id] += open_count
+        project_names[project_id] = project_name
+        if deadline < today:
+            overdue += open_count
+        elif next_deadline is None or deadline < next_deadline:
+            next_deadline = deadline
+    return {
+        "open": sum(priorities.values()),
+        "overdue": overdue,
+        "next_deadline": next_deadline,
+        "priorities": [
+            (label, priorities[value])
+            for value, label in Task.PRIORITY_CHOICES
+            if priorities[value]
+        ],
+        # Busiest first; ``None`` is the tasks without a project.
+        "projects": [
+            (project_id, project_names[project_id], count)
+            for project_id, count in projects.most_common()
+        ],
+    }
+
+
+def get_summary(worker_id):
+    return summarize(get_rows(worker_id), timezone.localdate())
+
+
+async def aget_summary(worker_id):
+    rows = [row async for row in get_rows(worker_id)]
+    return summarize(rows, timezone.localdate())
+
+
+def task_saved(task, created):
+    if created:
+        # Assignees are added after the task is saved.
+        return
+    loaded = getattr(task, "_loaded_values", None)
+    if loaded is None or not set(KEY_FIELDS) <= loaded.keys():
+        rebuild(task.assignees.values_list("pk", flat=True))
+        return
+    old, new = get_key(loaded), get_task_key(task)
+    if old == new:
+        return
+    worker_ids = list(task.assignees.values_list("pk", flat=True))
+    add(worker_ids, old, -1)
+    add(worker_ids, new, 1)
+
+
+def task_deleted(task):
+    loaded = getattr(task, "_loaded_values", None) or {}
+    values = {field: loaded.get(field, getattr(task, field)) for field in KEY_FIELDS}
+    add(getattr(task, "_assignee_ids", []), get_key(values), -1)
+
+
+def assignees_changed(instance, action, reverse, pk_set):
+    """
+    Keep the rows in step with ``Task.assignees``. Additions report only the
+    rows actually inserted, so they are applied as increments; the workers
+    affected by a removal are recounted.
+    """
+    if action == "post_add" and pk_set:
+        if reverse:
+            keys = Counter(
+                get_key(values)
+                for values in Task.objects.filter(
+                    pk__in=pk_set, is_completed=False
+                ).values(*KEY_FIELDS)
+            )
+            for key, count in keys.items():
+                add([instance.pk], key, count)
+        else:
+            add(list(pk_set), get_task_key(instance), 1)
+    elif action == "post_remove":
+        rebuild([instance.pk] if reverse else pk_set)
+    elif action == "pre_clear" and not reverse:
+        instance._workload_worker_ids = list(
+            instance.assignees.values_list("pk", flat=True)
+        )
+    elif action == "post_clear":
+        rebuild(
+            [instance.pk] if reverse else getattr(instance, "_workload_worker_ids", [])
+        )
+
+
+def tasks_bulk_changed(task_ids, fields):
+    if not BULK_FIELDS & set(fields):
+        return
+    worker_ids = set()
+    for chunk in chunked(task_ids):
+        worker_ids.update(
+            Task.assignees.through.objects.filter(task_id__in=chunk).values_list(
+                "worker_id", flat=True
+            )
+        )
+    rebuild(worker_ids)
+
+
+def remember_project_workers(project):
+    # The project's rows are deleted with it and its tasks lose their project
+    # through an UPDATE that sends no signals.
+    project._workload_worker_ids = list(
+        WorkerWorkload.objects.filter(project=project)
+        .values_list("worker_id", flat=True)
+        .distinct()
+    )
+
+
+def project_deleted(project):
+    rebuild(getattr(project, "_workload_worker_ids", []))
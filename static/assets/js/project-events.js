@@ -0,0 +1,61 @@
+// Keeps the project page's TO DO table current from the server's event
+// stream (manager/events.py) instead of reloading the page.
+(function () {
+  "use strict";
+
+  var table = document.getElementById("project-tasks");
+  if (!table || !window.EventSource) {
+    return;
+  }
+  var body = table.tBodies[0];
+  var empty = document.getElementById("no-tasks");
+  var progress = document.getElementById("project-progress");
+  var projectId = Number(table.dataset.projectId);
+
+  function updateCounts() {
+    var rows = body.rows;
+    var completed = body.querySelectorAll('tr[data-completed="true"]').length;
+    progress.textContent =
+      completed + " of " + rows.length + " task" + (rows.length === 1 ? "" : "s");
+    table.hidden = rows.length === 0;
+    if (empty) {
+      empty.hidden = rows.length !== 0;
+    }
+  }
+
+  function apply(change) {
+    var row = document.getElementById("task-" + change.id);
+    if (row) {
+      row.remove();
+    }
+    if (change.html === null || change.project !== projectId) {
+      return;
+    }
+    var template = document.createElement("template");
+    template.innerHTML = change.html.trim();
+    var fresh = template.content.firstElementChild;
+    // Rows are ordered like the page renders them: by deadline, then name.
+    var next = Array.prototype.find.call(body.rows, function (other) {
+      return other.dataset.order > fresh.dataset.order;
+    });
+    body.insertBefore(fresh, next || null);
+  }
+
+  // The first connection picks up from the change the page was rendered at;
+  // reconnects send the last id they got instead.
+  var source = new EventSource(
+    table.dataset.eventsUrl + "?since=" + encodeURIComponent(table.dataset.lastSeq)
+  );
+  source.addEventListener("task", function (event) {
+    apply(JSON.parse(event.data));
+    updateCounts();
+  });
+  source.addEventListener("reload", function () {
+    // Too much changed to patch in place. Fetch the page past the HTTP cache
+    // first: a revalidated copy would start from its old change again.
+    source.close();
+    fetch(window.location.href, { cache: "reload" }).finally(function () {
+      window.location.reload();
+    });
+  });
+})();
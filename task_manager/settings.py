@@ -49,16 +49,15 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "crispy_forms",
     "crispy_bootstrap5",
     "manager",
 ]
 
 MIDDLEWARE = [
+    "manager.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "manager.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -67,6 +66,22 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The debug toolbar slows every request down, so it only loads on demand.
+DEBUG_TOOLBAR = os.environ.get("DEBUG_TOOLBAR", "") == "True"
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("manager.middleware.WhiteNoiseMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
+# /metrics is open to INTERNAL_IPS, or to this bearer token when it's set.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# The sync API at /api/v1/ is open to logged-in users, or to this bearer
+# token when it's set.
+API_TOKEN = os.environ.get("API_TOKEN", "")
+
 ROOT_URLCONF = "task_manager.urls"
 
 TEMPLATES = [
@@ -114,6 +129,25 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=500)
 DATABASES["default"].update(db_from_env)
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# A shared cache lets signal-based invalidation reach every worker process
+# (requires the redis package).
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
+DASHBOARD_STATS_TIMEOUT = int(os.environ.get("DASHBOARD_STATS_TIMEOUT", 300))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -134,6 +168,27 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "manager.Worker"
 
+# Sessions and the logged-in user
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/#configuring-the-session-engine
+# With a cache every process shares (REDIS_URL), sessions are read through
+# the cache and the logged-in Worker is cached by CachedModelBackend, so an
+# authenticated request reads neither row from the database. Both stay off
+# with the per-process local-memory cache, where a logout or password change
+# wouldn't reach the other processes. SESSION_STORE=signed_cookies keeps the
+# session in the cookie instead; those sessions can't be revoked server-side
+# before they expire, except by changing the password.
+
+SESSION_STORE = os.environ.get(
+    "SESSION_STORE", "cached_db" if os.environ.get("REDIS_URL") else "db"
+)
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_STORE}"
+
+AUTHENTICATION_BACKENDS = ["manager.auth.CachedModelBackend"]
+# Seconds to cache the logged-in Worker; 0 loads it on every request.
+USER_CACHE_TIMEOUT = int(
+    os.environ.get("USER_CACHE_TIMEOUT", 300 if os.environ.get("REDIS_URL") else 0)
+)
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -168,3 +223,35 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ASSETS_ROOT = "/static/assets"
 
 LOGIN_REDIRECT_URL = "/"
+
+# Part of every detail page's ETag, so a deploy with new templates doesn't
+# answer 304 for pages rendered by the old ones. Render sets the commit.
+RELEASE = os.environ.get("RELEASE", os.environ.get("RENDER_GIT_COMMIT", ""))
+
+# "offset" keeps numbered pages; "keyset" switches list views to cursor
+# pagination, which avoids COUNT(*) and OFFSET scans on large tables.
+PAGINATION_MODE = os.environ.get("PAGINATION_MODE", "offset")
+
+# Live project pages (manager/events.py): how often each process checks for
+# changes made by the others, and how long one event stream stays open
+# before the browser reconnects.
+EVENTS_POLL_INTERVAL = float(os.environ.get("EVENTS_POLL_INTERVAL", 2))
+EVENTS_STREAM_TIMEOUT = int(os.environ.get("EVENTS_STREAM_TIMEOUT", 300))
+
+# Email
+# https://docs.djangoproject.com/en/4.2/topics/email/
+# Views only queue messages; `manage.py send_queued_mail` sends them.
+
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "localhost")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", 25))
+EMAIL_HOST_USER = os.environ.get("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.environ.get("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = os.environ.get("EMAIL_USE_TLS", "") == "True"
+EMAIL_BACKEND = os.environ.get(
+    "EMAIL_BACKEND",
+    "django.core.mail.backends.smtp.EmailBackend"
+    if os.environ.get("EMAIL_HOST")
+    else "django.core.mail.backends.console.EmailBackend",
+)
+DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "admin@example.com")
+CONTACT_EMAIL = os.environ.get("CONTACT_EMAIL", "admin@example.com")